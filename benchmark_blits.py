@@ -0,0 +1,67 @@
+import random
+import sys
+import timeit
+
+import pygame
+sys.path.append('.')  # 添加当前目录到路径
+
+from src.utils import GameConfig, Window, Images, Sounds
+from src.entities import Entity
+
+# 对比逐个blit和批量Surface.blits绘制大量精灵的耗时
+SPRITE_COUNTS = [100, 500, 1000, 2000]  # 精灵数量
+FRAMES = 200  # 每组测量的帧数
+
+# 初始化pygame
+pygame.init()
+window = Window(350, 600)
+screen = pygame.display.set_mode((window.width, window.height))
+images = Images()
+
+# 创建游戏配置
+config = GameConfig(
+    screen=screen,
+    clock=pygame.time.Clock(),
+    fps=30,
+    window=window,
+    images=images,
+    sounds=Sounds(),
+)
+
+
+def make_sprites(count):
+    """在屏幕范围内随机摆放金币大小的精灵"""
+    image = pygame.Surface((20, 20), pygame.SRCALPHA)
+    pygame.draw.circle(image, (255, 215, 0), (10, 10), 10)
+    return [
+        Entity(config, image, random.uniform(0, window.width), random.uniform(0, window.height))
+        for _ in range(count)
+    ]
+
+
+def draw_each(sprites):
+    """每个精灵单独调用一次blit"""
+    for sprite in sprites:
+        sprite.draw()
+    config.dirty_rects.current.clear()  # 丢弃本帧记录的区域，避免越积越多
+
+
+def draw_batched(sprites):
+    """整组精灵收集后一次Surface.blits提交"""
+    with config.batch_layer():
+        for sprite in sprites:
+            sprite.draw()
+    config.dirty_rects.current.clear()
+
+
+print(f"pygame {pygame.version.ver}, 每组{FRAMES}帧，单位：毫秒/帧")
+for dirty in (False, True):
+    config.dirty_rects.enabled = dirty
+    print(f"脏矩形模式: {'开启' if dirty else '关闭'}")
+    for count in SPRITE_COUNTS:
+        sprites = make_sprites(count)
+        each = timeit.timeit(lambda: draw_each(sprites), number=FRAMES) / FRAMES * 1000
+        batched = timeit.timeit(lambda: draw_batched(sprites), number=FRAMES) / FRAMES * 1000
+        print(f"  {count:5d}个精灵  逐个blit {each:7.3f}  批量blits {batched:7.3f}  提速 {each / batched:5.2f}x")
+
+pygame.quit()
@@ -0,0 +1,27 @@
+import sys
+import time
+
+import pygame
+sys.path.append('.')  # 添加当前目录到路径
+
+from src.flappy import Flappy, GameMode, StepResult
+
+# 无界面模式下各游戏模式每秒能模拟的帧数
+FRAMES = 3000  # 每个模式模拟的帧数
+FLAP_INTERVAL = 12  # 每隔多少帧拍打一次
+SEED = 1  # 随机种子
+
+game = Flappy(headless=True, seed=SEED)
+flap = [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)]
+
+print(f"pygame {pygame.version.ver}, 每个模式{FRAMES}帧，每{FLAP_INTERVAL}帧拍打一次，游戏结束后立即重新开始")
+for mode in GameMode:
+    game.new_game(mode, seed=SEED)
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        if game.step(1, flap if frame % FLAP_INTERVAL == 0 else ()) != StepResult.RUNNING:
+            game.new_game(mode)
+    elapsed = time.perf_counter() - start
+    print(f"  {mode.value}  {FRAMES / elapsed:8.0f} 帧/秒  （实时的 {FRAMES / elapsed / game.config.fps:.0f} 倍）")
+
+pygame.quit()
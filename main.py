@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import os
 import sys
@@ -11,7 +12,17 @@ os.chdir(os.path.dirname(os.path.abspath(__file__)))
 # Add the current directory to the path so imports work correctly
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.flappy import Flappy
+from src.flappy import Flappy, GameMode
+from src.utils import InputLog
 
 if __name__ == "__main__":
-    asyncio.run(Flappy().start())
+    parser = argparse.ArgumentParser(description="Flappy Bird")
+    parser.add_argument("--seed", type=int, help="随机数的根种子，相同种子和输入的游戏进程相同")
+    parser.add_argument("--record", metavar="DIR", help="把每局的输入回放保存到该目录")
+    parser.add_argument("--replay", metavar="FILE", help="回放录制的输入文件")
+    args = parser.parse_args()
+    if args.replay:
+        log = InputLog.load(args.replay, len(GameMode))
+        asyncio.run(Flappy(seed=log.seed).replay(log))
+    else:
+        asyncio.run(Flappy(seed=args.seed, record_dir=args.record).start())
@@ -9,6 +9,7 @@ from .welcome_message import WelcomeMessage
 from .boss import Boss
 from .bullet import Bullet
 from .coin import Coin, CoinManager, CoinType
+from .mode_menu import ModeMenu
 
 __all__ = [
     "Background",  # 游戏背景
@@ -26,4 +27,5 @@ __all__ = [
     "Coin",
     "CoinManager",
     "CoinType",
+    "ModeMenu",  # 模式选择菜单
 ]
@@ -12,3 +12,9 @@ class Background(Entity):  # 定义背景类，负责管理游戏背景
             config.window.width,  # 背景的宽度
             config.window.height,  # 背景的高度
         )
+
+    def draw(self) -> None:
+        """
+        绘制背景，脏矩形模式下只擦除上一帧绘制过的区域
+        """
+        self.config.dirty_rects.restore_background(self.config.screen, self.image)
@@ -1,12 +1,11 @@
-import random
 import pygame
 import math
-from typing import List
+from typing import Dict, List, Tuple
 from enum import Enum
 
-from ..utils import GameConfig
+from ..utils import GameConfig, build_hit_mask, create_surface, get_font, render_text
 from .entity import Entity
-from .bullet import Bullet
+from .bullet import Bullet, build_round_bullet, get_projectile_sprite, register_projectile
 
 
 class BossType(Enum):
@@ -17,6 +16,59 @@ class BossType(Enum):
     TANK = "坦克型Boss"     # 紫色高防Boss
 
 
+def build_oval_bullet(size, color) -> pygame.Surface:
+    """绘制椭圆形子弹"""
+    surface = create_surface(size)
+    pygame.draw.ellipse(surface, color, surface.get_rect())
+    return surface
+
+
+# 注册各Boss攻击的子弹外观
+register_projectile("boss_normal", lambda: build_oval_bullet((15, 8), (255, 0, 0)))
+register_projectile("boss_speedy", lambda: build_oval_bullet((10, 6), (0, 0, 255)))
+register_projectile("boss_splitter", lambda: build_round_bullet(12, (0, 255, 0)))
+register_projectile("boss_tank", lambda: build_round_bullet(20, (128, 0, 128)))
+register_projectile("boss_split", lambda color: build_round_bullet(20, color))  # 分裂物，与Boss同色
+
+
+class BossHealthBar:
+    """Boss头顶血条的图像：背景和边框只绘制一次，血量部分只在长度或颜色变化时重新填充"""
+    def __init__(self, width: int, height: int):
+        self.background = create_surface((width, height))  # 半透明黑色背景
+        self.background.fill((0, 0, 0, 180))
+        self.bar = create_surface((width, height), alpha=False)  # 血量部分，按长度截取绘制
+        self.frame = create_surface((width, height))  # 边框
+        pygame.draw.rect(self.frame, (255, 255, 255), self.frame.get_rect(), 1)
+        self.filled = (0, None)  # 血量部分当前填充的(长度, 颜色)
+
+    def fill(self, width: int, color) -> None:
+        """填充血量部分，长度和颜色都没变时不重新填充"""
+        if (width, color) != self.filled:
+            self.bar.fill(color, pygame.Rect(0, 0, width, self.bar.get_height()))
+            self.filled = (width, color)
+
+
+class BossAppearance:
+    """Boss外观：正常图像和受击闪烁图像，以及各自的碰撞掩码"""
+    def __init__(self, image: pygame.Surface, flash_image: pygame.Surface):
+        self.image = image  # 正常外观
+        self.mask = build_hit_mask(image)
+        self.flash_image = flash_image  # 受击闪烁时的外观
+        self.flash_mask = build_hit_mask(flash_image)
+        self.health_bars: Dict[int, BossHealthBar] = {}  # 血条宽度 -> 血条图像
+
+    def get_health_bar(self, width: int, height: int) -> BossHealthBar:
+        """获取指定宽度的血条图像，同一宽度只创建一次"""
+        health_bar = self.health_bars.get(width)
+        if health_bar is None:
+            health_bar = self.health_bars[width] = BossHealthBar(width, height)
+        return health_bar
+
+
+# 按(Boss类型, 尺寸)缓存的外观，后续同类型的Boss直接复用
+boss_appearances: Dict[Tuple[BossType, int], BossAppearance] = {}
+
+
 # 新增伤害数字显示类
 class DamageText:
     """显示伤害数值的飘动文本"""
@@ -31,13 +83,10 @@ class DamageText:
         self.alpha = 255  # 透明度
         
         # 创建字体
-        try:
-            self.font = pygame.font.SysFont('Arial', 14)
-        except:
-            self.font = pygame.font.Font(None, 14)
+        self.font = get_font('Arial', 14)
     
-    def tick(self):
-        """更新伤害文本状态"""
+    def update(self):
+        """更新伤害文本状态，返回是否仍然存活"""
         self.life -= 1
         self.y += self.velocity_y
         
@@ -45,19 +94,15 @@ class DamageText:
         if self.life < 10:
             self.alpha = int(self.alpha * 0.8)
         
-        # 渲染文本
-        text = self.font.render(f"{self.damage}", True, self.color)
-        text_surface = pygame.Surface(text.get_size(), pygame.SRCALPHA)
-        text_surface.fill((0, 0, 0, 0))  # 透明背景
-        text_surface.blit(text, (0, 0))
-        
-        # 应用透明度
-        text_surface.set_alpha(self.alpha)
+        return self.life > 0  # 返回是否仍然存活
+    
+    def draw(self):
+        """绘制伤害文本"""
+        # 渲染带透明度的文本，透明度按固定序列衰减，各帧的图像都能从缓存复用
+        text_surface = render_text(self.font, f"{self.damage}", self.color, alpha=self.alpha)
         
         # 绘制到屏幕上
-        self.config.screen.blit(text_surface, (self.x, self.y))
-        
-        return self.life > 0  # 返回是否仍然存活
+        self.config.blit(text_surface, (self.x, self.y))
 
 
 class Boss(Entity):
@@ -70,6 +115,7 @@ class Boss(Entity):
         # 添加准备阶段属性
         self.preparation_time = 60  # 准备时间（帧数）：约2秒
         self.is_preparing = True    # 是否处于准备阶段
+        self.initial_preparation_time = self.preparation_time  # 准备阶段的总帧数，用于绘制准备进度条
         
         # 新增伤害文本列表
         self.damage_texts = []
@@ -127,14 +173,23 @@ class Boss(Entity):
         
         self.bullets: List[Bullet] = []  # Boss发射的子弹
         
-        # 创建Boss图像
-        surface = self.create_boss_appearance()
+        # 获取Boss外观，同类型同尺寸的Boss只创建一次
+        appearance = boss_appearances.get((boss_type, self.base_size))
+        if appearance is None:
+            appearance = BossAppearance(self.create_boss_appearance(), self.create_flash_appearance())
+            boss_appearances[(boss_type, self.base_size)] = appearance
+        self.appearance = appearance
+        self.flashing = False  # 当前是否显示受击闪烁外观
         
         # 设置位置 (右侧屏幕)
         x = config.window.width - self.base_size - 40
         y = config.window.height // 2 - self.base_size // 2
         
-        super().__init__(config, surface, x, y)
+        super().__init__(config, appearance.image, x, y, hit_mask=appearance.mask)
+        
+        # 随机数流：移动影响游戏进程，伤害数字的位置只影响画面
+        self.rng = config.rng.gameplay("boss")
+        self.effect_rng = config.rng.cosmetic("damage_texts")
         
         # 动画属性
         self.animation_tick = 0
@@ -144,7 +199,7 @@ class Boss(Entity):
         
     def create_boss_appearance(self):
         """根据Boss类型创建外观"""
-        surface = pygame.Surface((self.base_size, self.base_size), pygame.SRCALPHA)
+        surface = create_surface((self.base_size, self.base_size))
         
         # 绘制Boss主体
         pygame.draw.circle(surface, self.default_color, (self.base_size//2, self.base_size//2), self.base_size//2)
@@ -171,6 +226,13 @@ class Boss(Entity):
         
         return surface
     
+    def create_flash_appearance(self):
+        """创建受击闪烁时的外观"""
+        flash_color = (255, 255, 255)
+        surface = create_surface((self.base_size, self.base_size))
+        pygame.draw.circle(surface, flash_color, (self.base_size//2, self.base_size//2), self.base_size//2)
+        return surface
+    
     def draw_basic_face(self, surface):
         """绘制基本的脸部特征"""
         # 添加眼睛
@@ -242,8 +304,9 @@ class Boss(Entity):
             pygame.draw.rect(surface, (180, 180, 180), rect)
             pygame.draw.rect(surface, (100, 100, 100), rect, 2)
     
-    def tick(self) -> None:
+    def update(self, delta_time: float) -> None:
         """更新Boss状态"""
+        super().update(delta_time)  # 记录移动前的位置
         self.move()
         
         # 更新准备阶段
@@ -254,79 +317,72 @@ class Boss(Entity):
                 # 播放准备完成音效
                 self.config.sounds.swoosh.play()
             # 准备阶段不攻击
-            self.update_bullets()
+            self.update_bullets(delta_time)
             self.animation_tick += 1
             self.special_behavior()
             
-            # 更新并绘制伤害文本
+            # 更新伤害文本
             self.update_damage_texts()
+        else:
+            # 管理射击冷却
+            if self.bullet_cooldown > 0:
+                self.bullet_cooldown -= 1
             
-            self.draw()
-            return
+            # 检查是否可以射击
+            if self.bullet_cooldown <= 0:
+                self.shoot()
+                self.bullet_cooldown = self.bullet_rate
             
-        # 管理射击冷却
-        if self.bullet_cooldown > 0:
-            self.bullet_cooldown -= 1
-        
-        # 检查是否可以射击
-        if self.bullet_cooldown <= 0:
-            self.shoot()
-            self.bullet_cooldown = self.bullet_rate
-        
-        # 更新动画
-        self.animation_tick += 1
-        
-        # 更新并绘制子弹
-        self.update_bullets()
-        
-        # 更新并绘制伤害文本
-        self.update_damage_texts()
-        
-        # 特殊行为
-        self.special_behavior()
+            # 更新动画
+            self.animation_tick += 1
+            
+            # 更新子弹
+            self.update_bullets(delta_time)
+            
+            # 更新伤害文本
+            self.update_damage_texts()
+            
+            # 特殊行为
+            self.special_behavior()
         
-        # 绘制Boss
-        self.draw()
+        # 受击闪烁效果
+        self.flashing = self.hit_flash > 0
+        if self.flashing:
+            self.hit_flash -= 1
+
+    def start_preparation(self, frames: int) -> None:
+        """
+        重新开始准备阶段
+        :param frames: 准备时间（帧数）
+        """
+        self.preparation_time = frames
+        self.initial_preparation_time = frames
+        self.is_preparing = True
     
     def draw(self) -> None:
+        # 绘制子弹和伤害文本
+        self.draw_bullets()
+        self.draw_damage_texts()
+        
         # 受击闪烁效果
-        if self.hit_flash > 0:
-            self.hit_flash -= 1
-            flash_color = (255, 255, 255)
-            surface = pygame.Surface((self.base_size, self.base_size), pygame.SRCALPHA)
-            pygame.draw.circle(surface, flash_color, (self.base_size//2, self.base_size//2), self.base_size//2)
-            self.config.screen.blit(surface, (self.x, self.y))
+        if self.flashing:
+            self.config.blit(self.appearance.flash_image, self.render_position())
         else:
-            # 确保恢复正常显示
-            if not hasattr(self, 'normal_displayed') or not self.normal_displayed:
-                self.image = self.create_boss_appearance()
-                self.normal_displayed = True
             # 正常绘制
-            self.config.screen.blit(self.image, (self.x, self.y))
+            self.config.blit(self.appearance.image, self.render_position())
             
         # 直接在Boss头上方绘制血条
         self.draw_health_bar_overhead()
         
         # 准备阶段显示提示和准备进度条
         if self.is_preparing:
-            try:
-                warning_font = pygame.font.SysFont('Arial', 18)
-            except:
-                warning_font = pygame.font.Font(None, 18)
-                
-            warning_text = warning_font.render("准备攻击...", True, (255, 50, 50))
+            warning_font = get_font('Arial', 18)
+            warning_text = render_text(warning_font, "准备攻击...", (255, 50, 50))
             text_x = self.x + (self.base_size - warning_text.get_width()) // 2
             text_y = self.y - 30
-            self.config.screen.blit(warning_text, (text_x, text_y))
+            self.config.blit(warning_text, (text_x, text_y))
             
             # 添加准备进度条
-            # 获取初始准备时间
-            if not hasattr(self, 'initial_preparation_time'):
-                self.initial_preparation_time = 60  # 默认值
-                if hasattr(self, 'preparation_time'):
-                    # 在第一次调用时设置初始准备时间
-                    self.initial_preparation_time = self.preparation_time
-            
             # 计算进度
             progress = 1.0
             if self.initial_preparation_time > 0:
@@ -339,8 +395,8 @@ class Boss(Entity):
             bar_y = self.y - 40
             
             # 背景
-            pygame.draw.rect(self.config.screen, (50, 50, 50, 180), 
-                            pygame.Rect(bar_x, bar_y, bar_width, bar_height))
+            self.config.mark_dirty(pygame.draw.rect(self.config.screen, (50, 50, 50, 180), 
+                            pygame.Rect(bar_x, bar_y, bar_width, bar_height)))
             
             # 进度
             progress_width = bar_width * progress
@@ -357,12 +413,12 @@ class Boss(Entity):
                     green = int(255 * progress * 2)
                     bar_color = (red, green, 0)
                 
-                pygame.draw.rect(self.config.screen, bar_color, 
-                                pygame.Rect(bar_x, bar_y, progress_width, bar_height))
+                self.config.mark_dirty(pygame.draw.rect(self.config.screen, bar_color, 
+                                pygame.Rect(bar_x, bar_y, progress_width, bar_height)))
             
             # 边框 - 使用白色半透明边框
-            pygame.draw.rect(self.config.screen, (255, 255, 255, 100), 
-                            pygame.Rect(bar_x, bar_y, bar_width, bar_height), 1)
+            self.config.mark_dirty(pygame.draw.rect(self.config.screen, (255, 255, 255, 100), 
+                            pygame.Rect(bar_x, bar_y, bar_width, bar_height), 1))
     
     def draw_health_bar_overhead(self) -> None:
         """直接在Boss头上方绘制生命条"""
@@ -378,11 +434,9 @@ class Boss(Entity):
         if bar_y < 0:
             bar_y = 0
         
-        # 绘制背景
-        bg_color = (0, 0, 0, 180)  # 半透明黑色
-        bg_surface = pygame.Surface((bar_width, bar_height), pygame.SRCALPHA)
-        bg_surface.fill(bg_color)
-        self.config.screen.blit(bg_surface, (bar_x, bar_y))
+        # 绘制背景（血条图像按宽度缓存在外观中）
+        health_bar = self.appearance.get_health_bar(bar_width, bar_height)
+        self.config.blit(health_bar.background, (bar_x, bar_y))
         
         # 计算血条长度
         health_percent = self.health / self.max_health
@@ -398,34 +452,24 @@ class Boss(Entity):
         
         # 绘制血条
         if health_width > 0:  # 确保血量大于0才绘制
-            health_surface = pygame.Surface((health_width, bar_height), pygame.SRCALPHA)
-            health_surface.fill(health_color)
-            self.config.screen.blit(health_surface, (bar_x, bar_y))
+            health_bar.fill(health_width, health_color)
+            self.config.blit(health_bar.bar, (bar_x, bar_y), pygame.Rect(0, 0, health_width, bar_height))
         
         # 添加边框
-        pygame.draw.rect(self.config.screen, (255, 255, 255, 100), 
-                         pygame.Rect(bar_x, bar_y, bar_width, bar_height), 1)
+        self.config.blit(health_bar.frame, (bar_x, bar_y))
         
         # 添加血量数值显示
-        try:
-            hp_font = pygame.font.SysFont('Arial', 10)
-        except:
-            hp_font = pygame.font.Font(None, 10)
-        
-        hp_text = hp_font.render(f"{int(self.health)}/{self.max_health}", True, (255, 255, 255))
+        hp_font = get_font('Arial', 10)
+        hp_text = render_text(hp_font, f"{int(self.health)}/{self.max_health}", (255, 255, 255))
         hp_text_rect = hp_text.get_rect(midleft=(bar_x + bar_width + 5, bar_y + bar_height // 2))
-        self.config.screen.blit(hp_text, hp_text_rect)
+        self.config.blit(hp_text, hp_text_rect)
         
         # 如果是Boss战斗的第二轮或以上，在血条旁显示等级
         if hasattr(self, 'level') and self.level > 1:
             # 使用小字体
-            try:
-                level_font = pygame.font.SysFont('Arial', 12)
-            except:
-                level_font = pygame.font.Font(None, 12)
-            
-            level_text = level_font.render(f"Lv{self.level}", True, (255, 255, 255))
-            self.config.screen.blit(level_text, (bar_x + bar_width + 2, bar_y))
+            level_font = get_font('Arial', 12)
+            level_text = render_text(level_font, f"Lv{self.level}", (255, 255, 255))
+            self.config.blit(level_text, (bar_x + bar_width + 2, bar_y))
     
     def special_behavior(self):
         """根据Boss类型执行特殊行为"""
@@ -440,19 +484,15 @@ class Boss(Entity):
         for i in range(2):
             # 创建子弹代表分裂物
             offset_y = 50 if i == 0 else -50
-            bullet = Bullet(self.config, self.x, self.y + offset_y)
+            # 外观 - 小一点的与Boss同色的圆形
+            sprite = get_projectile_sprite("boss_split", self.default_color)
+            bullet = Bullet(self.config, self.x, self.y + offset_y, sprite)
             
             # 设置子弹属性
             bullet.vel_x = -3
             bullet.vel_y = 1 if i == 0 else -1
             bullet.damage = 1
             
-            # 设置外观 - 小一点的绿色圆形
-            size = 20
-            bullet_surface = pygame.Surface((size, size), pygame.SRCALPHA)
-            pygame.draw.circle(bullet_surface, self.default_color, (size//2, size//2), size//2)
-            bullet.image = bullet_surface
-            
             # 添加到子弹列表
             self.bullets.append(bullet)
             
@@ -473,12 +513,12 @@ class Boss(Entity):
         # 根据Boss类型设置移动行为
         if self.boss_type == BossType.NORMAL:
             # 普通Boss - 正常移动
-            if self.animation_tick % 120 == 0 and random.random() < 0.3:
+            if self.animation_tick % 120 == 0 and self.rng.random() < 0.3:
                 self.direction *= -1
                 
         elif self.boss_type == BossType.SPEEDY:
             # 速度型Boss - 更频繁地改变方向
-            if self.animation_tick % 60 == 0 and random.random() < 0.5:
+            if self.animation_tick % 60 == 0 and self.rng.random() < 0.5:
                 self.direction *= -1
                 
         elif self.boss_type == BossType.SPLITTER:
@@ -516,16 +556,11 @@ class Boss(Entity):
     
     def normal_shoot(self) -> None:
         """普通Boss直线射击"""
-        # 创建子弹
-        bullet_surface = pygame.Surface((15, 8), pygame.SRCALPHA)
-        pygame.draw.ellipse(bullet_surface, (255, 0, 0), bullet_surface.get_rect())
-        
         # 从嘴巴位置发射
         bullet_x = self.x - 10
         bullet_y = self.y + self.h // 2
         
-        bullet = Bullet(self.config, bullet_x, bullet_y)
-        bullet.image = bullet_surface
+        bullet = Bullet(self.config, bullet_x, bullet_y, get_projectile_sprite("boss_normal"))
         bullet.vel_x = -8  # 向左飞行
         bullet.damage = 1
         
@@ -536,16 +571,13 @@ class Boss(Entity):
     
     def speedy_shoot(self) -> None:
         """速度型Boss三连射"""
+        sprite = get_projectile_sprite("boss_speedy")
         for i in range(3):
-            bullet_surface = pygame.Surface((10, 6), pygame.SRCALPHA)
-            pygame.draw.ellipse(bullet_surface, (0, 0, 255), bullet_surface.get_rect())
-            
             # 从嘴巴位置发射
             bullet_x = self.x - 10
             bullet_y = self.y + self.h // 2
             
-            bullet = Bullet(self.config, bullet_x, bullet_y)
-            bullet.image = bullet_surface
+            bullet = Bullet(self.config, bullet_x, bullet_y, sprite)
             bullet.vel_x = -12  # 更快速度
             bullet.delay = i * 5  # 设置发射延迟
             bullet.damage = 1
@@ -557,15 +589,11 @@ class Boss(Entity):
     
     def splitter_shoot(self) -> None:
         """分裂型Boss发射分裂子弹"""
-        bullet_surface = pygame.Surface((12, 12), pygame.SRCALPHA)
-        pygame.draw.circle(bullet_surface, (0, 255, 0), (6, 6), 6)
-        
         # 从嘴巴位置发射
         bullet_x = self.x - 10
         bullet_y = self.y + self.h // 2
         
-        bullet = Bullet(self.config, bullet_x, bullet_y)
-        bullet.image = bullet_surface
+        bullet = Bullet(self.config, bullet_x, bullet_y, get_projectile_sprite("boss_splitter"))
         bullet.vel_x = -6  # 慢一些
         bullet.is_splitter = True
         bullet.split_time = 30  # 30帧后分裂
@@ -579,15 +607,11 @@ class Boss(Entity):
     
     def tank_shoot(self) -> None:
         """坦克型Boss发射大型子弹"""
-        bullet_surface = pygame.Surface((20, 20), pygame.SRCALPHA)
-        pygame.draw.circle(bullet_surface, (128, 0, 128), (10, 10), 10)
-        
         # 从嘴巴位置发射
         bullet_x = self.x - 20
         bullet_y = self.y + self.h // 2
         
-        bullet = Bullet(self.config, bullet_x, bullet_y)
-        bullet.image = bullet_surface
+        bullet = Bullet(self.config, bullet_x, bullet_y, get_projectile_sprite("boss_tank"))
         bullet.vel_x = -5  # 慢一些
         bullet.damage = 2  # 伤害更高
         
@@ -614,8 +638,8 @@ class Boss(Entity):
             
         # 创建伤害数值显示
         # 在Boss身体上随机位置显示，增加一些随机性
-        x_offset = random.randint(-int(self.base_size * 0.3), int(self.base_size * 0.3))
-        y_offset = random.randint(-int(self.base_size * 0.3), int(self.base_size * 0.3))
+        x_offset = self.effect_rng.randint(-int(self.base_size * 0.3), int(self.base_size * 0.3))
+        y_offset = self.effect_rng.randint(-int(self.base_size * 0.3), int(self.base_size * 0.3))
         
         # 根据伤害值选择颜色
         if damage >= 5:
@@ -635,6 +659,11 @@ class Boss(Entity):
         )
         self.damage_texts.append(damage_text)
     
+    @property
+    def collision_mask(self) -> pygame.mask.Mask:
+        """与当前显示的外观对应的碰撞掩码"""
+        return self.appearance.flash_mask if self.flashing else self.appearance.mask
+    
     def is_defeated(self) -> bool:
         """检查Boss是否被击败"""
         # 不再输出调试信息
@@ -650,8 +679,8 @@ class Boss(Entity):
         y = 20
         
         # 绘制底部背景
-        pygame.draw.rect(self.config.screen, (50, 50, 50), 
-                        (x, y, bar_width, bar_height))
+        self.config.mark_dirty(pygame.draw.rect(self.config.screen, (50, 50, 50), 
+                        (x, y, bar_width, bar_height)))
         
         # 计算当前生命值对应的宽度
         health_width = int((self.health / self.max_health) * bar_width)
@@ -665,44 +694,49 @@ class Boss(Entity):
             color = (255, 0, 0)  # 红色
             
         # 绘制生命值
-        pygame.draw.rect(self.config.screen, color, 
-                        (x, y, health_width, bar_height))
+        self.config.mark_dirty(pygame.draw.rect(self.config.screen, color, 
+                        (x, y, health_width, bar_height)))
         
         # 绘制边框
-        pygame.draw.rect(self.config.screen, (200, 200, 200), 
-                        (x, y, bar_width, bar_height), 2)
-        
-        # 添加文字和Boss类型 - 使用默认字体避免乱码
-        try:
-            # 尝试使用Arial字体 - 几乎所有Windows系统都有
-            font = pygame.font.SysFont('Arial', 16)
-            # 显示简化的文本
-            text = font.render(f"HP: {self.health}/{self.max_health}", True, (255, 255, 255))
-        except:
-            # 如果失败，使用系统默认字体
-            font = pygame.font.Font(None, 16)
-            text = font.render(f"HP: {self.health}/{self.max_health}", True, (255, 255, 255))
-            
+        self.config.mark_dirty(pygame.draw.rect(self.config.screen, (200, 200, 200), 
+                        (x, y, bar_width, bar_height), 2))
+        
+        # 添加文字和Boss类型 - 使用Arial字体避免乱码，找不到时使用默认字体
+        font = get_font('Arial', 16)
+        # 显示简化的文本
+        text = render_text(font, f"HP: {self.health}/{self.max_health}", (255, 255, 255))
+
         text_rect = text.get_rect(center=(x + bar_width // 2, y + bar_height // 2))
-        self.config.screen.blit(text, text_rect)
+        self.config.blit(text, text_rect)
     
-    def update_bullets(self):
-        """更新并绘制Boss的子弹"""
+    def update_bullets(self, delta_time: float):
+        """更新Boss的子弹"""
         for bullet in list(self.bullets):
-            bullet.tick()
+            bullet.update(delta_time)
             # 移除超出屏幕的子弹
             if bullet.is_out_of_screen():
-                self.bullets.remove(bullet) 
+                self.bullets.remove(bullet)
+    
+    def draw_bullets(self):
+        """绘制Boss的子弹（一次提交绘制）"""
+        with self.config.batch_layer():
+            for bullet in self.bullets:
+                bullet.draw()
     
     def update_damage_texts(self):
-        """更新并绘制伤害文本"""
+        """更新伤害文本"""
         # 保存仍然存活的伤害文本
         active_texts = []
         
-        # 更新并绘制每个伤害文本
+        # 更新每个伤害文本
         for damage_text in self.damage_texts:
-            if damage_text.tick():  # 如果文本仍然存活
+            if damage_text.update():  # 如果文本仍然存活
                 active_texts.append(damage_text)
         
         # 更新伤害文本列表
-        self.damage_texts = active_texts 
\ No newline at end of file
+        self.damage_texts = active_texts
+    
+    def draw_damage_texts(self):
+        """绘制伤害文本"""
+        for damage_text in self.damage_texts:
+            damage_text.draw()
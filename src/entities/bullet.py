@@ -1,21 +1,102 @@
 import pygame
 import copy
+from collections import deque
+from itertools import islice
+from typing import Callable, Dict, Hashable, Optional, Tuple
 
-from ..utils import GameConfig
+from ..utils import GameConfig, build_hit_mask, create_surface, get_swept_mask
 from .entity import Entity
 
 
+class ProjectileSprite:
+    """
+    子弹精灵：不可变的图像和碰撞掩码，同类子弹共享同一个实例；
+    旋转后的精灵按需生成并缓存
+    """
+    rotation_step = 3  # 旋转角度的量化步长（度）
+
+    def __init__(self, image: pygame.Surface) -> None:
+        self.image = image  # 子弹图像（不能修改）
+        self.mask = build_hit_mask(image)  # 碰撞掩码
+        self.rotations: Dict[int, "ProjectileSprite"] = {}  # 角度 -> 旋转后的精灵
+        self.fades: Dict[int, pygame.Surface] = {}  # 透明度 -> 半透明的图像（用于拖尾）
+
+    def rotated(self, angle: float) -> "ProjectileSprite":
+        """
+        获取旋转指定角度（逆时针，度）后的精灵
+        """
+        angle = int(round(angle / self.rotation_step)) * self.rotation_step % 360
+        if angle == 0:
+            return self
+        sprite = self.rotations.get(angle)
+        if sprite is None:
+            sprite = ProjectileSprite(pygame.transform.rotate(self.image, angle))
+            self.rotations[angle] = sprite
+        return sprite
+
+    def faded(self, alpha: int) -> pygame.Surface:
+        """
+        获取指定整体透明度的图像副本，每个透明度只创建一次
+        """
+        image = self.fades.get(alpha)
+        if image is None:
+            image = self.image.copy()
+            image.set_alpha(alpha)
+            self.fades[alpha] = image
+        return image
+
+
+# 子弹外观的绘制函数，按种类注册（武器和Boss的攻击在各自模块中注册）
+projectile_builders: Dict[str, Callable[..., pygame.Surface]] = {}
+# 已创建的子弹精灵，按(种类, 参数)缓存
+projectile_sprites: Dict[Tuple[str, Tuple[Hashable, ...]], ProjectileSprite] = {}
+
+
+def register_projectile(kind: str, builder: Callable[..., pygame.Surface]) -> None:
+    """
+    注册一种子弹外观
+    :param kind: 子弹种类，如"weapon_laser"、"boss_tank"
+    :param builder: 绘制函数，参数与get_projectile_sprite的参数一致，返回子弹图像
+    """
+    projectile_builders[kind] = builder
+
+
+def get_projectile_sprite(kind: str, *args: Hashable) -> ProjectileSprite:
+    """
+    获取子弹精灵，同种类同参数（如颜色）的精灵只绘制一次
+    """
+    key = (kind, args)
+    sprite = projectile_sprites.get(key)
+    if sprite is None:
+        sprite = ProjectileSprite(projectile_builders[kind](*args))
+        projectile_sprites[key] = sprite
+    return sprite
+
+
+def build_round_bullet(size: int, color) -> pygame.Surface:
+    """
+    绘制圆形子弹
+    """
+    surface = create_surface((size, size))
+    pygame.draw.circle(surface, color, (size//2, size//2), size//2)
+    return surface
+
+
+register_projectile("default", lambda: build_round_bullet(8, (255, 255, 0)))  # 黄色子弹
+register_projectile("split_child", lambda: build_round_bullet(5, (0, 255, 0)))  # 小一点的绿色子弹
+
+
 class Bullet(Entity):
     """玩家发射的子弹类"""
     
-    def __init__(self, config: GameConfig, x: int, y: int) -> None:
-        # 创建子弹表面
-        size = 8
-        color = (255, 255, 0)  # 黄色子弹
-        
-        # 创建子弹图像
-        surface = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(surface, color, (size//2, size//2), size//2)
+    def __init__(self, config: GameConfig, x: int, y: int, sprite: Optional[ProjectileSprite] = None) -> None:
+        """
+        :param sprite: 子弹精灵，默认为黄色圆形子弹
+        """
+        if sprite is None:
+            sprite = get_projectile_sprite("default")
+        self.sprite = sprite  # 当前使用的精灵
+        self.base_sprite = sprite  # 未旋转的精灵，用于旋转
         
         # 子弹速度
         self.vel_x = 10  # 水平速度
@@ -31,21 +112,60 @@ class Bullet(Entity):
         self.speed = 10
         self.turn_rate = 0
         self.delay = 0  # 延迟发射
-        self.trail_frames = []
+        self.trail_frames = deque(maxlen=0)  # 拖尾位置的环形缓冲区：(x, y, 精灵)
         self.trail_length = 0
         
         # 初始化实体
-        super().__init__(config, surface, x, y)
+        super().__init__(config, sprite.image, x, y, hit_mask=sprite.mask)
         
-        # 保存原始图像用于旋转
-        self.original_image = self.image.copy()
+        # 上一步的位置（prev_x、prev_y）同时用于扫掠碰撞检测
+        self.swept_cache = None  # (位置与掩码, 扫掠矩形, 扫掠掩码)
     
-    def draw(self) -> None:
+    def set_sprite(self, sprite: ProjectileSprite) -> None:
+        """切换子弹精灵，图像、尺寸和碰撞掩码一起更新"""
+        self.sprite = sprite
+        self.image = sprite.image
+        self.hit_mask = sprite.mask
+        self.w = sprite.image.get_width()
+        self.h = sprite.image.get_height()
+    
+    def enable_trail(self, length: int) -> None:
+        """开启拖尾效果，保留最近length帧的位置"""
+        self.trail_length = length
+        self.trail_frames = deque(maxlen=length)
+    
+    def swept_shape(self):
+        """返回本帧从上一位置移动到当前位置扫过的矩形和掩码"""
+        key = (self.prev_x, self.prev_y, self.x, self.y, self.w, self.h, self.hit_mask)
+        if self.swept_cache is None or self.swept_cache[0] != key:
+            start = pygame.Rect(self.prev_x, self.prev_y, self.w, self.h)
+            end = self.rect
+            dx, dy = end.x - start.x, end.y - start.y
+            mask = get_swept_mask(self.hit_mask, dx, dy) if self.hit_mask is not None else None
+            self.swept_cache = (key, start.union(end), mask)
+        return self.swept_cache[1], self.swept_cache[2]
+    
+    @property
+    def collision_rect(self) -> pygame.Rect:
+        """碰撞矩形覆盖本帧的整条移动路径，高速子弹不会穿过细小目标"""
+        if self.x == self.prev_x and self.y == self.prev_y:
+            return self.rect
+        return self.swept_shape()[0]
+    
+    @property
+    def collision_mask(self):
+        """与collision_rect对应的扫掠掩码"""
+        if self.x == self.prev_x and self.y == self.prev_y:
+            return self.hit_mask
+        return self.swept_shape()[1]
+    
+    def update(self, delta_time: float) -> None:
+        super().update(delta_time)  # 记录移动前的位置
+        
         # 处理延迟发射
         if self.delay > 0:
             self.delay -= 1
-            super().draw()  # 仍然绘制子弹但不移动
-            return
+            return  # 不移动
         
         # 特殊子弹类型的更新逻辑
         if self.is_homing and hasattr(self, 'update_homing'):
@@ -55,20 +175,9 @@ class Bullet(Entity):
             self.x += self.vel_x
             self.y += self.vel_y
         
-        # 处理激光拖尾效果
+        # 激光拖尾：保存当前位置信息，环形缓冲区只保留最近的几帧
         if self.trail_length > 0:
-            # 保存当前位置信息
-            self.trail_frames.append((self.x, self.y, self.image.copy()))
-            
-            # 只保留最近的几帧
-            if len(self.trail_frames) > self.trail_length:
-                self.trail_frames.pop(0)
-            
-            # 绘制拖尾效果（半透明）
-            for i, (trail_x, trail_y, trail_img) in enumerate(self.trail_frames[:-1]):
-                alpha = 128 * (i + 1) // len(self.trail_frames)  # 越早的帧越透明
-                trail_img.set_alpha(alpha)
-                self.config.screen.blit(trail_img, (trail_x, trail_y))
+            self.trail_frames.append((self.x, self.y, self.sprite))
         
         # 分裂子弹逻辑
         if self.is_splitter:
@@ -76,6 +185,14 @@ class Bullet(Entity):
             if self.split_time <= 0 and not hasattr(self, 'has_split'):
                 self.has_split = True
                 self.split()
+    
+    def draw(self) -> None:
+        # 绘制拖尾效果（半透明图像预先生成并缓存）
+        count = len(self.trail_frames)
+        if count > 1:
+            for i, (trail_x, trail_y, trail_sprite) in enumerate(islice(self.trail_frames, count - 1)):
+                alpha = 128 * (i + 1) // count  # 越早的帧越透明
+                self.config.blit(trail_sprite.faded(alpha), (trail_x, trail_y))
         
         super().draw()  # 调用父类绘制方法
     
@@ -88,7 +205,8 @@ class Bullet(Entity):
             new_x = self.x
             new_y = self.y
             
-            bullet = Bullet(self.config, new_x, new_y)
+            # 外观 - 小一点的绿色子弹
+            bullet = Bullet(self.config, new_x, new_y, get_projectile_sprite("split_child"))
             bullet.damage = self.damage // 2  # 伤害减半
             
             # 设置速度
@@ -98,12 +216,6 @@ class Bullet(Entity):
             bullet.vel_x = speed * math.cos(angle_rad)
             bullet.vel_y = speed * math.sin(angle_rad)
             
-            # 设置外观 - 小一点的绿色子弹
-            size = 5
-            bullet_surface = pygame.Surface((size, size), pygame.SRCALPHA)
-            pygame.draw.circle(bullet_surface, (0, 255, 0), (size//2, size//2), size//2)
-            bullet.image = bullet_surface
-            
             # 添加到父弹所属的子弹列表中
             if hasattr(self, 'parent') and hasattr(self.parent, 'bullets'):
                 self.parent.bullets.append(bullet)
@@ -1,10 +1,9 @@
-import random
 import pygame
 from enum import Enum
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from .entity import Entity
-from ..utils import GameConfig
+from ..utils import GameConfig, SpatialGrid, build_hit_mask, create_surface, get_font
 
 
 class CoinType(Enum):
@@ -14,6 +13,33 @@ class CoinType(Enum):
     GOLD = "金币"      # 金币，5分
 
 
+class CoinSpriteSheet:
+    """
+    金币旋转精灵表：预先生成每个旋转角度的图像和碰撞掩码，同类金币共享
+    """
+
+    def __init__(self, image: pygame.Surface, rotation_step: int = 2) -> None:
+        """
+        :param image: 未旋转的金币图像
+        :param rotation_step: 相邻两帧的角度差（度），与金币每帧的旋转速度一致
+        """
+        self.image = image  # 未旋转的金币图像
+        self.rotation_step = rotation_step  # 角度步长
+        self.frames: List[Tuple[pygame.Surface, pygame.mask.Mask]] = []  # 每个角度的(图像, 掩码)
+        for angle in range(0, 360, rotation_step):
+            rotated = pygame.transform.rotate(image, angle)
+            self.frames.append((rotated, build_hit_mask(rotated)))
+
+    def get(self, angle: float) -> Tuple[pygame.Surface, pygame.mask.Mask]:
+        """
+        获取指定角度的(图像, 掩码)
+        """
+        return self.frames[int(round(angle / self.rotation_step)) % len(self.frames)]
+
+
+coin_sprite_sheets: Dict[CoinType, CoinSpriteSheet] = {}  # 每种金币的旋转精灵表
+
+
 class Coin(Entity):
     """金币实体类"""
     
@@ -47,16 +73,20 @@ class Coin(Entity):
             self.color = (255, 215, 0)  # 金色
             self.score_value = 5
         
-        # 创建金币表面
-        coin_surface = self.create_coin_surface()
+        # 同类金币共享图像和旋转精灵表，只在第一次创建时绘制
+        sheet = coin_sprite_sheets.get(coin_type)
+        if sheet is None:
+            sheet = CoinSpriteSheet(self.create_coin_surface(), self.rotation_speed)
+            coin_sprite_sheets[coin_type] = sheet
+        self.sheet = sheet
         
         # 调用父类初始化
-        super().__init__(config, coin_surface, x, y)
+        super().__init__(config, sheet.image, x, y, hit_mask=sheet.frames[0][1])
     
     def create_coin_surface(self) -> pygame.Surface:
         """创建金币表面"""
         # 创建圆形金币
-        surface = pygame.Surface((self.coin_size, self.coin_size), pygame.SRCALPHA)
+        surface = create_surface((self.coin_size, self.coin_size))
         
         # 外圈
         pygame.draw.circle(surface, self.color, (self.coin_size//2, self.coin_size//2), self.coin_size//2)
@@ -84,12 +114,8 @@ class Coin(Entity):
     
     def draw_text(self, surface: pygame.Surface, text: str) -> None:
         """在金币上绘制文字"""
-        try:
-            # 尝试使用Arial字体
-            font = pygame.font.SysFont("Arial", 12, bold=True)
-        except:
-            # 如果失败，使用默认字体
-            font = pygame.font.Font(None, 12)
+        # 使用Arial字体，找不到时使用默认字体
+        font = get_font("Arial", 12, bold=True)
         
         # 创建文本
         text_surface = font.render(text, True, (50, 50, 50))
@@ -103,28 +129,43 @@ class Coin(Entity):
         r, g, b = color
         return (min(r + amount, 255), min(g + amount, 255), min(b + amount, 255))
     
-    def tick(self) -> None:
+    def update(self, delta_time: float) -> None:
         """更新金币状态"""
         if not self.active:
             return
+        super().update(delta_time)  # 记录移动前的位置
         
         # 移动金币
         self.x += self.velocity
         
         # 旋转金币
         self.rotation_angle = (self.rotation_angle + self.rotation_speed) % 360
-        rotated_image = pygame.transform.rotate(self.image, self.rotation_angle)
-        
-        # 获取旋转后的矩形，并保持中心点不变
-        rect = rotated_image.get_rect(center=(self.x + self.w//2, self.y + self.h//2))
-        
-        # 绘制金币
-        self.config.screen.blit(rotated_image, rect.topleft)
         
         # 检查是否超出屏幕
         if self.x + self.coin_size < 0:
             self.active = False
     
+    def draw(self) -> None:
+        """绘制当前旋转角度的金币（位置按插值计算）"""
+        rotated_image, _ = self.sheet.get(self.rotation_angle)
+        x, y = self.render_position()
+        self.config.blit(rotated_image, rotated_image.get_rect(center=(x + self.w//2, y + self.h//2)))
+    
+    @property
+    def collision_rect(self) -> pygame.Rect:
+        """
+        当前旋转帧的矩形，保持中心点不变
+        """
+        rotated_image, _ = self.sheet.get(self.rotation_angle)
+        return rotated_image.get_rect(center=(self.x + self.w//2, self.y + self.h//2))
+
+    @property
+    def collision_mask(self) -> pygame.mask.Mask:
+        """
+        当前旋转帧的碰撞掩码
+        """
+        return self.sheet.get(self.rotation_angle)[1]
+    
     def is_active(self) -> bool:
         """检查金币是否激活"""
         return self.active
@@ -156,12 +197,14 @@ class CoinManager:
         self.bronze_chance = 0.6  # 铜币概率
         self.silver_chance = 0.3  # 银币概率
         self.gold_chance = 0.1    # 金币概率
+        
+        self.rng = config.rng.gameplay("coins")  # 金币生成的随机数流
     
-    def tick(self, delta_time: int) -> None:
+    def update(self, delta_time: float) -> None:
         """更新金币管理器状态
         
         Args:
-            delta_time: 帧间隔时间
+            delta_time: 本步的时长（毫秒）
         """
         # 更新金币生成计时器
         self.spawn_timer += 1
@@ -171,24 +214,28 @@ class CoinManager:
             self.spawn_coin()
             self.spawn_timer = 0
         
-        # 更新并绘制所有金币
+        # 更新所有金币，清除已失活的金币（本步移出屏幕的金币下一步再清除）
         active_coins = []
         for coin in self.coins:
             if coin.is_active():
-                coin.tick()
+                coin.update(delta_time)
                 active_coins.append(coin)
-        
-        # 更新金币列表，清除已失活的金币
         self.coins = active_coins
     
+    def draw(self) -> None:
+        """绘制所有金币（一次提交绘制）"""
+        with self.config.batch_layer():
+            for coin in self.coins:
+                coin.draw()
+    
     def spawn_coin(self) -> None:
         """生成新金币"""
         # 随机位置（在屏幕右侧，垂直位置随机）
         x = self.config.window.width
-        y = random.randint(50, self.config.window.height - 100)
+        y = self.rng.randint(50, self.config.window.height - 100)
         
         # 根据概率选择金币类型
-        coin_type_rand = random.random()
+        coin_type_rand = self.rng.random()
         if coin_type_rand < self.bronze_chance:
             coin_type = CoinType.BRONZE
         elif coin_type_rand < self.bronze_chance + self.silver_chance:
@@ -200,11 +247,12 @@ class CoinManager:
         coin = Coin(self.config, coin_type, x, y)
         self.coins.append(coin)
     
-    def check_player_collision(self, player) -> int:
+    def check_player_collision(self, player, grid: Optional[SpatialGrid] = None) -> int:
         """检查玩家与金币的碰撞，返回获得的分数
         
         Args:
             player: 玩家实体
+            grid: 碰撞网格，提供时只检测与玩家同格子的金币
         
         Returns:
             int: 获得的分数
@@ -212,14 +260,16 @@ class CoinManager:
         score = 0
         coins_to_remove = []
         
-        for coin in self.coins:
-            if coin.is_active() and player.collide(coin):
-                # 收集金币并获得分数
-                score += coin.collect()
-                coins_to_remove.append(coin)
-                
-                # 播放得分音效
-                self.config.sounds.point.play()
+        candidates = grid.query("coin", player.collision_rect) if grid else self.coins
+        candidates = [coin for coin in candidates if coin.is_active()]
+        for index in player.collide_many(candidates):
+            coin = candidates[index]
+            # 收集金币并获得分数
+            score += coin.collect()
+            coins_to_remove.append(coin)
+            
+            # 播放得分音效
+            self.config.sounds.point.play()
         
         # 移除已收集的金币
         for coin in coins_to_remove:
@@ -1,8 +1,8 @@
-from typing import Optional  # 可选类型导入，用于类型注解
+from typing import List, Optional, Sequence, Tuple  # 类型导入，用于类型注解
 
 import pygame  # 导入 Pygame 库，处理游戏图形和声音
 
-from ..utils import GameConfig, get_hit_mask, pixel_collision  # 导入游戏配置和碰撞检测工具
+from ..utils import GameConfig, batch_collision, get_hit_mask, pixel_collision  # 导入游戏配置和碰撞检测工具
 
 
 class Entity:  # 定义实体基类，所有游戏实体的父类
@@ -10,7 +10,7 @@ class Entity:  # 定义实体基类，所有游戏实体的父类
     实体基类，所有游戏实体的父类。
     """
 
-    def __init__(self, config: GameConfig, image: Optional[pygame.Surface] = None, x=0, y=0, w: int = None, h: int = None, **kwargs) -> None:  # 构造函数，初始化实体
+    def __init__(self, config: GameConfig, image: Optional[pygame.Surface] = None, x=0, y=0, w: int = None, h: int = None, hit_mask: Optional[pygame.mask.Mask] = None, **kwargs) -> None:  # 构造函数，初始化实体
         """
         构造函数，初始化实体。
         
@@ -20,11 +20,14 @@ class Entity:  # 定义实体基类，所有游戏实体的父类
         :param y: 实体的 y 坐标
         :param w: 实体的宽度
         :param h: 实体的高度
+        :param hit_mask: 预先生成的碰撞掩码，不提供时根据图像生成
         :param kwargs: 其他属性
         """
         self.config = config  # 保存游戏配置
         self.x = x  # 实体的 x 坐标
         self.y = y  # 实体的 y 坐标
+        self.prev_x = x  # 本步开始时的 x 坐标，用于绘制插值
+        self.prev_y = y  # 本步开始时的 y 坐标
         if w or h:  # 如果提供了宽度或高度
             self.w = w or config.window.ratio * h  # 计算宽度
             self.h = h or w / config.window.ratio  # 计算高度
@@ -34,7 +37,10 @@ class Entity:  # 定义实体基类，所有游戏实体的父类
             self.w = image.get_width() if image else 0  # 获取图像宽度
             self.h = image.get_height() if image else 0  # 获取图像高度
 
-        self.hit_mask = get_hit_mask(image) if image else None  # 获取碰撞掩码
+        if hit_mask is not None:  # 使用预先生成的碰撞掩码
+            self.hit_mask = hit_mask
+        else:
+            self.hit_mask = get_hit_mask(image) if image else None  # 获取碰撞掩码
         self.__dict__.update(kwargs)  # 更新其他属性
 
     def update_image(self, image: pygame.Surface, w: int = None, h: int = None) -> None:  # 更新实体图像
@@ -77,6 +83,24 @@ class Entity:  # 定义实体基类，所有游戏实体的父类
         """
         return pygame.Rect(self.x, self.y, self.w, self.h)  # 返回矩形区域
 
+    @property  # 属性装饰器，返回参与碰撞检测的矩形区域
+    def collision_rect(self) -> pygame.Rect:
+        """
+        返回参与碰撞检测的矩形区域，默认与绘制区域相同。
+        
+        :return: 碰撞矩形
+        """
+        return self.rect
+
+    @property  # 属性装饰器，返回与collision_rect对应的碰撞掩码
+    def collision_mask(self):
+        """
+        返回与collision_rect对应的碰撞掩码。
+        
+        :return: 碰撞掩码
+        """
+        return self.hit_mask
+
     def collide(self, other) -> bool:  # 碰撞检测
         """
         碰撞检测。
@@ -84,14 +108,60 @@ class Entity:  # 定义实体基类，所有游戏实体的父类
         :param other: 另一个实体
         :return: 是否碰撞
         """
-        if not self.hit_mask or not other.hit_mask:  # 如果没有碰撞掩码
-            return self.rect.colliderect(other.rect)  # 使用矩形碰撞检测
-        return pixel_collision(self.rect, other.rect, self.hit_mask, other.hit_mask)  # 使用像素碰撞检测
+        rect, other_rect = self.collision_rect, other.collision_rect
+        mask, other_mask = self.collision_mask, other.collision_mask
+        if mask is None or other_mask is None:  # 如果没有碰撞掩码
+            return rect.colliderect(other_rect)  # 使用矩形碰撞检测
+        return pixel_collision(rect, other_rect, mask, other_mask)  # 使用像素碰撞检测
+
+    def collide_many(self, others: Sequence["Entity"]) -> List[int]:  # 批量碰撞检测
+        """
+        与一组实体做批量碰撞检测。
+        
+        :param others: 候选实体
+        :return: 发生碰撞的候选实体下标
+        """
+        return batch_collision(
+            self.collision_rect,
+            self.collision_mask,
+            [other.collision_rect for other in others],
+            [other.collision_mask for other in others],
+        )
+
+    def remember_position(self) -> None:  # 记录本步开始时的位置
+        """
+        记录本步开始时的位置，绘制时在它和当前位置之间插值。
+        """
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def render_position(self) -> Tuple[float, float]:  # 计算绘制位置
+        """
+        计算绘制位置：按固定步长的插值系数，在上一步和当前位置之间插值。
+        
+        :return: 绘制用的 (x, y) 坐标
+        """
+        alpha = self.config.timestep.alpha
+        if alpha >= 1:
+            return self.x, self.y
+        return (
+            self.prev_x + (self.x - self.prev_x) * alpha,
+            self.prev_y + (self.y - self.prev_y) * alpha,
+        )
+
+    def update(self, delta_time: float) -> None:  # 更新实体状态
+        """
+        更新实体状态（移动、动画、计时），不绘制。
+        
+        :param delta_time: 本步的时长（毫秒）；实体的速度和帧计数按每个固定步长设定
+        """
+        self.remember_position()  # 记录移动前的位置
 
-    def tick(self) -> None:  # 更新实体状态
+    def tick(self) -> None:  # 更新并绘制实体
         """
-        更新实体状态。
+        更新并绘制实体（更新一个固定步长后立即绘制）。
         """
+        self.update(self.config.timestep.step_ms)  # 更新实体状态
         self.draw()  # 绘制实体
         # 禁用调试显示
         # rect = self.rect  # 获取矩形区域
@@ -100,14 +170,14 @@ class Entity:  # 定义实体基类，所有游戏实体的父类
         #     # 在矩形顶部写入 x 和 y 坐标
         #     font = pygame.font.SysFont("Arial", 13, True)  # 创建字体对象
         #     text = font.render(f"{self.x:.1f}, {self.y:.1f}, {self.w:.1f}, {self.h:.1f}", True, (255, 255, 255))  # 渲染文本
-        #     self.config.screen.blit(text, (
+        #     self.config.blit(text, (
         #         rect.x + rect.w / 2 - text.get_width() / 2,
         #         rect.y - text.get_height(),
         #     ))  # 在屏幕上绘制文本
 
     def draw(self) -> None:  # 绘制实体
         """
-        绘制实体。
+        按当前状态绘制实体，不修改状态。
         """
         if self.image:  # 如果有图像
-            self.config.screen.blit(self.image, self.rect)  # 在屏幕上绘制图像
+            self.config.blit(self.image, self.render_position())  # 在屏幕上绘制图像（直接用坐标，不必每次创建矩形）
@@ -22,10 +22,19 @@ class Floor(Entity):
         """
         self.vel_x = 0
 
-    def draw(self) -> None:
+    def update(self, delta_time: float) -> None:
         """
-        绘制地面实体。
+        更新地面位置。
+
+        :param delta_time: 本步的时长（毫秒）
         """
-        # 使地面实体循环绘制
+        super().update(delta_time)
+        # 使地面实体循环滚动
         self.x = -((-self.x + self.vel_x) % self.x_extra)
-        super().draw()
+
+    def render_position(self):
+        """
+        地面循环滚动，插值时同样按循环宽度取模，避免回绕时跳动
+        """
+        alpha = self.config.timestep.alpha
+        return -((-self.prev_x + self.vel_x * alpha) % self.x_extra), self.y
@@ -0,0 +1,265 @@
+import math
+from typing import Dict, List, Tuple
+
+import pygame
+
+from ..utils import GameConfig, create_surface, get_font, render_text
+
+# 菜单颜色方案
+PRIMARY_COLOR = (255, 204, 0)  # 主要颜色（金黄色）
+DARK_COLOR = (40, 40, 40)  # 按钮背景色
+BORDER_COLOR = (100, 100, 100)  # 未选中按钮的边框色
+GLOW_COLOR = (PRIMARY_COLOR[0], PRIMARY_COLOR[1], PRIMARY_COLOR[2], 50)  # 选中按钮的发光色
+
+# 菜单布局
+BUTTON_WIDTH = 200
+BUTTON_HEIGHT = 50
+BUTTON_SPACING = 65  # 按钮之间的间距
+BUTTON_START_Y = 150
+MENU_PANEL_WIDTH = BUTTON_WIDTH + 60
+MENU_PANEL_HEIGHT = 395  # 容纳五个模式按钮
+ICON_SIZE = 24
+
+TITLE_Y = 60
+TITLE_MIN_SCALE = 0.95  # 标题脉动的缩放范围
+TITLE_MAX_SCALE = 1.05
+TITLE_SCALE_STEP = 0.0005  # 标题每帧的缩放变化
+
+ANIMATION_STEPS = 10  # 按钮选中渐变的帧数
+
+# 模式按钮：(名称, 描述)
+MODE_BUTTONS = (
+    ("经典模式", "无尽挑战的经典玩法"),
+    ("限时挑战", "60秒内获得最高分"),
+    ("重力反转", "颠倒重力，挑战不同体验"),
+    ("Boss战斗", "击败强大的Boss敌人"),
+    ("金币收集", "收集金币获取更高分数"),
+)
+
+
+def create_mode_icons() -> List[pygame.Surface]:
+    """
+    创建模式按钮图标 - 使用简单的图形
+    """
+    icons = []
+
+    # 经典模式图标 - 管道
+    classic_icon = create_surface((ICON_SIZE, ICON_SIZE))
+    pygame.draw.rect(classic_icon, (100, 200, 100), (8, 0, 8, 24))
+    pygame.draw.rect(classic_icon, (80, 180, 80), (8, 0, 8, 6))
+    icons.append(classic_icon)
+
+    # 限时模式图标 - 时钟
+    timed_icon = create_surface((ICON_SIZE, ICON_SIZE))
+    pygame.draw.circle(timed_icon, (200, 200, 200), (12, 12), 10, 2)
+    pygame.draw.line(timed_icon, (200, 200, 200), (12, 12), (12, 6), 2)
+    pygame.draw.line(timed_icon, (200, 200, 200), (12, 12), (16, 12), 2)
+    icons.append(timed_icon)
+
+    # 重力反转图标 - 上下箭头
+    reverse_icon = create_surface((ICON_SIZE, ICON_SIZE))
+    pygame.draw.polygon(reverse_icon, (150, 150, 250), [(12, 0), (18, 8), (14, 8), (14, 16), (18, 16), (12, 24), (6, 16), (10, 16), (10, 8), (6, 8)])
+    icons.append(reverse_icon)
+
+    # Boss模式图标 - 敌人
+    boss_icon = create_surface((ICON_SIZE, ICON_SIZE))
+    pygame.draw.circle(boss_icon, (250, 100, 100), (12, 12), 10)
+    pygame.draw.circle(boss_icon, (255, 255, 255), (8, 8), 3)
+    pygame.draw.circle(boss_icon, (255, 255, 255), (16, 8), 3)
+    pygame.draw.circle(boss_icon, (0, 0, 0), (8, 8), 1)
+    pygame.draw.circle(boss_icon, (0, 0, 0), (16, 8), 1)
+    pygame.draw.rect(boss_icon, (200, 50, 50), (8, 15, 8, 3))
+    icons.append(boss_icon)
+
+    # 金币模式图标 - 金币
+    coin_icon = create_surface((ICON_SIZE, ICON_SIZE))
+    pygame.draw.circle(coin_icon, (255, 215, 0), (12, 12), 10)  # 金色圆形
+    pygame.draw.circle(coin_icon, (255, 235, 100), (12, 12), 7)  # 浅金色内圈
+    # 添加 "$" 符号
+    coin_text = render_text(get_font("Arial", 12, bold=True), "$", (100, 80, 0))
+    coin_icon.blit(coin_text, coin_text.get_rect(center=(12, 12)))
+    icons.append(coin_icon)
+
+    return icons
+
+
+class ModeMenu:
+    """
+    模式选择菜单：面板、未选中的按钮和说明文字预先绘制成静态层，
+    标题脉动和选中按钮的缩放帧按尺寸缓存，每帧只需要几次blit
+    """
+
+    def __init__(self, config: GameConfig) -> None:
+        """
+        初始化菜单并预先绘制静态部分
+        :param config: 游戏配置
+        """
+        self.config = config
+        self.center_x = config.window.width // 2
+
+        title_font = get_font('SimHei', 36)  # 标题字体
+        mode_font = get_font('SimHei', 24)  # 模式选择字体
+        desc_font = get_font('SimHei', 14)  # 描述文字字体
+        instruction_font = get_font('SimHei', 18)  # 指示字体
+
+        self.title_text = render_text(title_font, "FlappyBird", (255, 255, 255))  # 白色标题
+        self.button_texts = [render_text(mode_font, name, (255, 255, 255)) for name, _ in MODE_BUTTONS]
+        self.desc_texts = [render_text(desc_font, desc, (220, 220, 220)) for _, desc in MODE_BUTTONS]
+        self.icons = create_mode_icons()
+
+        # 按钮位置
+        self.button_positions = [BUTTON_START_Y + BUTTON_SPACING * i for i in range(len(MODE_BUTTONS))]
+        self.panel_pos = (self.center_x - MENU_PANEL_WIDTH // 2, BUTTON_START_Y - 20)
+
+        # 说明文字
+        self.instruction_text = render_text(instruction_font, "↑↓ 选择    空格 开始", (255, 255, 255))
+        self.instruction_pos = (self.center_x - self.instruction_text.get_width() // 2,
+                                self.panel_pos[1] + MENU_PANEL_HEIGHT + 20)
+
+        # 每个选中项对应一张静态层：半透明面板加上其余未选中的按钮
+        self.idle_buttons = [self.build_button(i, BUTTON_WIDTH, BUTTON_HEIGHT, ICON_SIZE, None)
+                             for i in range(len(MODE_BUTTONS))]
+        self.static_layers = [self.build_static_layer(i) for i in range(len(MODE_BUTTONS))]
+
+        # 标题脉动帧：按缩放后的尺寸缓存，整个脉动范围预先生成
+        self.title_frames: Dict[Tuple[int, int], pygame.Surface] = {}
+        steps = round((TITLE_MAX_SCALE - TITLE_MIN_SCALE) / TITLE_SCALE_STEP)
+        for step in range(steps + 1):
+            self.get_title_frame(TITLE_MIN_SCALE + step * TITLE_SCALE_STEP)
+
+        # 选中按钮的缩放帧：(按钮序号, 渐变进度, 宽, 高, 图标大小) -> 按钮图像
+        self.selected_frames: Dict[Tuple[int, int, int, int, int], pygame.Surface] = {}
+
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        重置选中项和动画状态（每次进入欢迎界面时调用）
+        """
+        self.selected = 0  # 0=经典, 1=限时, 2=反转, 3=Boss, 4=金币
+        self.animations = [0] * len(MODE_BUTTONS)  # 每个按钮的渐变进度（0到ANIMATION_STEPS）
+        self.title_scale = 1.0
+        self.title_scale_dir = TITLE_SCALE_STEP
+
+    def move(self, offset: int) -> int:
+        """
+        上下移动选中项
+        :param offset: 移动的格数（向下为正）
+        :return: 新的选中项
+        """
+        self.selected = (self.selected + offset) % len(MODE_BUTTONS)
+        return self.selected
+
+    def build_button(self, index: int, width: int, height: int, icon_size: int, animation) -> pygame.Surface:
+        """
+        绘制一个按钮
+        :param animation: 选中按钮的渐变进度（0到1），None表示未选中
+        """
+        surface = create_surface((width, height))
+        rect = surface.get_rect()
+        if animation is None:
+            # 未选中的按钮 - 暗色背景
+            pygame.draw.rect(surface, DARK_COLOR, rect, border_radius=10)
+            pygame.draw.rect(surface, BORDER_COLOR, rect, 2, border_radius=10)
+        else:
+            # 选中的按钮 - 亮色渐变背景
+            bg_color = tuple(int(d + (p - d) * animation) for d, p in zip(DARK_COLOR, PRIMARY_COLOR))
+            pygame.draw.rect(surface, bg_color, rect, border_radius=10)
+            # 添加高亮边框
+            pygame.draw.rect(surface, PRIMARY_COLOR, rect, 3, border_radius=10)
+            # 添加发光效果
+            glow_surface = create_surface((width, height))
+            pygame.draw.rect(glow_surface, GLOW_COLOR, rect, border_radius=10)
+            surface.blit(glow_surface, (0, 0))
+
+        # 按钮图标
+        icon = self.icons[index]
+        if icon_size != ICON_SIZE:
+            icon = pygame.transform.scale(icon, (icon_size, icon_size))
+        surface.blit(icon, (20, (height - icon_size) // 2))
+
+        # 按钮文本
+        text = self.button_texts[index]
+        surface.blit(text, (icon_size + 30, (height - text.get_height()) // 2))
+        return surface
+
+    def build_static_layer(self, selected: int) -> pygame.Surface:
+        """
+        绘制静态层：半透明菜单面板和除选中项以外的按钮
+        """
+        layer = create_surface((MENU_PANEL_WIDTH, MENU_PANEL_HEIGHT))
+        layer.fill((0, 0, 0, 150))  # 半透明黑色
+        button_x = self.center_x - BUTTON_WIDTH // 2 - self.panel_pos[0]
+        for i, button in enumerate(self.idle_buttons):
+            if i != selected:
+                layer.blit(button, (button_x, self.button_positions[i] - self.panel_pos[1]))
+        return layer
+
+    def get_title_frame(self, scale: float) -> pygame.Surface:
+        """
+        获取缩放后的标题图像
+        """
+        size = (int(self.title_text.get_width() * scale), int(self.title_text.get_height() * scale))
+        frame = self.title_frames.get(size)
+        if frame is None:
+            frame = self.title_frames[size] = pygame.transform.scale(self.title_text, size)
+        return frame
+
+    def get_selected_frame(self, scale: float) -> pygame.Surface:
+        """
+        获取选中按钮在当前缩放和渐变进度下的图像
+        """
+        animation = self.animations[self.selected]
+        key = (self.selected, animation,
+               int(BUTTON_WIDTH * scale), int(BUTTON_HEIGHT * scale), int(ICON_SIZE * scale))
+        frame = self.selected_frames.get(key)
+        if frame is None:
+            frame = self.selected_frames[key] = self.build_button(
+                self.selected, key[2], key[3], key[4], animation / ANIMATION_STEPS)
+        return frame
+
+    def update(self) -> None:
+        """
+        更新标题和按钮的动画
+        """
+        # 更新标题动画
+        self.title_scale += self.title_scale_dir
+        if self.title_scale > TITLE_MAX_SCALE:
+            self.title_scale = TITLE_MAX_SCALE
+            self.title_scale_dir = -self.title_scale_dir
+        elif self.title_scale < TITLE_MIN_SCALE:
+            self.title_scale = TITLE_MIN_SCALE
+            self.title_scale_dir = -self.title_scale_dir
+
+        # 更新按钮渐变：选中的按钮逐渐变亮，其余的逐渐恢复
+        for i in range(len(MODE_BUTTONS)):
+            if i == self.selected:
+                self.animations[i] = min(self.animations[i] + 1, ANIMATION_STEPS)
+            else:
+                self.animations[i] = max(self.animations[i] - 1, 0)
+
+    def draw(self) -> None:
+        """
+        绘制菜单
+        """
+        button_scale = 1.0 + 0.03 * math.sin(pygame.time.get_ticks() / 150)
+
+        # 绘制面板和未选中的按钮
+        self.config.blit(self.static_layers[self.selected], self.panel_pos)
+
+        # 绘制游戏标题
+        title = self.get_title_frame(self.title_scale)
+        self.config.blit(title, title.get_rect(center=(self.center_x, TITLE_Y + self.title_text.get_height() // 2)))
+
+        # 绘制选中的按钮
+        button = self.get_selected_frame(button_scale)
+        button_y = self.button_positions[self.selected]
+        self.config.blit(button, (self.center_x - button.get_width() // 2,
+                                  button_y - (button.get_height() - BUTTON_HEIGHT) // 2))
+
+        # 绘制选中按钮的描述
+        desc = self.desc_texts[self.selected]
+        self.config.blit(desc, desc.get_rect(center=(self.center_x, button_y + BUTTON_HEIGHT + 10)))
+
+        # 绘制指令文本
+        self.config.blit(self.instruction_text, self.instruction_pos)
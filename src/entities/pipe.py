@@ -1,7 +1,6 @@
-import random
 from typing import List
 
-from ..utils import GameConfig
+from ..utils import GameConfig, get_hit_mask
 from .entity import Entity
 
 
@@ -10,9 +9,9 @@ class Pipe(Entity):
         super().__init__(*args, **kwargs)
         self.vel_x = -5  # 管道的水平速度
 
-    def draw(self) -> None:
+    def update(self, delta_time: float) -> None:
+        super().update(delta_time)  # 记录移动前的位置
         self.x += self.vel_x  # 更新管道位置
-        super().draw()  # 调用父类的绘制方法
 
 
 class Pipes(Entity):
@@ -26,16 +25,25 @@ class Pipes(Entity):
         self.bottom = self.config.window.viewport_height  # 底部位置
         self.upper = []  # 初始化上方管道列表
         self.lower = []  # 初始化下方管道列表
+        self.rng = config.rng.gameplay("pipes")  # 管道位置和类型的随机数流
+        # 上下管道的碰撞掩码，每局只查找一次，生成管道时不再逐个计算
+        self.masks = tuple(get_hit_mask(image) for image in config.images.pipe)
         self.spawn_initial_pipes()  # 生成初始管道
 
-    def tick(self) -> None:
+    def update(self, delta_time: float) -> None:
         if self.can_spawn_pipes():  # 检查是否可以生成管道
             self.spawn_new_pipes()  # 生成新管道
         self.remove_old_pipes()  # 移除旧管道
 
         for up_pipe, low_pipe in zip(self.upper, self.lower):
-            up_pipe.tick()  # 更新上方管道状态
-            low_pipe.tick()  # 更新下方管道状态
+            up_pipe.update(delta_time)  # 更新上方管道状态
+            low_pipe.update(delta_time)  # 更新下方管道状态
+
+    def draw(self) -> None:
+        with self.config.batch_layer():  # 所有管道一次提交绘制
+            for up_pipe, low_pipe in zip(self.upper, self.lower):
+                up_pipe.draw()  # 绘制上方管道
+                low_pipe.draw()  # 绘制下方管道
 
     def stop(self) -> None:
         for pipe in self.upper + self.lower:
@@ -82,20 +90,21 @@ class Pipes(Entity):
         # 上下管道之间的间隙y坐标
         base_y = self.config.window.viewport_height
 
-        gap_y = random.randrange(0, int(base_y * 0.6 - self.pipe_gap))  # 随机生成间隙y坐标
+        gap_y = self.rng.randrange(0, int(base_y * 0.6 - self.pipe_gap))  # 随机生成间隙y坐标
         gap_y += int(base_y * 0.2)  # 调整间隙y坐标
         pipe_height = self.config.images.pipe[0].get_height()  # 获取管道高度
         pipe_x = self.config.window.width + 10  # 设置管道x坐标
 
         # 随机生成特殊管道
-        if random.random() < 0.2:  # 20% 概率生成特殊管道
-            pipe_type = random.choice(['speed_up', 'speed_down'])
+        if self.rng.random() < 0.2:  # 20% 概率生成特殊管道
+            pipe_type = self.rng.choice(['speed_up', 'speed_down'])
             if pipe_type == 'speed_up':
                 upper_pipe = Pipe(
                     self.config,
                     self.config.images.pipe[0],
                     pipe_x,
                     gap_y - pipe_height,
+                    hit_mask=self.masks[0],
                     speed_up=True
                 )
                 lower_pipe = Pipe(
@@ -103,6 +112,7 @@ class Pipes(Entity):
                     self.config.images.pipe[1],
                     pipe_x,
                     gap_y + self.pipe_gap,
+                    hit_mask=self.masks[1],
                     speed_up=True
                 )
             else:
@@ -111,6 +121,7 @@ class Pipes(Entity):
                     self.config.images.pipe[0],
                     pipe_x,
                     gap_y - pipe_height,
+                    hit_mask=self.masks[0],
                     speed_down=True
                 )
                 lower_pipe = Pipe(
@@ -118,6 +129,7 @@ class Pipes(Entity):
                     self.config.images.pipe[1],
                     pipe_x,
                     gap_y + self.pipe_gap,
+                    hit_mask=self.masks[1],
                     speed_down=True
                 )
         else:
@@ -126,6 +138,7 @@ class Pipes(Entity):
                 self.config.images.pipe[0],
                 pipe_x,
                 gap_y - pipe_height,
+                hit_mask=self.masks[0],
             )  # 创建上方管道
 
             lower_pipe = Pipe(
@@ -133,6 +146,7 @@ class Pipes(Entity):
                 self.config.images.pipe[1],
                 pipe_x,
                 gap_y + self.pipe_gap,
+                hit_mask=self.masks[1],
             )  # 创建下方管道
 
         return upper_pipe, lower_pipe  # 返回上方和下方管道
@@ -1,12 +1,11 @@
 from enum import Enum
 from itertools import cycle
-from typing import List
+from typing import List, Optional
 import math
-import random
 
 import pygame
 
-from ..utils import GameConfig, clamp, get_font
+from ..utils import GameConfig, HudWidget, SpatialGrid, build_hit_mask, clamp, create_surface, get_font, render_text
 from .entity import Entity
 from .floor import Floor
 from .pipe import Pipe, Pipes
@@ -25,16 +24,160 @@ class PlayerMode(Enum):
     BOSS = "BOSS"  # Boss模式
 
 
+# 玩家可能的大小修改器（缩小道具为0.6），图集会为它们预先生成图像
+PLAYER_SIZE_MODIFIERS = (1.0, 0.6)
+
+
+class PlayerSpriteAtlas:
+    """玩家精灵图集：预先生成每个拍打帧在各个量化角度和大小下的图像及碰撞掩码"""
+    angle_step = 3  # 角度量化步长
+    min_angle = -90  # 最小旋转角度
+    max_angle = 90  # 最大旋转角度
+
+    def __init__(self, frames, sizes=PLAYER_SIZE_MODIFIERS) -> None:
+        self.frames = frames  # 原始拍打帧
+        self.entries = {}  # (帧索引, 大小, 角度) -> (图像, 掩码)
+        for index in range(len(frames)):
+            for size in sizes:
+                for angle in range(self.min_angle, self.max_angle + 1, self.angle_step):
+                    self.build(index, size, angle)
+
+    def build(self, index: int, size: float, angle: int):
+        """生成一个图集条目"""
+        image = self.frames[index]
+        if size != 1.0:
+            image = pygame.transform.scale(
+                image, (int(image.get_width() * size), int(image.get_height() * size))
+            )
+        if angle:
+            # pygame.transform.rotate rotates clockwise (opposite of what we want)
+            image = pygame.transform.rotate(image, angle)
+        entry = (image, build_hit_mask(image))
+        self.entries[(index, size, angle)] = entry
+        return entry
+
+    def get(self, index: int, size: float, angle: float = 0):
+        """查找最接近的量化角度对应的图像和掩码"""
+        angle = int(clamp(round(angle / self.angle_step) * self.angle_step, self.min_angle, self.max_angle))
+        entry = self.entries.get((index, size, angle))
+        if entry is None:  # 不在预设大小中的修改器，按需生成
+            entry = self.build(index, size, angle)
+        return entry
+
+
+# 按玩家图像缓存图集，每局新建的Player共享同一个图集
+player_atlases = {}
+
+
+def get_player_atlas(frames) -> PlayerSpriteAtlas:
+    """获取（必要时生成）玩家图像对应的图集"""
+    atlas = player_atlases.get(id(frames))
+    if atlas is None or atlas.frames is not frames:
+        atlas = player_atlases[id(frames)] = PlayerSpriteAtlas(frames)
+    return atlas
+
+
+class InvincibilityAura:
+    """无敌光环动画：按时间相位预先绘制光环和护盾，同一大小的光环只绘制一次，循环播放"""
+    phases = 36  # 一个循环的帧数
+    period = 400 * math.pi  # 循环周期（毫秒）：闪光周期为200π毫秒，星星旋转一周为400π毫秒
+
+    def __init__(self) -> None:
+        self.frames = {}  # (光环大小, 相位) -> (光环图像, 护盾图像)
+
+    def get(self, glow_size: int, ticks: float):
+        """获取指定光环大小在模拟时间ticks（毫秒）对应的(光环图像, 护盾图像)"""
+        phase = int(ticks / self.period * self.phases) % self.phases
+        frame = self.frames.get((glow_size, phase))
+        if frame is None:
+            frame = self.frames[(glow_size, phase)] = self.build(glow_size, phase)
+        return frame
+
+    def build(self, glow_size: int, phase: int):
+        """绘制一个相位的光环和护盾"""
+        ticks = phase * self.period / self.phases  # 相位对应的时间
+        
+        # 创建闪光效果
+        shine_tick = ticks / 100  # 使闪光效果随时间变化
+        shine_alpha = int(128 + 127 * math.sin(shine_tick))  # 在128-255之间变化
+        
+        # 创建一个稍大的金色光环
+        glow_surface = create_surface((glow_size, glow_size))
+        
+        # 绘制金色光环
+        for i in range(3):
+            glow_radius = glow_size // 2 - i * 2
+            # 金色的RGB值，透明度随时间变化
+            gold_color = (255, 215, 0, max(40, shine_alpha - i * 30))
+            pygame.draw.circle(
+                glow_surface,
+                gold_color,
+                (glow_size // 2, glow_size // 2),
+                glow_radius
+            )
+        
+        # 在玩家周围绘制金色保护罩
+        shield_surface = create_surface((glow_size, glow_size))
+        shield_alpha = min(180, shine_alpha)
+        pygame.draw.circle(
+            shield_surface,
+            (255, 215, 0, shield_alpha // 3),  # 金色半透明
+            (glow_size // 2, glow_size // 2),
+            glow_size // 2 - 2,
+            3  # 边框宽度
+        )
+        
+        # 闪烁星星效果
+        star_tick = ticks / 200
+        for i in range(4):
+            star_angle = star_tick + i * (math.pi / 2)
+            star_dist = glow_size // 3
+            star_x = glow_size//2 + star_dist * math.cos(star_angle)
+            star_y = glow_size//2 + star_dist * math.sin(star_angle)
+            star_size = 2 + math.sin(star_tick * 2 + i) * 1.5
+            
+            # 绘制星星
+            pygame.draw.circle(
+                shield_surface,
+                (255, 255, 255, shield_alpha),
+                (int(star_x), int(star_y)),
+                star_size
+            )
+        
+        return glow_surface, shield_surface
+
+
+invincibility_aura = InvincibilityAura()  # 所有玩家共享的无敌光环动画
+
+particle_sprites = {}  # (颜色, 半径) -> 粒子图像
+
+
+def get_particle_sprite(color, radius: int) -> pygame.Surface:
+    """
+    获取爆炸粒子图像：与在屏幕上pygame.draw.circle相同的实心圆，按颜色和半径共享
+    """
+    key = (tuple(color), radius)
+    sprite = particle_sprites.get(key)
+    if sprite is None:
+        sprite = create_surface((radius * 2, radius * 2))
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        particle_sprites[key] = sprite
+    return sprite
+
+
 class Player(Entity):
     def __init__(self, config: GameConfig) -> None:
         self.config = config
         images = config.images.player  # 获取玩家图像
+        self.atlas = get_player_atlas(images)  # 旋转/缩放图集
+        self.frame_index = 0  # 当前拍打帧索引
+        self.rotated_frame = None  # 当前旋转后的(图像, 矩形, 掩码)，碰撞检测和绘制共用
 
         # 根据模式设置当前图像
         x = int(config.window.width * 0.2)
         y = int((config.window.height - images[0].get_height()) / 2)
 
-        super().__init__(config, images[0], x, y)  # 初始化父类
+        super().__init__(config, images[0], x, y, hit_mask=self.atlas.get(0, 1.0)[1])  # 初始化父类，掩码取自图集
 
         # 设置碰撞的管道或地板
         self.crash_entity = None
@@ -65,9 +208,11 @@ class Player(Entity):
         
         # 爆炸特效
         self.explosions = []
+        self.effect_rng = config.rng.cosmetic("explosions")  # 爆炸粒子的随机数流
         
         # 添加弹药显示 - 位置调整到右下角，但与边缘保持适当距离
         self.bullet_ui_pos = (config.window.width - 120, config.window.height - 60)
+        self.weapon_widget = HudWidget(self.build_weapon_ui)  # 武器信息UI
 
         # 设置值
         self.min_y = -self.h - 10  # 最小y坐标
@@ -191,22 +336,11 @@ class Player(Entity):
         self.vel_rot = -8
 
     def update_image(self) -> None:
-        """更新玩家的图像"""
-        size_scale = getattr(self, 'size_modifier', 1.0)
-        if size_scale != 1.0:
-            # 应用缩放
-            idx = next(self.img_gen)
-            original_img = self.config.images.player[idx]
-            new_width = int(original_img.get_width() * size_scale)
-            new_height = int(original_img.get_height() * size_scale)
-            self.image = pygame.transform.scale(original_img, (new_width, new_height))
-            self.w = new_width
-            self.h = new_height
-        else:
-            # 正常大小
-            self.image = self.config.images.player[next(self.img_gen)]
-            self.w = self.image.get_width()
-            self.h = self.image.get_height()
+        """更新玩家的图像（从图集中查找缩放后的帧）"""
+        self.frame_index = next(self.img_gen)
+        self.image, self.hit_mask = self.atlas.get(self.frame_index, self.size_modifier)
+        self.w = self.image.get_width()
+        self.h = self.image.get_height()
 
     def tick_normal(self) -> None:
         if self.vel_y < self.max_vel_y and not self.flapped:
@@ -231,7 +365,7 @@ class Player(Entity):
         self.y = clamp(self.y + adjusted_vel_y, self.min_y, self.max_y)
         self.rotate()
         
-    def tick_boss(self) -> None:
+    def tick_boss(self, delta_time: float) -> None:
         """Boss模式的更新逻辑"""
         # 类似正常模式的移动
         if self.vel_y < self.max_vel_y and not self.flapped:
@@ -247,79 +381,88 @@ class Player(Entity):
         # 更新武器冷却时间
         self.update_weapons()
         
-        # 更新并绘制子弹
-        self.update_bullets()
+        # 更新子弹
+        self.update_bullets(delta_time)
         
         # 更新爆炸特效
         self.update_explosions()
-        
-        # 绘制武器UI
-        self.draw_weapon_ui()
     
     def update_weapons(self):
         """更新所有武器状态"""
         for weapon in self.weapons:
             weapon.update()
     
-    def update_bullets(self):
-        """更新并绘制所有子弹"""
+    def update_bullets(self, delta_time: float):
+        """更新所有子弹"""
         for bullet in list(self.bullets):
             if hasattr(bullet, 'is_homing') and bullet.is_homing:
                 # 更新追踪弹的目标
                 bullet.target = self.boss_target
                 
-            bullet.tick()
+            bullet.update(delta_time)
             # 移除超出屏幕的子弹
             if bullet.is_out_of_screen():
                 self.bullets.remove(bullet)
     
+    def draw_bullets(self):
+        """绘制所有子弹（一次提交绘制）"""
+        with self.config.batch_layer():
+            for bullet in self.bullets:
+                bullet.draw()
+    
     def draw_weapon_ui(self):
-        """绘制当前武器信息UI"""
+        """绘制当前武器信息UI，只有武器或弹药数变化时才重新渲染"""
         weapon = self.weapons[self.current_weapon_index]
+        self.weapon_widget.draw(self.config, (weapon.weapon_type, weapon.color, weapon.ammo), self.bullet_ui_pos)
+
+    def build_weapon_ui(self, key):
+        """
+        渲染武器信息UI
+        :param key: (武器类型, 武器颜色, 弹药数)
+        """
+        weapon_type, weapon_color, ammo = key
         
         # 创建武器信息背景 - 更好的设计
         bg_width = 115
         bg_height = 45
-        bg = pygame.Surface((bg_width, bg_height), pygame.SRCALPHA)
+        bg = create_surface((bg_width, bg_height))
         bg.fill((0, 0, 0, 180))
         
         # 添加圆角边框效果 - 减小边框宽度
         pygame.draw.rect(bg, (255, 255, 255, 70), pygame.Rect(0, 0, bg_width, bg_height), 1, border_radius=3)
         
-        self.config.screen.blit(bg, self.bullet_ui_pos)
-        
         # 使用中文字体 - 减小字体
         font = get_font('SimHei', 12)
         small_font = get_font('SimHei', 9)
         
         # 绘制武器图标 - 略微调整位置
         icon_size = 18
-        icon_x = self.bullet_ui_pos[0] + 10
-        icon_y = self.bullet_ui_pos[1] + 10
+        icon_x = 10
+        icon_y = 10
         
         # 圆形图标背景
-        icon_bg = pygame.Surface((icon_size, icon_size), pygame.SRCALPHA)
-        pygame.draw.circle(icon_bg, weapon.color, (icon_size//2, icon_size//2), icon_size//2)
+        icon_bg = create_surface((icon_size, icon_size))
+        pygame.draw.circle(icon_bg, weapon_color, (icon_size//2, icon_size//2), icon_size//2)
         
         # 根据武器类型绘制不同图标
-        if weapon.weapon_type == WeaponType.NORMAL:
+        if weapon_type == WeaponType.NORMAL:
             # 普通子弹图标 - 圆形
             pygame.draw.circle(icon_bg, (255, 255, 255), (icon_size//2, icon_size//2), icon_size//4)
-        elif weapon.weapon_type == WeaponType.TRIPLE:
+        elif weapon_type == WeaponType.TRIPLE:
             # 三连发图标 - 三个点
             for i in range(3):
                 x = icon_size//2
                 y = 4 + i * 5
                 pygame.draw.circle(icon_bg, (255, 255, 255), (x, y), 1)
-        elif weapon.weapon_type == WeaponType.LASER:
+        elif weapon_type == WeaponType.LASER:
             # 激光图标 - 线
             pygame.draw.line(icon_bg, (255, 255, 255), (4, icon_size//2), (icon_size-4, icon_size//2), 2)
-        elif weapon.weapon_type == WeaponType.HOMING:
+        elif weapon_type == WeaponType.HOMING:
             # 追踪图标 - 箭头
             pygame.draw.polygon(icon_bg, (255, 255, 255), 
                               [(4, 4), (icon_size-4, icon_size//2), (4, icon_size-4)])
         
-        self.config.screen.blit(icon_bg, (icon_x, icon_y))
+        bg.blit(icon_bg, (icon_x, icon_y))
         
         # 简化武器名称 - 移除"子弹"等
         name_map = {
@@ -328,21 +471,21 @@ class Player(Entity):
             "激光": "激光",
             "追踪导弹": "追踪"
         }
-        short_name = name_map.get(weapon.weapon_type.value, weapon.weapon_type.value)
+        short_name = name_map.get(weapon_type.value, weapon_type.value)
         
         # 显示武器名称 - 在图标旁边
-        name_text = font.render(short_name, True, weapon.color)
-        self.config.screen.blit(name_text, (icon_x + icon_size + 5, icon_y))
+        name_text = render_text(font, short_name, weapon_color)
+        bg.blit(name_text, (icon_x + icon_size + 5, icon_y))
         
         # 弹药符号
-        ammo_text = "∞" if weapon.ammo < 0 else f"{weapon.ammo}"
-        ammo_surface = font.render(f"{ammo_text}", True, (255, 255, 255))
-        self.config.screen.blit(ammo_surface, (icon_x + icon_size + 5, icon_y + 20))
+        ammo_text = "∞" if ammo < 0 else f"{ammo}"
+        ammo_surface = render_text(font, f"{ammo_text}", (255, 255, 255))
+        bg.blit(ammo_surface, (icon_x + icon_size + 5, icon_y + 20))
         
         # 快捷键提示 - 在底部，更短
-        keys_text = small_font.render("Q/E切换", True, (180, 180, 180))
-        self.config.screen.blit(keys_text, (self.bullet_ui_pos[0] + bg_width//2 - keys_text.get_width()//2, 
-                                            self.bullet_ui_pos[1] + bg_height - 12))
+        keys_text = render_text(small_font, "Q/E切换", (180, 180, 180))
+        bg.blit(keys_text, (bg_width//2 - keys_text.get_width()//2, bg_height - 12))
+        return bg
 
     def update_explosions(self):
         """更新爆炸特效"""
@@ -355,29 +498,30 @@ class Player(Entity):
             
             # 减少持续时间
             explosion['duration'] -= 1
-            
-            # 绘制粒子
-            if explosion['duration'] > 0:
-                pygame.draw.circle(
-                    self.config.screen,
-                    explosion['color'],
-                    (int(explosion['x']), int(explosion['y'])),
-                    int(explosion['size'] * (explosion['duration'] / 20))
-                )
-            else:
+            if explosion['duration'] <= 0:
                 explosions_to_remove.append(explosion)
         
         # 移除已完成的爆炸
         for explosion in explosions_to_remove:
             if explosion in self.explosions:
                 self.explosions.remove(explosion)
+    
+    def draw_explosions(self):
+        """绘制爆炸粒子（预先画好的圆形精灵，所有粒子一次提交绘制）"""
+        with self.config.batch_layer():
+            for explosion in self.explosions:
+                radius = int(explosion['size'] * (explosion['duration'] / 20))
+                if radius > 0:
+                    self.config.blit(get_particle_sprite(explosion['color'], radius),
+                                     (int(explosion['x']) - radius, int(explosion['y']) - radius))
 
     def tick_shm(self) -> None:
         """有规律地上下移动玩家，用于显示欢迎界面"""
         self.loopIter = (self.loopIter + 1) % 28
         if self.loopIter == 0:
             self.playerIndex = next(self.img_gen)
-            self.image = self.config.images.player[self.playerIndex]
+            self.frame_index = self.playerIndex
+            self.image, self.hit_mask = self.atlas.get(self.frame_index, self.size_modifier)
 
         if self.loopIter % 14 == 0:
             self.vel_y = -self.vel_y
@@ -398,7 +542,8 @@ class Player(Entity):
     def rotate(self) -> None:
         self.rot = clamp(self.rot + self.vel_rot, self.rot_min, self.rot_max)
 
-    def draw(self) -> None:
+    def update(self, delta_time: float) -> None:
+        super().update(delta_time)  # 记录移动前的位置
         self.update_image()
         if self.mode == PlayerMode.SHM:
             self.tick_shm()
@@ -407,13 +552,14 @@ class Player(Entity):
         elif self.mode == PlayerMode.REVERSE:
             self.tick_reverse()
         elif self.mode == PlayerMode.BOSS:
-            self.tick_boss()
+            self.tick_boss(delta_time)
         elif self.mode == PlayerMode.CRASH:
             self.tick_crash()
         
-        self.draw_player()
+        self.update_rotation()
 
-    def draw_player(self) -> None:
+    def update_rotation(self) -> None:
+        """按当前角度取出旋转后的图像，碰撞形状与绘制出的图像一致"""
         # Rotate bird for normal mode bird and crashed bird (in air)
         if (
             self.mode == PlayerMode.NORMAL
@@ -422,69 +568,53 @@ class Player(Entity):
             or (self.mode == PlayerMode.CRASH and self.y < self.max_y - 30)
         ):
             rotation = self.rot if self.mode != PlayerMode.REVERSE else -self.rot
-            # pygame.transform.rotate rotates clockwise (opposite of what we want)
-            img = pygame.transform.rotate(self.image, rotation)
+            # 从图集中查找旋转后的图像和对应的碰撞掩码
+            img, mask = self.atlas.get(self.frame_index, self.size_modifier, rotation)
             rotated_rect = img.get_rect(center=(self.x + self.w // 2, self.y + self.h // 2))
+            self.rotated_frame = (img, rotated_rect, mask)
+        # For crashed bird on ground or message bird
+        else:
+            self.rotated_frame = None
+
+    def draw(self) -> None:
+        if self.mode == PlayerMode.BOSS:
+            self.draw_bullets()  # 绘制子弹
+            self.draw_explosions()  # 绘制爆炸特效
+            self.draw_weapon_ui()  # 绘制武器UI
+        
+        self.draw_player()
+
+    def draw_player(self) -> None:
+        if self.rotated_frame:
+            img = self.rotated_frame[0]
+            # 碰撞按当前位置，绘制按插值后的位置
+            render_x, render_y = self.render_position()
+            draw_rect = img.get_rect(center=(render_x + self.w // 2, render_y + self.h // 2))
             
             # 如果处于无敌状态，添加视觉特效
             if self.invincible:
-                # 创建闪光效果
-                shine_tick = pygame.time.get_ticks() / 100  # 使闪光效果随时间变化
-                shine_alpha = int(128 + 127 * math.sin(shine_tick))  # 在128-255之间变化
-                
-                # 创建一个稍大的金色光环
+                # 光环比旋转后的玩家图像稍大，按模拟时间的相位取出预先绘制的动画帧
                 glow_size = max(img.get_width(), img.get_height()) + 12
-                glow_surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-                
-                # 绘制金色光环
-                for i in range(3):
-                    glow_radius = glow_size // 2 - i * 2
-                    # 金色的RGB值，透明度随时间变化
-                    gold_color = (255, 215, 0, max(40, shine_alpha - i * 30))
-                    pygame.draw.circle(
-                        glow_surface,
-                        gold_color,
-                        (glow_size // 2, glow_size // 2),
-                        glow_radius
-                    )
-                
-                # 在玩家周围绘制金色保护罩
-                shield_surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-                shield_alpha = min(180, shine_alpha)
-                pygame.draw.circle(
-                    shield_surface,
-                    (255, 215, 0, shield_alpha // 3),  # 金色半透明
-                    (glow_size // 2, glow_size // 2),
-                    glow_size // 2 - 2,
-                    3  # 边框宽度
-                )
-                
-                # 闪烁星星效果
-                star_tick = pygame.time.get_ticks() / 200
-                for i in range(4):
-                    star_angle = star_tick + i * (math.pi / 2)
-                    star_dist = glow_size // 3
-                    star_x = glow_size//2 + star_dist * math.cos(star_angle)
-                    star_y = glow_size//2 + star_dist * math.sin(star_angle)
-                    star_size = 2 + math.sin(star_tick * 2 + i) * 1.5
-                    
-                    # 绘制星星
-                    pygame.draw.circle(
-                        shield_surface,
-                        (255, 255, 255, shield_alpha),
-                        (int(star_x), int(star_y)),
-                        star_size
-                    )
+                glow_surface, shield_surface = invincibility_aura.get(glow_size, self.config.timestep.time)
                 
                 # 将光环和护盾绘制到屏幕上，确保玩家图像居中
-                glow_rect = glow_surface.get_rect(center=rotated_rect.center)
-                self.config.screen.blit(glow_surface, glow_rect)
-                self.config.screen.blit(shield_surface, glow_rect)
+                glow_rect = glow_surface.get_rect(center=draw_rect.center)
+                self.config.blit(glow_surface, glow_rect)
+                self.config.blit(shield_surface, glow_rect)
             
-            self.config.screen.blit(img, rotated_rect)
-        # For crashed bird on ground or message bird
+            self.config.blit(img, draw_rect)
         else:
-            self.config.screen.blit(self.image, (self.x, self.y))
+            self.config.blit(self.image, self.render_position())
+    
+    @property
+    def collision_rect(self) -> pygame.Rect:
+        """碰撞矩形与绘制出的旋转图像一致"""
+        return self.rotated_frame[1] if self.rotated_frame else self.rect
+    
+    @property
+    def collision_mask(self):
+        """碰撞掩码与绘制出的旋转图像一致"""
+        return self.rotated_frame[2] if self.rotated_frame else self.hit_mask
     
     def switch_weapon(self, direction: int) -> None:
         """切换武器 (1: 下一个, -1: 上一个)"""
@@ -535,8 +665,8 @@ class Player(Entity):
     def crossed(self, pipe: Pipe) -> bool:
         return pipe.x < self.x < pipe.x + pipe.w
 
-    def collided(self, pipes: Pipes, floor: Floor) -> bool:
-        """检查是否与管道或地板发生碰撞"""
+    def collided(self, pipes: Pipes, floor: Floor, grid: Optional[SpatialGrid] = None) -> bool:
+        """检查是否与管道或地板发生碰撞（提供网格时只检测同格子的管道）"""
         # 如果处于无敌状态，直接返回False（不会碰撞）
         if hasattr(self, 'invincible') and self.invincible:
             return False
@@ -548,17 +678,19 @@ class Player(Entity):
             self.crash_entity = "floor"
             return True
 
-        for pipe in pipes.upper + pipes.lower:
-            if self.collide(pipe):
-                self.crash_entity = "pipe"
-                return True
+        candidates = grid.query("pipe", self.collision_rect) if grid else pipes.upper + pipes.lower
+        if self.collide_many(candidates):
+            self.crash_entity = "pipe"
+            return True
 
         return False
         
-    def check_boss_bullet_collision(self, boss) -> bool:
-        """检查玩家是否被Boss子弹击中"""
-        for bullet in boss.bullets:
-            if self.collide(bullet):
+    def check_boss_bullet_collision(self, boss, grid: Optional[SpatialGrid] = None) -> bool:
+        """检查玩家是否被Boss子弹击中（提供网格时只检测同格子的子弹）"""
+        candidates = grid.query("boss_bullet", self.collision_rect) if grid else list(boss.bullets)
+        for index in self.collide_many(candidates):
+            bullet = candidates[index]
+            if bullet in boss.bullets:
                 # 只有非无敌状态下才会受到伤害
                 if not self.invincible:
                     # 创建爆炸效果
@@ -583,12 +715,14 @@ class Player(Entity):
         
         return False
     
-    def check_bullet_hit_boss(self, boss) -> bool:
-        """检查玩家的子弹是否击中Boss"""
+    def check_bullet_hit_boss(self, boss, grid: Optional[SpatialGrid] = None) -> bool:
+        """检查玩家的子弹是否击中Boss（提供网格时只检测同格子的子弹）"""
         hit = False
-        for bullet in list(self.bullets):
-            # 判断玩家子弹与Boss的碰撞
-            if bullet.collide(boss):
+        candidates = grid.query("player_bullet", boss.collision_rect) if grid else list(self.bullets)
+        # 判断玩家子弹与Boss的碰撞（批量检测）
+        for index in boss.collide_many(candidates):
+            bullet = candidates[index]
+            if bullet in self.bullets:
                 # 应用伤害
                 boss.take_damage(bullet.damage)
                 # 移除子弹
@@ -606,9 +740,9 @@ class Player(Entity):
         duration = 20
         
         for i in range(particles):
-            angle = random.random() * math.pi * 2
-            vel_x = math.cos(angle) * speed * random.random()
-            vel_y = math.sin(angle) * speed * random.random()
+            angle = self.effect_rng.random() * math.pi * 2
+            vel_x = math.cos(angle) * speed * self.effect_rng.random()
+            vel_y = math.sin(angle) * speed * self.effect_rng.random()
             
             self.explosions.append({
                 'x': x,
@@ -1,11 +1,10 @@
-import random
 from enum import Enum
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import math
 
 import pygame
 
-from ..utils import GameConfig
+from ..utils import GameConfig, build_hit_mask, create_surface
 from .entity import Entity
 
 
@@ -17,47 +16,116 @@ class PowerUpType(Enum):
     SMALL_SIZE = "SMALL_SIZE"    # 缩小玩家
 
 
+# 根据道具类型选择主要和次要颜色
+POWERUP_COLORS = {
+    PowerUpType.SPEED_BOOST: [(255, 165, 0), (255, 140, 0)],   # 橙色系
+    PowerUpType.INVINCIBLE: [(255, 215, 0), (255, 240, 60)],   # 金色系
+    PowerUpType.SLOW_MOTION: [(0, 191, 255), (30, 144, 255)],  # 蓝色系
+    PowerUpType.SMALL_SIZE: [(147, 112, 219), (138, 43, 226)], # 紫色系
+}
+
+# 根据道具类型设置持续时间(毫秒)
+POWERUP_DURATIONS = {
+    PowerUpType.SPEED_BOOST: 8000,    # 8秒
+    PowerUpType.INVINCIBLE: 10000,    # 10秒
+    PowerUpType.SLOW_MOTION: 8000,    # 8秒
+    PowerUpType.SMALL_SIZE: 8000,     # 8秒
+}
+
+# 旋转效果 - 根据道具类型决定是否旋转以及旋转速度（度/帧）
+POWERUP_ROTATION_SPEEDS = {
+    PowerUpType.SPEED_BOOST: 0.5,
+    PowerUpType.INVINCIBLE: 0.2,
+    PowerUpType.SLOW_MOTION: 0.3,
+    PowerUpType.SMALL_SIZE: 0.4
+}
+
+
+class PowerUpFrames:
+    """
+    道具动画帧图集：按(脉动缩放后的尺寸, 旋转角度)缓存变换好的图像，同类道具共享
+    旋转角度按rotation_step量化；帧在第一次用到时生成，之后只需查表
+    """
+
+    def __init__(self, image: pygame.Surface, rotation_step: int = 2) -> None:
+        """
+        :param image: 道具的原始图像
+        :param rotation_step: 旋转角度的量化步长（度）
+        """
+        self.image = image  # 原始图像
+        self.mask = build_hit_mask(image)  # 原始图像的碰撞掩码
+        self.rotation_step = rotation_step  # 旋转角度步长
+        self.scaled: Dict[int, pygame.Surface] = {}  # 尺寸 -> 缩放后的图像
+        self.frames: Dict[Tuple[int, int], pygame.Surface] = {}  # (尺寸, 角度) -> 动画帧
+
+    def get(self, size: int, angle: float) -> pygame.Surface:
+        """
+        获取指定尺寸和角度的动画帧
+        """
+        angle = int(round(angle / self.rotation_step)) * self.rotation_step % 360
+        key = (size, angle)
+        frame = self.frames.get(key)
+        if frame is None:
+            scaled = self.scaled.get(size)
+            if scaled is None:
+                scaled = pygame.transform.scale(self.image, (size, size))
+                self.scaled[size] = scaled
+            frame = pygame.transform.rotate(scaled, angle) if angle else scaled
+            self.frames[key] = frame
+        return frame
+
+
+powerup_frames: Dict[PowerUpType, PowerUpFrames] = {}  # 每种道具的动画帧图集
+
+
 class PowerUp(Entity):
     """道具实体类"""
     def __init__(self, config: GameConfig, power_type: PowerUpType, x: int, y: int) -> None:
         self.config = config
         self.power_type = power_type
         
-        # 根据道具类型选择主要和次要颜色
-        color_map = {
-            PowerUpType.SPEED_BOOST: [(255, 165, 0), (255, 140, 0)],   # 橙色系
-            PowerUpType.INVINCIBLE: [(255, 215, 0), (255, 240, 60)],   # 金色系
-            PowerUpType.SLOW_MOTION: [(0, 191, 255), (30, 144, 255)],  # 蓝色系
-            PowerUpType.SMALL_SIZE: [(147, 112, 219), (138, 43, 226)], # 紫色系
-        }
-        
         # 设置道具基本属性
-        self.primary_color = color_map[power_type][0]
-        self.secondary_color = color_map[power_type][1]
-        
-        # 根据道具类型设置持续时间
-        duration_map = {
-            PowerUpType.SPEED_BOOST: 8000,    # 8秒
-            PowerUpType.INVINCIBLE: 10000,    # 10秒
-            PowerUpType.SLOW_MOTION: 8000,    # 8秒
-            PowerUpType.SMALL_SIZE: 8000,     # 8秒
-        }
-        self.duration = duration_map[power_type]  # 道具持续时间(毫秒)
+        self.primary_color = POWERUP_COLORS[power_type][0]
+        self.secondary_color = POWERUP_COLORS[power_type][1]
+        self.duration = POWERUP_DURATIONS[power_type]  # 道具持续时间(毫秒)
         
         self.vel_x = -4  # 水平移动速度
         
+        # 同类道具共享图像和动画帧，只在第一次创建时绘制
+        frames = powerup_frames.get(power_type)
+        if frames is None:
+            frames = PowerUpFrames(self.create_image(power_type))
+            powerup_frames[power_type] = frames
+        self.frames = frames
+        
+        super().__init__(config, frames.image, x, y, hit_mask=frames.mask)
+        
+        # 动画参数
+        self.animation_tick = 0
+        self.rotation_angle = 0  # 旋转角度
+        self.pulse_scale = 1.0
+        self.pulse_direction = 0.01
+        self.original_image = frames.image  # 原始图像，动画帧由图集生成
+        self.shine_angle = 0  # 闪光效果角度
+        
+        # 保存中心坐标
+        self.center_x = self.x + self.w / 2
+        self.center_y = self.y + self.h / 2
+    
+    def create_image(self, power_type):
+        """绘制道具图像（图标加外部光环）"""
         # 创建更精美的道具图像
         size = 32  # 略微增大尺寸
         
         # 创建主表面
-        main_surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        main_surface = create_surface((size, size))
         
         # 绘制道具图标
         self.draw_powerup_icon(main_surface, power_type, size)
         
         # 添加外部光环效果
         glow_size = size + 12
-        glow_surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
+        glow_surface = create_surface((glow_size, glow_size))
         
         # 绘制多层次的辉光效果
         for radius in range(glow_size//2, glow_size//2-4, -1):
@@ -70,23 +138,10 @@ class PowerUp(Entity):
             )
         
         # 合并图层
-        final_surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
+        final_surface = create_surface((glow_size, glow_size))
         final_surface.blit(glow_surface, (0, 0))
         final_surface.blit(main_surface, ((glow_size - size) // 2, (glow_size - size) // 2))
-        
-        super().__init__(config, final_surface, x, y)
-        
-        # 动画参数
-        self.animation_tick = 0
-        self.rotation_angle = 0  # 旋转角度
-        self.pulse_scale = 1.0
-        self.pulse_direction = 0.01
-        self.original_image = self.image.copy()  # 保存原始图像用于动画
-        self.shine_angle = 0  # 闪光效果角度
-        
-        # 保存中心坐标
-        self.center_x = self.x + self.w / 2
-        self.center_y = self.y + self.h / 2
+        return final_surface
     
     def draw_powerup_icon(self, surface, power_type, size):
         """根据不同道具类型绘制不同图标"""
@@ -212,25 +267,24 @@ class PowerUp(Entity):
             # 中心小圆
             pygame.draw.circle(surface, arrow_color, (center, center), 3)
     
-    def draw(self) -> None:
+    def update(self, delta_time: float) -> None:
+        super().update(delta_time)  # 记录移动前的位置
+        self.move()
+    
+    def move(self) -> None:
+        """移动道具并推进一帧动画"""
         self.x += self.vel_x  # 更新位置
         # 更新中心坐标
         self.center_x = self.x + self.w / 2
         self.center_y = self.y + self.h / 2
         self.animate()  # 更新动画
-        super().draw()  # 调用父类绘制方法
     
     def animate(self) -> None:
         """使道具产生更丰富的动画效果"""
         self.animation_tick += 1
         
         # 旋转效果 - 根据道具类型决定是否旋转以及旋转速度
-        rotation_speed = {
-            PowerUpType.SPEED_BOOST: 0.5,
-            PowerUpType.INVINCIBLE: 0.2,
-            PowerUpType.SLOW_MOTION: 0.3,
-            PowerUpType.SMALL_SIZE: 0.4
-        }.get(self.power_type, 0)
+        rotation_speed = POWERUP_ROTATION_SPEEDS.get(self.power_type, 0)
         
         self.rotation_angle = (self.rotation_angle + rotation_speed) % 360
         
@@ -246,20 +300,11 @@ class PowerUp(Entity):
             elif self.pulse_scale < 0.92:
                 self.pulse_direction = 0.01
         
-        # 应用所有动画效果创建新图像
+        # 从图集中取出缩放并旋转后的动画帧
         scaled_size = int(self.original_image.get_width() * self.pulse_scale)
+        self.image = self.frames.get(scaled_size, self.rotation_angle if rotation_speed > 0 else 0)
         
-        # 先缩放原始图像
-        scaled_image = pygame.transform.scale(self.original_image, (scaled_size, scaled_size))
-        
-        # 然后旋转图像
-        if rotation_speed > 0:
-            rotated_image = pygame.transform.rotate(scaled_image, self.rotation_angle)
-        else:
-            rotated_image = scaled_image
-        
-        # 更新图像和尺寸
-        self.image = rotated_image
+        # 更新尺寸
         self.w = self.image.get_width()
         self.h = self.image.get_height()
         
@@ -277,31 +322,32 @@ class PowerUpManager:
         self.spawn_interval = 1500  # 从3000ms减少到1500ms，每1.5秒生成一次道具的机会
         self.spawn_chance = 0.9     # 从0.6增加到0.9，90%概率生成道具
         self.active_effects = {}    # 当前激活的效果 {PowerUpType: end_time}
+        self.rng = config.rng.gameplay("powerups")  # 道具生成的随机数流
     
-    def tick(self, delta_time: int) -> None:
+    def update(self, delta_time: float) -> None:
         """更新所有道具状态"""
         # 更新生成计时器
         self.spawn_timer += delta_time
         if self.spawn_timer >= self.spawn_interval:
             self.spawn_timer = 0
-            if random.random() < self.spawn_chance:
+            if self.rng.random() < self.spawn_chance:
                 # 有概率同时生成多个道具
                 num_powerups = 1
-                if random.random() < 0.4:  # 40%的概率生成多个道具
-                    num_powerups = random.randint(2, 3)  # 生成2-3个道具
+                if self.rng.random() < 0.4:  # 40%的概率生成多个道具
+                    num_powerups = self.rng.randint(2, 3)  # 生成2-3个道具
                 
                 for _ in range(num_powerups):
                     self.spawn_powerup()
         
         # 更新和移除道具
         for powerup in list(self.powerups):
-            powerup.tick()
+            powerup.update(delta_time)
             # 移除超出屏幕的道具
             if powerup.x < -powerup.w:
                 self.powerups.remove(powerup)
         
-        # 更新激活效果的剩余时间
-        current_time = pygame.time.get_ticks()
+        # 更新激活效果的剩余时间（按模拟时间计时）
+        current_time = self.config.timestep.time
         expired_effects = []
         
         for effect_type, end_time in self.active_effects.items():
@@ -312,17 +358,23 @@ class PowerUpManager:
         for effect in expired_effects:
             self.active_effects.pop(effect)
     
+    def draw(self) -> None:
+        """绘制所有道具（一次提交绘制）"""
+        with self.config.batch_layer():
+            for powerup in self.powerups:
+                powerup.draw()
+    
     def spawn_powerup(self) -> None:
         """生成一个随机道具"""
         # 从枚举中随机选择一个道具类型
-        power_type = random.choice(list(PowerUpType))
+        power_type = self.rng.choice(list(PowerUpType))
         
         # 在合适的位置生成道具
         x = self.config.window.width + 10
         # 在屏幕中央区域随机生成
         min_y = int(self.config.window.height * 0.2)
         max_y = int(self.config.window.height * 0.7)
-        y = random.randint(min_y, max_y)
+        y = self.rng.randint(min_y, max_y)
         
         # 创建道具并添加到列表
         powerup = PowerUp(self.config, power_type, x, y)
@@ -330,10 +382,8 @@ class PowerUpManager:
     
     def activate_effect(self, power_type: PowerUpType) -> None:
         """激活道具效果"""
-        current_time = pygame.time.get_ticks()
-        # 使用临时道具对象获取持续时间，避免创建完整的道具实例
-        temp_powerup = PowerUp(self.config, power_type, 0, 0)
-        end_time = current_time + temp_powerup.duration
+        current_time = self.config.timestep.time
+        end_time = current_time + POWERUP_DURATIONS[power_type]
         self.active_effects[power_type] = end_time
         
         # 为不同道具播放不同音效
@@ -342,37 +392,37 @@ class PowerUpManager:
             self.config.sounds.point.set_volume(0.8)
             self.config.sounds.point.play()
             # 连续播放两次来表示加速感
-            pygame.time.delay(100)
+            self.config.delay(100)
             self.config.sounds.point.play()
             # 恢复音量
-            pygame.time.delay(50)
+            self.config.delay(50)
             self.config.sounds.point.set_volume(1.0)
         elif power_type == PowerUpType.INVINCIBLE:
             # 无敌音效 - 使用wing音效，但通过设置频率来获得更金属的感觉
             self.config.sounds.wing.set_volume(1.2)  # 音量稍微提高
             self.config.sounds.wing.play()
             # 延迟一点后播放point音效增强无敌获得的感觉
-            pygame.time.delay(150)
+            self.config.delay(150)
             self.config.sounds.point.play()
             # 恢复音量
-            pygame.time.delay(50)
+            self.config.delay(50)
             self.config.sounds.wing.set_volume(1.0)
         elif power_type == PowerUpType.SLOW_MOTION:
             # 慢动作音效 - 使用swoosh音效，较低的音调
             self.config.sounds.swoosh.set_volume(0.7)
             self.config.sounds.swoosh.play()
             # 恢复音量
-            pygame.time.delay(100)
+            self.config.delay(100)
             self.config.sounds.swoosh.set_volume(1.0)
         elif power_type == PowerUpType.SMALL_SIZE:
             # 缩小音效 - 使用point和swoosh的组合
             self.config.sounds.swoosh.set_volume(0.6)
             self.config.sounds.swoosh.play()
-            pygame.time.delay(50)
+            self.config.delay(50)
             self.config.sounds.point.set_volume(0.6)
             self.config.sounds.point.play()
             # 恢复音量
-            pygame.time.delay(50)
+            self.config.delay(50)
             self.config.sounds.swoosh.set_volume(1.0)
             self.config.sounds.point.set_volume(1.0)
     
@@ -385,6 +435,6 @@ class PowerUpManager:
         if not self.has_effect(power_type):
             return None
         
-        current_time = pygame.time.get_ticks()
+        current_time = self.config.timestep.time
         end_time = self.active_effects[power_type]
-        return max(0, end_time - current_time)
+        return max(0, int(end_time - current_time))
@@ -50,5 +50,5 @@ class Score(Entity):
         x_offset = (self.config.window.width - digits_width) / 2  # 计算x轴偏移量
 
         for image in images:
-            self.config.screen.blit(image, (x_offset, self.y))  # 绘制数字
+            self.config.blit(image, (x_offset, self.y))  # 绘制数字
             x_offset += image.get_width()  # 更新x轴偏移量
@@ -3,8 +3,8 @@ import pygame
 import math
 from typing import List, Optional
 
-from ..utils import GameConfig
-from .bullet import Bullet
+from ..utils import GameConfig, create_surface
+from .bullet import Bullet, build_round_bullet, get_projectile_sprite, register_projectile
 from .boss import Boss
 
 class WeaponType(Enum):
@@ -14,6 +14,59 @@ class WeaponType(Enum):
     LASER = "激光"        # 持续性激光
     HOMING = "追踪导弹"      # 追踪敌人的子弹
 
+def build_laser_bullet(color, laser_width) -> pygame.Surface:
+    """绘制激光子弹 - 细长的矩形加发光效果"""
+    width = 20
+    height = laser_width
+    laser_surface = create_surface((width, height))
+    pygame.draw.rect(laser_surface, color, (0, 0, width, height))
+    
+    # 添加发光效果
+    glow_surface = create_surface((width+4, height+4))
+    glow_color = (*color, 100)  # 半透明的颜色
+    pygame.draw.rect(glow_surface, glow_color, (0, 0, width+4, height+4))
+    
+    # 合并图层
+    final_surface = create_surface((width+4, height+4))
+    final_surface.blit(glow_surface, (0, 0))
+    final_surface.blit(laser_surface, (2, 2))  # 居中放置
+    return final_surface
+
+
+def build_homing_bullet(color) -> pygame.Surface:
+    """绘制追踪子弹 - 小火箭形状"""
+    size = 12
+    rocket_surface = create_surface((size, size))
+    
+    # 绘制火箭头部
+    pygame.draw.circle(rocket_surface, color, (size-3, size//2), 4)
+    
+    # 绘制火箭主体
+    pygame.draw.rect(rocket_surface, color, (2, size//2-2, size-5, 4))
+    
+    # 绘制小尾翼
+    pygame.draw.polygon(rocket_surface, color, [
+        (0, size//2-3), (4, size//2), (0, size//2+3)
+    ])
+    
+    # 添加发光效果
+    glow_surface = create_surface((size+6, size+6))
+    pygame.draw.circle(glow_surface, (*color, 100), (size+3, size//2+3), 6)
+    
+    # 合并图层
+    final_surface = create_surface((size+6, size+6))
+    final_surface.blit(glow_surface, (0, 0))
+    final_surface.blit(rocket_surface, (3, 3))
+    return final_surface
+
+
+# 注册各武器的子弹外观
+register_projectile("weapon_normal", lambda color: build_round_bullet(8, color))
+register_projectile("weapon_triple", lambda color: build_round_bullet(6, color))  # 略小的子弹
+register_projectile("weapon_laser", build_laser_bullet)
+register_projectile("weapon_homing", build_homing_bullet)
+
+
 class Weapon:
     def __init__(self, config: GameConfig, weapon_type: WeaponType = WeaponType.NORMAL):
         self.config = config
@@ -100,16 +153,10 @@ class Weapon:
         
     def create_normal_bullet(self, x: int, y: int) -> Bullet:
         """创建普通子弹"""
-        bullet = Bullet(self.config, x, y)
+        bullet = Bullet(self.config, x, y, get_projectile_sprite("weapon_normal", self.color))
         bullet.damage = self.damage
         bullet.vel_x = 10  # 向右飞行
         
-        # 自定义外观
-        size = 8
-        bullet_surface = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(bullet_surface, self.color, (size//2, size//2), size//2)
-        bullet.image = bullet_surface
-        
         return bullet
         
     def create_triple_bullets(self, x: int, y: int) -> List[Bullet]:
@@ -117,8 +164,10 @@ class Weapon:
         bullets = []
         angles = [-15, 0, 15]  # 发射角度
         
+        sprite = get_projectile_sprite("weapon_triple", self.color)
+        
         for angle in angles:
-            bullet = Bullet(self.config, x, y)
+            bullet = Bullet(self.config, x, y, sprite)
             bullet.damage = self.damage
             
             # 计算速度分量
@@ -126,12 +175,6 @@ class Weapon:
             bullet.vel_x = 10 * math.cos(angle_rad)
             bullet.vel_y = 10 * math.sin(angle_rad)
             
-            # 自定义外观
-            size = 6  # 略小的子弹
-            bullet_surface = pygame.Surface((size, size), pygame.SRCALPHA)
-            pygame.draw.circle(bullet_surface, self.color, (size//2, size//2), size//2)
-            bullet.image = bullet_surface
-            
             bullets.append(bullet)
             
         return bullets
@@ -139,36 +182,18 @@ class Weapon:
     def create_laser_bullet(self, x: int, y: int) -> Bullet:
         """创建激光子弹"""
         # 创建一个特殊的激光子弹
-        bullet = Bullet(self.config, x, y)
+        sprite = get_projectile_sprite("weapon_laser", self.color, self.laser_width)
+        bullet = Bullet(self.config, x, y, sprite)
         bullet.damage = self.damage
         bullet.vel_x = 20  # 非常快的速度
         bullet.is_laser = True
-        
-        # 自定义外观 - 细长的矩形
-        width = 20
-        height = self.laser_width
-        laser_surface = pygame.Surface((width, height), pygame.SRCALPHA)
-        pygame.draw.rect(laser_surface, self.color, (0, 0, width, height))
-        
-        # 添加发光效果
-        glow_surface = pygame.Surface((width+4, height+4), pygame.SRCALPHA)
-        glow_color = (*self.color, 100)  # 半透明的颜色
-        pygame.draw.rect(glow_surface, glow_color, (0, 0, width+4, height+4))
-        
-        # 合并图层
-        final_surface = pygame.Surface((width+4, height+4), pygame.SRCALPHA)
-        final_surface.blit(glow_surface, (0, 0))
-        final_surface.blit(laser_surface, (2, 2))  # 居中放置
-        
-        bullet.image = final_surface
-        bullet.trail_length = 3  # 激光拖尾效果
-        bullet.trail_frames = []  # 存储拖尾帧
+        bullet.enable_trail(3)  # 激光拖尾效果
         
         return bullet
         
     def create_homing_bullet(self, x: int, y: int, target: Optional[Boss]) -> Bullet:
         """创建追踪子弹"""
-        bullet = Bullet(self.config, x, y)
+        bullet = Bullet(self.config, x, y, get_projectile_sprite("weapon_homing", self.color))
         bullet.damage = self.damage
         bullet.vel_x = 5  # 初始速度
         bullet.vel_y = 0
@@ -176,32 +201,6 @@ class Weapon:
         bullet.turn_rate = self.turn_rate
         bullet.target = target  # 存储目标引用
         bullet.is_homing = True
-        
-        # 自定义外观 - 小火箭形状
-        size = 12
-        rocket_surface = pygame.Surface((size, size), pygame.SRCALPHA)
-        
-        # 绘制火箭头部
-        pygame.draw.circle(rocket_surface, self.color, (size-3, size//2), 4)
-        
-        # 绘制火箭主体
-        pygame.draw.rect(rocket_surface, self.color, (2, size//2-2, size-5, 4))
-        
-        # 绘制小尾翼
-        pygame.draw.polygon(rocket_surface, self.color, [
-            (0, size//2-3), (4, size//2), (0, size//2+3)
-        ])
-        
-        # 添加发光效果
-        glow_surface = pygame.Surface((size+6, size+6), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, (*self.color, 100), (size+3, size//2+3), 6)
-        
-        # 合并图层
-        final_surface = pygame.Surface((size+6, size+6), pygame.SRCALPHA)
-        final_surface.blit(glow_surface, (0, 0))
-        final_surface.blit(rocket_surface, (3, 3))
-        
-        bullet.image = final_surface
         bullet.update_homing = self.update_homing_bullet  # 添加特殊的更新方法
         
         return bullet
@@ -239,6 +238,6 @@ class Weapon:
         bullet.x += bullet.vel_x
         bullet.y += bullet.vel_y
         
-        # 旋转子弹精灵以面向移动方向
+        # 旋转子弹精灵以面向移动方向（旋转后的精灵会被缓存）
         angle_degrees = math.degrees(current_angle)
-        bullet.image = pygame.transform.rotate(bullet.original_image, -angle_degrees) 
\ No newline at end of file
+        bullet.set_sprite(bullet.base_sprite.rotated(-angle_degrees)) 
\ No newline at end of file
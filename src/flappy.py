@@ -1,14 +1,18 @@
 import asyncio
+import os
+import random
 import sys
-import math
+import time
+from typing import Iterable, Iterator, Optional
 
 import pygame
-from pygame.locals import K_ESCAPE, K_SPACE, K_UP, KEYDOWN, QUIT, K_q, K_e, K_1, K_2, K_3, K_4, K_5, K_6, K_7, K_8
+from pygame.locals import K_ESCAPE, K_SPACE, K_UP, KEYDOWN, QUIT, K_q, K_e, K_1, K_2, K_3, K_4, K_5, K_6, K_7, K_8, K_F3
 
 from .entities import (
     Background,
     Floor,
     GameOver,
+    ModeMenu,
     Pipes,
     Player,
     PlayerMode,
@@ -20,10 +24,39 @@ from .entities.boss import Boss, BossType
 from .entities.bullet import Bullet
 from .entities.weapon import WeaponType
 from .entities.coin import CoinManager
-from .utils import GameConfig, Images, Sounds, Window, get_font
+from .utils import (
+    INPUT_FLAP,
+    INPUT_SHOOT,
+    INPUT_TEST_1,
+    INPUT_WEAPON_1,
+    INPUT_WEAPON_NEXT,
+    INPUT_WEAPON_PREV,
+    InputLog,
+)
+from .utils import Display, FixedTimestep, GameConfig, HudWidget, Images, RandomStreams, Sounds, SpatialGrid, Window, create_surface, font_registry, get_font, parse_size, render_text, text_panel
 from enum import Enum
 
 
+# 游戏中用到的字体，启动时统一查找和创建
+FONT_SPECS = (
+    ('SimHei', 9), ('SimHei', 10), ('SimHei', 12), ('SimHei', 14), ('SimHei', 16),
+    ('SimHei', 18), ('SimHei', 24), ('SimHei', 36),
+    ('Arial', 10), ('Arial', 12), ('Arial', 14), ('Arial', 18), ('Arial', 36),
+    ('Arial', 12, True), ('Arial', 16, True),
+)
+
+BOSS_TRANSITION_FRAMES = 60  # Boss转场动画的帧数（约2秒）
+
+WEAPON_KEYS = (K_1, K_2, K_3, K_4)  # 直接选择武器的按键
+TEST_POWERUP_KEYS = (K_5, K_6, K_7, K_8)  # 生成测试道具的按键
+TEST_POWERUP_TYPES = (
+    PowerUpType.SPEED_BOOST,
+    PowerUpType.INVINCIBLE,
+    PowerUpType.SLOW_MOTION,
+    PowerUpType.SMALL_SIZE,
+)  # 测试按键依次生成的道具
+
+
 class GameMode(Enum):
     """游戏模式枚举"""
     CLASSIC = "经典模式"    # 经典无限模式
@@ -33,24 +66,52 @@ class GameMode(Enum):
     COIN = "金币收集"     # 金币收集模式
 
 
+class StepResult(Enum):
+    """一步模拟之后的游戏状态"""
+    RUNNING = 0     # 继续游戏
+    NEXT_BOSS = 1   # 播放了Boss转场动画，重新开始计时
+    DIED = 2        # 玩家死亡，立即结束
+    ENDED = 3       # 显示完本帧后结束
+
+
 class Flappy:
-    def __init__(self):
+    def __init__(self, headless: bool = False, seed: Optional[int] = None, record_dir: Optional[str] = None):
         """
         初始化Flappy Bird游戏
+        :param headless: 无界面模式：使用SDL的dummy视频和音频驱动，不绘制、不刷新显示、
+                         不限制帧率，通过new_game和step在Python中直接推进游戏
+        :param seed: 随机数的根种子，相同种子和输入的游戏进程相同；None表示随机选择
+        :param record_dir: 保存每局输入回放的目录，None表示不保存
         """
+        if headless:
+            # 必须在pygame.init之前设置
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        self.headless = headless
         pygame.init()  # 初始化pygame
         pygame.display.set_caption("Flappy Bird")  # 设置窗口标题
-        window = Window(350, 600)  # 扩大窗口尺寸
-        screen = pygame.display.set_mode((window.width, window.height))  # 设置屏幕大小
-        images = Images()  # 加载图像资源
+        window = Window(350, 600)  # 游戏的逻辑分辨率
+        # 画面按逻辑分辨率绘制，窗口大小和缩放方式可通过环境变量DISPLAY_SIZE、SCALE_MODE配置
+        # 无界面模式不缩放（仍需设置显示模式，图像要转换为显示格式）
+        display = Display(
+            window,
+            None if headless else parse_size(os.environ.get("DISPLAY_SIZE")),
+            "integer" if headless else os.environ.get("SCALE_MODE", "integer"),
+        )
+        rng = RandomStreams(seed)  # 各子系统的随机数流
+        images = Images(rng.cosmetic("images"))  # 加载图像资源
+        font_registry.preload(FONT_SPECS)  # 预先加载字体
 
         self.config = GameConfig(
-            screen=screen,
+            screen=display.screen,
             clock=pygame.time.Clock(),
             fps=30,
             window=window,
             images=images,
             sounds=Sounds(),
+            display=display,
+            headless=headless,
+            rng=rng,
         )
         # 设置调试模式为False，关闭调试信息显示
         self.config.debug = False
@@ -75,22 +136,131 @@ class Flappy:
         
         # 初始化金币收集计数
         self.collected_coins = 0
+        
+        # 碰撞粗检测网格，每帧重建一次
+        self.collision_grid = SpatialGrid(cell_size=64)
+        
+        # HUD控件，显示内容不变时直接复用缓存的图像
+        self.effect_icons = {}  # 道具效果图标
+        self.effects_widget = HudWidget(self.build_effects_panel)
+        self.timer_widget = HudWidget(self.build_timer)
+        self.time_warning_widget = HudWidget(self.build_time_warning)
+        self.coin_tip_widget = HudWidget(self.build_coin_tip)
+        self.coin_counter_widget = HudWidget(self.build_coin_counter)
+        
+        # 模式选择菜单，静态部分只绘制一次
+        self.mode_menu = ModeMenu(self.config)
+
+        # 无界面模式下最近一步的结果，游戏结束后step不再推进
+        self.step_result = StepResult.RUNNING
+
+        # 输入回放：每局记录种子、模式和每步的输入位
+        self.record_dir = record_dir  # 保存回放的目录
+        self.run_seeds = random.Random(rng.seed)  # 第二局起每局的种子由根种子依次派生
+        self.streams_used = False  # 随机数流是否已被某一局用过（用过后要换新种子，回放才能从种子重现）
+        self.pending_input = 0  # 下一步之前收到的输入位
+        self.input_log: Optional[InputLog] = None  # 本局的输入记录
+        self.playback: Optional[Iterator[int]] = None  # 回放时每步的输入位，None表示读取键盘和鼠标
 
     async def start(self):
         """
         启动游戏循环
         """
         while True:
-            self.background = Background(self.config)  # 创建背景对象
-            self.floor = Floor(self.config)  # 创建地面对象
-            self.player = Player(self.config)  # 创建玩家对象
-            self.welcome_message = WelcomeMessage(self.config)  # 创建欢迎信息对象
-            self.game_over_message = GameOver(self.config)  # 创建游戏结束信息对象
-            self.pipes = Pipes(self.config)  # 创建管道对象
-            self.score = Score(self.config)  # 创建得分对象
+            self.create_entities()  # 创建本局的实体
             await self.splash()  # 显示欢迎界面
             await self.play()  # 开始游戏
+            self.save_input_log()  # 保存本局的输入回放
             await self.game_over()  # 游戏结束
+            # 每局使用新的种子，回放只需记录本局的种子
+            self.config.rng.reseed(self.run_seeds.randrange(1 << 32))
+
+    async def replay(self, log: InputLog):
+        """
+        回放一局录制的输入：按记录的种子、模式和模拟频率开始游戏，每步的输入取自回放而不是键盘和鼠标
+        """
+        self.use_replay_rate(log)
+        self.config.rng.reseed(log.seed)
+        self.create_entities()
+        self.game_mode = list(GameMode)[log.mode]
+        self.playback = log.inputs()
+        try:
+            await self.play()
+        finally:
+            self.playback = None
+        await self.game_over()
+
+    def use_replay_rate(self, log: InputLog):
+        """
+        录制时的模拟频率（fps）与当前不同时，按录制时的频率模拟，否则每步的输入对不上
+        """
+        if log.rate != self.config.timestep.rate:
+            self.config.timestep = FixedTimestep(log.rate, self.config.timestep.max_steps)
+
+    def create_entities(self):
+        """
+        创建一局游戏的实体
+        """
+        self.background = Background(self.config)  # 创建背景对象
+        self.floor = Floor(self.config)  # 创建地面对象
+        self.player = Player(self.config)  # 创建玩家对象
+        self.welcome_message = WelcomeMessage(self.config)  # 创建欢迎信息对象
+        self.game_over_message = GameOver(self.config)  # 创建游戏结束信息对象
+        self.pipes = Pipes(self.config)  # 创建管道对象
+        self.score = Score(self.config)  # 创建得分对象
+        self.boss = None
+        self.boss_level = 0
+        self.boss_cycle = 0
+        self.powerup_manager = PowerUpManager(self.config)  # 道具的生成计时每局重新开始
+        self.coin_manager = CoinManager(self.config)
+        self.collected_coins = 0
+
+    def new_game(self, mode: GameMode, seed: Optional[int] = None):
+        """
+        跳过欢迎界面，直接以指定模式开始一局新游戏（无界面模式下配合step使用）
+        :param mode: 游戏模式
+        :param seed: 本局的随机数根种子，None表示第一局使用根种子，之后与start相同，每局由根种子派生新的种子
+        """
+        if seed is None and self.streams_used:
+            # 沿用已推进过的随机数流时，回放记录的种子无法重现本局
+            seed = self.run_seeds.randrange(1 << 32)
+        if seed is not None:
+            self.config.rng.reseed(seed)
+        self.create_entities()
+        self.game_mode = mode
+        self.playback = None
+        self.begin_play()
+        self.step_result = StepResult.RUNNING
+
+    def new_replay(self, log: InputLog):
+        """
+        按回放记录的种子和模式直接开始一局，之后step每步的输入取自回放（无界面模式下配合step使用）
+        """
+        self.use_replay_rate(log)
+        self.new_game(list(GameMode)[log.mode], seed=log.seed)
+        self.playback = log.inputs()
+
+    def step(self, frames: int = 1, events: Iterable[pygame.event.Event] = ()) -> StepResult:
+        """
+        无界面地推进游戏：每帧模拟一个固定步长，不绘制、不刷新显示、不等待，
+        Boss转场只更新不播放动画，结果与窗口模式相同
+        :param frames: 推进的帧数
+        :param events: 在第一帧之前处理的输入事件（与游戏中的按键、点击事件相同）
+        :return: StepResult，游戏结束（DIED或ENDED）后不再推进，直接返回结束时的结果
+        """
+        for event in events:
+            self.handle_play_event(event)
+        timestep = self.config.timestep
+        for _ in range(frames):
+            if self.step_result in (StepResult.DIED, StepResult.ENDED):
+                break
+            self.apply_input(self.take_input())
+            timestep.step()
+            self.step_result = self.update_step()
+            if self.step_result == StepResult.NEXT_BOSS:
+                self.skip_boss_transition()
+                self.step_result = StepResult.RUNNING
+        return self.step_result
 
     async def splash(self):
         """
@@ -98,146 +268,9 @@ class Flappy:
         """
         self.player.set_mode(PlayerMode.SHM)  # 设置玩家模式为SHM（静止模式）
         
-        # 初始化字体 - 使用中文字体
-        title_font = get_font('SimHei', 36)  # 标题字体
-        mode_font = get_font('SimHei', 24)   # 模式选择字体
-        desc_font = get_font('SimHei', 14)   # 描述文字字体
-        instruction_font = get_font('SimHei', 18)  # 指示字体
-        
-        # 创建文本
-        title_text = title_font.render("FlappyBird", True, (255, 255, 255))  # 白色标题
-        classic_text = mode_font.render("经典模式", True, (255, 255, 255))
-        timed_text = mode_font.render("限时挑战", True, (255, 255, 255))
-        reverse_text = mode_font.render("重力反转", True, (255, 255, 255))
-        boss_text = mode_font.render("Boss战斗", True, (255, 255, 255))
-        coin_text = mode_font.render("金币收集", True, (255, 255, 255))
-        
-        # 添加模式描述文本
-        classic_desc = desc_font.render("无尽挑战的经典玩法", True, (220, 220, 220))
-        timed_desc = desc_font.render("60秒内获得最高分", True, (220, 220, 220))
-        reverse_desc = desc_font.render("颠倒重力，挑战不同体验", True, (220, 220, 220))
-        boss_desc = desc_font.render("击败强大的Boss敌人", True, (220, 220, 220))
-        coin_desc = desc_font.render("收集金币获取更高分数", True, (220, 220, 220))
-        
-        instruction_text = instruction_font.render("↑↓ 选择    空格 开始", True, (255, 255, 255))
-        
-        # 菜单颜色方案
-        primary_color = (255, 204, 0)  # 主要颜色（金黄色）
-        secondary_color = (87, 189, 255)  # 次要颜色（天蓝色）
-        dark_color = (40, 40, 40, 220)  # 深色（带透明度）
-        highlight_color = (255, 255, 255, 180)  # 高亮色（带透明度）
-        
-        # 计算文本位置
-        window_center_x = self.config.window.width // 2
-        title_pos = (window_center_x - title_text.get_width()//2, 60)
-        
-        # 计算菜单项位置和大小
-        button_width = 200
-        button_height = 50
-        button_spacing = 65  # 按钮之间的间距
-        button_start_y = 150
-        
-        # 创建一个半透明的菜单背景面板
-        menu_panel_width = button_width + 60
-        menu_panel_height = 395  # 增加高度以容纳新的金币模式按钮
-        menu_panel = pygame.Surface((menu_panel_width, menu_panel_height), pygame.SRCALPHA)
-        menu_panel.fill((0, 0, 0, 150))  # 半透明黑色
-        menu_panel_pos = (window_center_x - menu_panel_width//2, button_start_y - 20)
-        
-        # 预设按钮位置
-        button_x = window_center_x - button_width//2
-        
-        # 按钮位置列表
-        button_positions = [
-            button_start_y,
-            button_start_y + button_spacing,
-            button_start_y + button_spacing * 2,
-            button_start_y + button_spacing * 3,
-            button_start_y + button_spacing * 4  # 新增金币模式按钮位置
-        ]
-        
-        # 为按钮创建矩形和描述文本位置
-        button_rects = [
-            pygame.Rect(button_x, button_positions[0], button_width, button_height),
-            pygame.Rect(button_x, button_positions[1], button_width, button_height),
-            pygame.Rect(button_x, button_positions[2], button_width, button_height),
-            pygame.Rect(button_x, button_positions[3], button_width, button_height),
-            pygame.Rect(button_x, button_positions[4], button_width, button_height)  # 新增金币模式按钮矩形
-        ]
-        
-        # 描述文本位置
-        desc_positions = [
-            (window_center_x, button_positions[0] + button_height + 10),
-            (window_center_x, button_positions[1] + button_height + 10),
-            (window_center_x, button_positions[2] + button_height + 10),
-            (window_center_x, button_positions[3] + button_height + 10),
-            (window_center_x, button_positions[4] + button_height + 10)  # 新增金币模式描述位置
-        ]
-        
-        # 创建按钮图标 - 使用简单的图形
-        icons = []
-        
-        # 经典模式图标 - 管道
-        classic_icon = pygame.Surface((24, 24), pygame.SRCALPHA)
-        pygame.draw.rect(classic_icon, (100, 200, 100), (8, 0, 8, 24))
-        pygame.draw.rect(classic_icon, (80, 180, 80), (8, 0, 8, 6))
-        icons.append(classic_icon)
-        
-        # 限时模式图标 - 时钟
-        timed_icon = pygame.Surface((24, 24), pygame.SRCALPHA)
-        pygame.draw.circle(timed_icon, (200, 200, 200), (12, 12), 10, 2)
-        pygame.draw.line(timed_icon, (200, 200, 200), (12, 12), (12, 6), 2)
-        pygame.draw.line(timed_icon, (200, 200, 200), (12, 12), (16, 12), 2)
-        icons.append(timed_icon)
-        
-        # 重力反转图标 - 上下箭头
-        reverse_icon = pygame.Surface((24, 24), pygame.SRCALPHA)
-        pygame.draw.polygon(reverse_icon, (150, 150, 250), [(12, 0), (18, 8), (14, 8), (14, 16), (18, 16), (12, 24), (6, 16), (10, 16), (10, 8), (6, 8)])
-        icons.append(reverse_icon)
-        
-        # Boss模式图标 - 敌人
-        boss_icon = pygame.Surface((24, 24), pygame.SRCALPHA)
-        pygame.draw.circle(boss_icon, (250, 100, 100), (12, 12), 10)
-        pygame.draw.circle(boss_icon, (255, 255, 255), (8, 8), 3)
-        pygame.draw.circle(boss_icon, (255, 255, 255), (16, 8), 3)
-        pygame.draw.circle(boss_icon, (0, 0, 0), (8, 8), 1)
-        pygame.draw.circle(boss_icon, (0, 0, 0), (16, 8), 1)
-        pygame.draw.rect(boss_icon, (200, 50, 50), (8, 15, 8, 3))
-        icons.append(boss_icon)
-        
-        # 金币模式图标 - 金币
-        coin_icon = pygame.Surface((24, 24), pygame.SRCALPHA)
-        pygame.draw.circle(coin_icon, (255, 215, 0), (12, 12), 10)  # 金色圆形
-        pygame.draw.circle(coin_icon, (255, 235, 100), (12, 12), 7)  # 浅金色内圈
-        # 添加 "$" 符号
-        try:
-            coin_font = pygame.font.SysFont("Arial", 12, bold=True)
-        except:
-            coin_font = pygame.font.Font(None, 12)
-        coin_text = coin_font.render("$", True, (100, 80, 0))
-        coin_text_rect = coin_text.get_rect(center=(12, 12))
-        coin_icon.blit(coin_text, coin_text_rect)
-        icons.append(coin_icon)
-        
-        # 按钮文本
-        button_texts = [classic_text, timed_text, reverse_text, boss_text, coin_text]
-        desc_texts = [classic_desc, timed_desc, reverse_desc, boss_desc, coin_desc]
-        
-        # 初始动画数据
-        button_animations = [0, 0, 0, 0, 0]  # 按钮动画计数器
-        button_scale = [1.0, 1.0, 1.0, 1.0, 1.0]  # 按钮缩放因子
-        
         # 默认选择经典模式
         self.game_mode = GameMode.CLASSIC
-        selected_index = 0  # 0=经典, 1=限时, 2=反转, 3=Boss, 4=金币
-        
-        # 为游戏标题添加脉动效果
-        title_scale = 1.0
-        title_scale_dir = 0.0005
-        
-        # 计算指令文本位置
-        instruction_pos = (window_center_x - instruction_text.get_width()//2, 
-                          menu_panel_pos[1] + menu_panel_height + 20)
+        self.mode_menu.reset()
 
         while True:
             for event in pygame.event.get():
@@ -247,7 +280,7 @@ class Flappy:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_DOWN:
                         # 向下切换模式
-                        selected_index = (selected_index + 1) % 5
+                        selected_index = self.mode_menu.move(1)
                         if selected_index == 0:
                             self.game_mode = GameMode.CLASSIC
                         elif selected_index == 1:
@@ -262,7 +295,7 @@ class Flappy:
                         self.config.sounds.swoosh.play()
                     elif event.key == pygame.K_UP:
                         # 向上切换模式
-                        selected_index = (selected_index - 1) % 5
+                        selected_index = self.mode_menu.move(-1)
                         if selected_index == 0:
                             self.game_mode = GameMode.CLASSIC
                         elif selected_index == 1:
@@ -280,106 +313,22 @@ class Flappy:
                 if self.is_tap_event(event):
                     return
             
-            # 更新标题动画
-            title_scale += title_scale_dir
-            if title_scale > 1.05:
-                title_scale = 1.05
-                title_scale_dir = -title_scale_dir
-            elif title_scale < 0.95:
-                title_scale = 0.95
-                title_scale_dir = -title_scale_dir
-            
-            # 更新按钮动画
-            for i in range(5):
-                if i == selected_index:
-                    # 选中的按钮放大动画
-                    button_animations[i] += 0.1
-                    if button_animations[i] > 1:
-                        button_animations[i] = 1
-                    button_scale[i] = 1.0 + 0.03 * math.sin(pygame.time.get_ticks() / 150)
-                else:
-                    # 未选中的按钮恢复正常
-                    button_animations[i] -= 0.1
-                    if button_animations[i] < 0:
-                        button_animations[i] = 0
-                    button_scale[i] = 1.0
-            
+            # 更新地面、玩家和菜单动画
+            delta_time = self.config.timestep.step_ms
+            self.floor.update(delta_time)
+            self.player.update(delta_time)
+            self.mode_menu.update()
+
             # 绘制背景、地面和玩家
-            self.background.tick()
-            self.floor.tick()
-            self.player.tick()
-            self.welcome_message.tick()
-            
-            # 绘制半透明菜单背景
-            self.config.screen.blit(menu_panel, menu_panel_pos)
-            
-            # 绘制游戏标题
-            scaled_title = pygame.transform.scale(
-                title_text, 
-                (int(title_text.get_width() * title_scale), 
-                 int(title_text.get_height() * title_scale))
-            )
-            title_rect = scaled_title.get_rect(center=(window_center_x, title_pos[1] + title_text.get_height()//2))
-            self.config.screen.blit(scaled_title, title_rect)
-            
-            # 绘制每个按钮
-            for i in range(5):
-                # 计算动画效果
-                animation = button_animations[i]
-                current_scale = button_scale[i]
-                
-                # 计算绘制矩形（添加缩放效果）
-                scaled_width = int(button_width * current_scale)
-                scaled_height = int(button_height * current_scale)
-                button_x = window_center_x - scaled_width//2
-                button_y = button_positions[i] - (scaled_height - button_height)//2
-                
-                draw_rect = pygame.Rect(button_x, button_y, scaled_width, scaled_height)
-                
-                # 绘制按钮背景和边框
-                if i == selected_index:
-                    # 选中的按钮 - 亮色渐变背景
-                    bg_color = (
-                        int(dark_color[0] + (primary_color[0] - dark_color[0]) * animation),
-                        int(dark_color[1] + (primary_color[1] - dark_color[1]) * animation),
-                        int(dark_color[2] + (primary_color[2] - dark_color[2]) * animation),
-                        200
-                    )
-                    # 绘制背景
-                    pygame.draw.rect(self.config.screen, bg_color, draw_rect, border_radius=10)
-                    # 添加高亮边框
-                    pygame.draw.rect(self.config.screen, primary_color, draw_rect, 3, border_radius=10)
-                    # 添加发光效果
-                    glow_surface = pygame.Surface((scaled_width+10, scaled_height+10), pygame.SRCALPHA)
-                    pygame.draw.rect(glow_surface, (primary_color[0], primary_color[1], primary_color[2], 50), 
-                                   pygame.Rect(5, 5, scaled_width, scaled_height), border_radius=10)
-                    self.config.screen.blit(glow_surface, (button_x-5, button_y-5))
-                else:
-                    # 未选中的按钮 - 暗色背景
-                    pygame.draw.rect(self.config.screen, dark_color, draw_rect, border_radius=10)
-                    pygame.draw.rect(self.config.screen, (100, 100, 100, 180), draw_rect, 2, border_radius=10)
-                
-                # 绘制按钮图标
-                icon_size = int(24 * current_scale)
-                scaled_icon = pygame.transform.scale(icons[i], (icon_size, icon_size))
-                icon_x = button_x + 20
-                icon_y = button_y + (scaled_height - icon_size) // 2
-                self.config.screen.blit(scaled_icon, (icon_x, icon_y))
-                
-                # 绘制按钮文本
-                text_x = button_x + icon_size + 30
-                text_y = button_y + (scaled_height - button_texts[i].get_height()) // 2
-                self.config.screen.blit(button_texts[i], (text_x, text_y))
-                
-                # 绘制按钮描述（只为选中的按钮显示）
-                if i == selected_index:
-                    desc_rect = desc_texts[i].get_rect(center=desc_positions[i])
-                    self.config.screen.blit(desc_texts[i], desc_rect)
+            self.config.dirty_rects.invalidate()  # 菜单每帧整屏重绘
+            self.background.draw()
+            self.floor.draw()
+            self.player.draw()
+            self.welcome_message.draw()
             
-            # 绘制指令文本
-            self.config.screen.blit(instruction_text, instruction_pos)
+            self.mode_menu.draw()  # 绘制模式选择菜单
             
-            pygame.display.update()  # 刷新显示
+            self.config.present()  # 刷新显示
             await asyncio.sleep(0)  # 等待下一帧
             self.config.tick()  # 更新游戏配置
 
@@ -420,22 +369,36 @@ class Flappy:
         # 创建一个要删除的道具列表
         powerups_to_remove = []
         
-        # 检查所有道具
-        for powerup in self.powerup_manager.powerups:
-            # 如果玩家碰到了道具
-            if self.player.collide(powerup):
-                # 激活道具在管理器中的效果
-                self.powerup_manager.activate_effect(powerup.power_type)
-                # 播放得分声音
-                self.config.sounds.point.play()
-                # 添加到要删除的列表
-                powerups_to_remove.append(powerup)
+        # 批量检查与玩家同格子的道具
+        candidates = self.collision_grid.query("powerup", self.player.collision_rect)
+        for index in self.player.collide_many(candidates):
+            powerup = candidates[index]
+            # 激活道具在管理器中的效果
+            self.powerup_manager.activate_effect(powerup.power_type)
+            # 播放得分声音
+            self.config.sounds.point.play()
+            # 添加到要删除的列表
+            powerups_to_remove.append(powerup)
         
         # 从管理器中删除已收集的道具
         for powerup in powerups_to_remove:
             if powerup in self.powerup_manager.powerups:
                 self.powerup_manager.powerups.remove(powerup)
 
+    def rebuild_collision_grid(self):
+        """
+        用当前所有存活的实体重建碰撞网格
+        """
+        grid = self.collision_grid
+        grid.clear()
+        grid.insert_all("pipe", self.pipes.upper + self.pipes.lower)
+        grid.insert_all("powerup", self.powerup_manager.powerups)
+        if self.game_mode == GameMode.COIN:
+            grid.insert_all("coin", self.coin_manager.coins)
+        if self.game_mode == GameMode.BOSS and self.boss:
+            grid.insert_all("player_bullet", self.player.bullets)
+            grid.insert_all("boss_bullet", self.boss.bullets)
+
     def update_player_effects(self):
         """更新玩家的状态效果"""
         # 保存之前的速度修改器
@@ -465,112 +428,131 @@ class Flappy:
         """
         在屏幕上显示当前激活的效果及其剩余时间
         """
+        # 面板的显示内容：效果类型、剩余时间文本（精确到0.1秒）和进度条长度，
+        # 只有这些变化时才重新渲染面板
+        progress_width = 90
         active_effects = []
         for power_type in PowerUpType:
             if self.powerup_manager.has_effect(power_type):
                 remaining_ms = self.powerup_manager.get_remaining_time(power_type)
                 if remaining_ms is not None:
-                    active_effects.append((power_type, remaining_ms))
+                    progress_percent = remaining_ms / 5000  # 假设所有道具持续5秒
+                    active_effects.append((
+                        power_type,
+                        f"{remaining_ms / 1000:.1f}",
+                        int(progress_width * progress_percent),
+                    ))
         
-        # 如果有激活的效果，在屏幕上显示
+        # 如果有激活的效果，在屏幕左侧中部绘制面板
         if active_effects:
-            # 创建一个半透明背景面板 - 更精简的尺寸
-            panel_width = 130
-            panel_height = len(active_effects) * 20 + 8
-            panel_surface = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
-            panel_surface.fill((0, 0, 0, 180))  # 黑色半透明背景
+            self.effects_widget.draw(self.config, tuple(active_effects), (5, 40))
+
+    def build_effects_panel(self, active_effects):
+        """
+        渲染道具效果面板
+        :param active_effects: (道具类型, 剩余秒数文本, 进度条长度) 列表
+        """
+        # 创建一个半透明背景面板 - 更精简的尺寸
+        panel_width = 130
+        panel_height = len(active_effects) * 20 + 8
+        panel_surface = create_surface((panel_width, panel_height))
+        panel_surface.fill((0, 0, 0, 180))  # 黑色半透明背景
+        
+        # 添加面板边框
+        pygame.draw.rect(panel_surface, (255, 255, 255, 70), pygame.Rect(0, 0, panel_width, panel_height), 1)
+        
+        # 使用中文字体 - 更小的字体
+        effect_font = get_font('SimHei', 12)
+        
+        # 处理每个激活的效果 - 不显示标题，直接显示效果
+        for idx, (power_type, remaining_sec, current_progress) in enumerate(active_effects):
+            y_pos = 4 + idx * 20
             
-            # 添加面板边框
-            pygame.draw.rect(panel_surface, (255, 255, 255, 70), pygame.Rect(0, 0, panel_width, panel_height), 1)
+            # 根据道具类型选择显示文本和颜色
+            if power_type == PowerUpType.SPEED_BOOST:
+                text = f"加速: {remaining_sec}秒"
+                color = (255, 165, 0)  # 橙色
+            elif power_type == PowerUpType.INVINCIBLE:
+                text = f"无敌: {remaining_sec}秒"
+                color = (255, 215, 0)  # 金色
+            elif power_type == PowerUpType.SLOW_MOTION:
+                text = f"慢动作: {remaining_sec}秒"
+                color = (0, 191, 255)  # 天蓝色
+            elif power_type == PowerUpType.SMALL_SIZE:
+                text = f"缩小: {remaining_sec}秒"
+                color = (147, 112, 219)  # 紫色
             
-            # 在屏幕左侧中部绘制面板
-            panel_pos = (5, 40)  # 位置调整到左侧中部
-            self.config.screen.blit(panel_surface, panel_pos)
+            # 绘制图标
+            panel_surface.blit(self.get_effect_icon(power_type), (5, y_pos + 4))
             
-            # 使用中文字体 - 更小的字体
-            effect_font = get_font('SimHei', 12)
+            # 绘制文本
+            text_surface = render_text(effect_font, text, color)
+            text_rect = text_surface.get_rect(midleft=(20, y_pos + 10))
+            panel_surface.blit(text_surface, text_rect)
             
-            # 处理每个激活的效果 - 不显示标题，直接显示效果
-            for idx, (power_type, remaining_ms) in enumerate(active_effects):
-                remaining_sec = remaining_ms / 1000
-                y_pos = panel_pos[1] + 4 + idx * 20
-                
-                # 根据道具类型选择显示文本、颜色和图标
-                if power_type == PowerUpType.SPEED_BOOST:
-                    text = f"加速: {remaining_sec:.1f}秒"
-                    color = (255, 165, 0)  # 橙色
-                    icon_color = (255, 165, 0, 200)
-                elif power_type == PowerUpType.INVINCIBLE:
-                    text = f"无敌: {remaining_sec:.1f}秒"
-                    color = (255, 215, 0)  # 金色
-                    icon_color = (255, 215, 0, 200)
-                elif power_type == PowerUpType.SLOW_MOTION:
-                    text = f"慢动作: {remaining_sec:.1f}秒"
-                    color = (0, 191, 255)  # 天蓝色
-                    icon_color = (0, 191, 255, 200)
-                elif power_type == PowerUpType.SMALL_SIZE:
-                    text = f"缩小: {remaining_sec:.1f}秒"
-                    color = (147, 112, 219)  # 紫色
-                    icon_color = (147, 112, 219, 200)
-                
-                # 创建图标
-                icon_size = 12
-                icon_surface = pygame.Surface((icon_size, icon_size), pygame.SRCALPHA)
-                pygame.draw.circle(icon_surface, icon_color, (icon_size//2, icon_size//2), icon_size//2)
-                
-                # 添加简单的图标内容
-                if power_type == PowerUpType.SPEED_BOOST:
-                    # 速度图标 - 箭头
-                    pygame.draw.polygon(icon_surface, (255, 255, 255, 220), 
-                                       [(3, 6), (9, 3), (9, 9)])
-                elif power_type == PowerUpType.INVINCIBLE:
-                    # 无敌图标 - 盾牌
-                    pygame.draw.polygon(icon_surface, (255, 255, 255, 220), 
-                                       [(6, 2), (9, 4), (9, 8), (6, 10), (3, 8), (3, 4)])
-                elif power_type == PowerUpType.SLOW_MOTION:
-                    # 慢动作图标 - 时钟
-                    pygame.draw.circle(icon_surface, (255, 255, 255, 220), (icon_size//2, icon_size//2), 
-                                      icon_size//2-2, 1)
-                    # 时针
-                    pygame.draw.line(icon_surface, (255, 255, 255, 220), 
-                                    (icon_size//2, icon_size//2), (icon_size//2, icon_size//2-3), 1)
-                    # 分针
-                    pygame.draw.line(icon_surface, (255, 255, 255, 220), 
-                                    (icon_size//2, icon_size//2), (icon_size//2+2, icon_size//2), 1)
-                elif power_type == PowerUpType.SMALL_SIZE:
-                    # 缩小图标 - 向内的箭头
-                    pygame.draw.line(icon_surface, (255, 255, 255, 220), (3, 3), (6, 6), 1)
-                    pygame.draw.line(icon_surface, (255, 255, 255, 220), (9, 3), (6, 6), 1)
-                    pygame.draw.line(icon_surface, (255, 255, 255, 220), (3, 9), (6, 6), 1)
-                    pygame.draw.line(icon_surface, (255, 255, 255, 220), (9, 9), (6, 6), 1)
-                
-                # 绘制图标
-                self.config.screen.blit(icon_surface, (panel_pos[0] + 5, y_pos + 4))
-                
-                # 创建文本
-                text_surface = effect_font.render(text, True, color)
-                text_rect = text_surface.get_rect(midleft=(panel_pos[0] + 20, y_pos + 10))
-                
-                # 绘制文本
-                self.config.screen.blit(text_surface, text_rect)
-                
-                # 添加进度条 - 更小更简洁
-                progress_width = 90
-                progress_height = 3
-                progress_x = panel_pos[0] + 30
-                progress_y = y_pos + 16
-                
-                # 进度条背景
-                pygame.draw.rect(self.config.screen, (50, 50, 50, 150), 
-                                (progress_x, progress_y, progress_width, progress_height))
-                
-                # 计算剩余时间的进度
-                progress_percent = remaining_ms / 5000  # 假设所有道具持续5秒
-                current_progress = int(progress_width * progress_percent)
-                
-                # 进度条前景
-                pygame.draw.rect(self.config.screen, color, 
-                                (progress_x, progress_y, current_progress, progress_height))
+            # 添加进度条 - 更小更简洁（原先直接画在屏幕上，颜色的alpha不生效，这里保持不透明）
+            progress_width = 90
+            progress_height = 3
+            progress_x = 30
+            progress_y = y_pos + 16
+            
+            # 进度条背景
+            pygame.draw.rect(panel_surface, (50, 50, 50), 
+                            (progress_x, progress_y, progress_width, progress_height))
+            
+            # 进度条前景
+            pygame.draw.rect(panel_surface, color, 
+                            (progress_x, progress_y, current_progress, progress_height))
+        
+        return panel_surface
+
+    def get_effect_icon(self, power_type):
+        """
+        获取道具效果图标，每种道具只创建一次
+        """
+        if power_type in self.effect_icons:
+            return self.effect_icons[power_type]
+        
+        icon_color = {
+            PowerUpType.SPEED_BOOST: (255, 165, 0, 200),
+            PowerUpType.INVINCIBLE: (255, 215, 0, 200),
+            PowerUpType.SLOW_MOTION: (0, 191, 255, 200),
+            PowerUpType.SMALL_SIZE: (147, 112, 219, 200),
+        }[power_type]
+        
+        # 创建图标
+        icon_size = 12
+        icon_surface = create_surface((icon_size, icon_size))
+        pygame.draw.circle(icon_surface, icon_color, (icon_size//2, icon_size//2), icon_size//2)
+        
+        # 添加简单的图标内容
+        if power_type == PowerUpType.SPEED_BOOST:
+            # 速度图标 - 箭头
+            pygame.draw.polygon(icon_surface, (255, 255, 255, 220), 
+                               [(3, 6), (9, 3), (9, 9)])
+        elif power_type == PowerUpType.INVINCIBLE:
+            # 无敌图标 - 盾牌
+            pygame.draw.polygon(icon_surface, (255, 255, 255, 220), 
+                               [(6, 2), (9, 4), (9, 8), (6, 10), (3, 8), (3, 4)])
+        elif power_type == PowerUpType.SLOW_MOTION:
+            # 慢动作图标 - 时钟
+            pygame.draw.circle(icon_surface, (255, 255, 255, 220), (icon_size//2, icon_size//2), 
+                              icon_size//2-2, 1)
+            # 时针
+            pygame.draw.line(icon_surface, (255, 255, 255, 220), 
+                            (icon_size//2, icon_size//2), (icon_size//2, icon_size//2-3), 1)
+            # 分针
+            pygame.draw.line(icon_surface, (255, 255, 255, 220), 
+                            (icon_size//2, icon_size//2), (icon_size//2+2, icon_size//2), 1)
+        elif power_type == PowerUpType.SMALL_SIZE:
+            # 缩小图标 - 向内的箭头
+            pygame.draw.line(icon_surface, (255, 255, 255, 220), (3, 3), (6, 6), 1)
+            pygame.draw.line(icon_surface, (255, 255, 255, 220), (9, 3), (6, 6), 1)
+            pygame.draw.line(icon_surface, (255, 255, 255, 220), (3, 9), (6, 6), 1)
+            pygame.draw.line(icon_surface, (255, 255, 255, 220), (9, 9), (6, 6), 1)
+        
+        self.effect_icons[power_type] = icon_surface
+        return icon_surface
 
     def check_pipe_pass(self):
         """
@@ -589,11 +571,20 @@ class Flappy:
                 # 播放得分声音
                 self.config.sounds.point.play()
 
-    async def play(self):
+    def begin_play(self):
         """
-        主要游戏循环
+        按游戏模式设置玩家、Boss、道具等，开始一局游戏
         """
-        # 当玩家开始游戏时
+        # 欢迎界面上的玩家上下浮动、切换拍打帧，换成新创建的玩家，
+        # 每局都从相同的位置和动画帧开始，回放只需记录种子、模式和输入
+        self.player = Player(self.config)
+        self.config.timestep.time = 0.0  # 道具效果等按本局的模拟时间计时
+        self.streams_used = True
+        self.pending_input = 0
+        self.input_log = InputLog(
+            self.config.rng.seed, list(GameMode).index(self.game_mode), self.config.timestep.rate
+        )
+
         # 根据游戏模式设置玩家模式
         if self.game_mode == GameMode.REVERSE:
             self.player.set_mode(PlayerMode.REVERSE)  # 设置玩家模式为REVERSE（反向模式）
@@ -602,10 +593,7 @@ class Flappy:
             self.create_boss()  # 创建初始Boss实体
             
             # 确保每次开始Boss模式时都有足够的准备时间
-            self.boss.preparation_time = 120  # 给玩家4秒准备时间
-            self.boss.is_preparing = True
-            if not hasattr(self.boss, 'initial_preparation_time'):
-                self.boss.initial_preparation_time = self.boss.preparation_time
+            self.boss.start_preparation(120)  # 给玩家4秒准备时间
             
             self.pipes.upper.clear()  # 清空管道
             self.pipes.lower.clear()  # 清空管道
@@ -631,236 +619,313 @@ class Flappy:
         if self.game_mode == GameMode.TIMED:
             self.time_remaining = self.time_limit
             
-        # 创建字体用于显示剩余时间 - 使用中文字体
-        time_font = get_font('SimHei', 24)
-        game_over = False
-        
         # 添加测试模式提示信息
-        test_mode_active = True
-        try:
-            test_mode_font = get_font('SimHei', 10)  # 更小字体
-        except:
-            test_mode_font = pygame.font.SysFont('Arial', 10)
+        self.test_mode_active = True
+        test_mode_font = get_font('SimHei', 10)  # 更小字体
         
         # 将测试模式提示分成多行，避免文字拥挤
-        test_mode_bg = pygame.Surface((140, 20), pygame.SRCALPHA)  # 更小尺寸
-        test_mode_bg.fill((0, 0, 0, 150))  # 半透明黑色背景
+        self.test_mode_bg = create_surface((140, 20))  # 更小尺寸
+        self.test_mode_bg.fill((0, 0, 0, 150))  # 半透明黑色背景
         
         # 简化提示文本，减少长度
-        test_mode_text = test_mode_font.render("5加速 6无敌 7慢速 8缩小", True, (255, 255, 255))
+        self.test_mode_text = render_text(test_mode_font, "5加速 6无敌 7慢速 8缩小", (255, 255, 255))
+
+    def handle_play_event(self, event):
+        """
+        处理游戏中的输入事件：拍打、射击、切换武器、测试道具等
+        输入先转换成输入位，在下一步模拟之前统一生效（同时写入回放）
+        """
+        if self.is_tap_event(event):
+            self.pending_input |= INPUT_FLAP  # 玩家点击，执行拍打动作
+            # Boss模式下，空格键也用于射击
+            if self.game_mode == GameMode.BOSS:
+                self.pending_input |= INPUT_SHOOT
         
-        while True:
-            # 计算帧间隔时间
-            current_time = pygame.time.get_ticks()
-            delta_time = current_time - self.last_frame_time
-            self.last_frame_time = current_time
+        # 添加键盘事件处理
+        if event.type == KEYDOWN:
+            # F3切换脏矩形渲染（只影响绘制，不记录）
+            if event.key == K_F3:
+                self.config.dirty_rects.toggle()
 
-            for event in pygame.event.get():
-                self.check_quit_event(event)  # 检查退出事件
-                if self.is_tap_event(event):
-                    self.player.flap()  # 玩家点击，执行拍打动作
-                    # Boss模式下，空格键也用于射击
-                    if self.game_mode == GameMode.BOSS:
-                        self.player.shoot()
-                
-                # 添加键盘事件处理
-                if event.type == KEYDOWN:
-                    # 武器切换 - Q/E键
-                    if event.key == K_q and self.game_mode == GameMode.BOSS:
-                        self.player.switch_weapon(-1)  # 上一个武器
-                    elif event.key == K_e and self.game_mode == GameMode.BOSS:
-                        self.player.switch_weapon(1)   # 下一个武器
-                    
-                    # 数字键1-4直接选择武器
-                    if self.game_mode == GameMode.BOSS:
-                        if event.key == K_1 and len(self.player.weapons) > 0:
-                            self.player.current_weapon_index = 0
-                        elif event.key == K_2 and len(self.player.weapons) > 1:
-                            self.player.current_weapon_index = 1
-                        elif event.key == K_3 and len(self.player.weapons) > 2:
-                            self.player.current_weapon_index = 2
-                        elif event.key == K_4 and len(self.player.weapons) > 3:
-                            self.player.current_weapon_index = 3
-                    
-                    # 测试模式 - 直接生成特定道具
-                    if test_mode_active:
-                        if event.key == K_5:  # 5键生成速度道具
-                            self.spawn_test_powerup(PowerUpType.SPEED_BOOST)
-                        elif event.key == K_6:  # 6键生成无敌道具
-                            self.spawn_test_powerup(PowerUpType.INVINCIBLE)
-                        elif event.key == K_7:  # 7键生成慢动作道具
-                            self.spawn_test_powerup(PowerUpType.SLOW_MOTION)
-                        elif event.key == K_8:  # 8键生成缩小道具
-                            self.spawn_test_powerup(PowerUpType.SMALL_SIZE)
-
-            # 限时模式时间更新
-            if self.game_mode == GameMode.TIMED:
-                self.time_remaining -= delta_time
-                if self.time_remaining <= 0:
-                    self.time_remaining = 0
-                    game_over = True
+            # 武器切换 - Q/E键
+            if event.key == K_q and self.game_mode == GameMode.BOSS:
+                self.pending_input |= INPUT_WEAPON_PREV  # 上一个武器
+            elif event.key == K_e and self.game_mode == GameMode.BOSS:
+                self.pending_input |= INPUT_WEAPON_NEXT  # 下一个武器
+            
+            # 数字键1-4直接选择武器
+            if self.game_mode == GameMode.BOSS and event.key in WEAPON_KEYS:
+                self.pending_input |= INPUT_WEAPON_1 << WEAPON_KEYS.index(event.key)
             
-            # 更新道具管理器
-            self.powerup_manager.tick(delta_time)
+            # 测试模式 - 5-8键直接生成特定道具
+            if self.test_mode_active and event.key in TEST_POWERUP_KEYS:
+                self.pending_input |= INPUT_TEST_1 << TEST_POWERUP_KEYS.index(event.key)
+
+    def take_input(self):
+        """
+        取出下一步的输入位并记录到本局的回放中：回放时取自回放，否则取自收到的输入事件
+        """
+        if self.playback is not None:
+            bits = next(self.playback)
+        else:
+            bits = self.pending_input
+        self.pending_input = 0
+        if self.input_log is not None:
+            self.input_log.record(bits)
+        return bits
+
+    def apply_input(self, bits):
+        """
+        在一步模拟之前执行输入位对应的操作
+        """
+        if not bits:
+            return
+        if bits & INPUT_FLAP:
+            self.player.flap()
+        if bits & INPUT_SHOOT:
+            self.player.shoot()
+        if bits & INPUT_WEAPON_PREV:
+            self.player.switch_weapon(-1)
+        if bits & INPUT_WEAPON_NEXT:
+            self.player.switch_weapon(1)
+        for index in range(len(WEAPON_KEYS)):
+            if bits & INPUT_WEAPON_1 << index and len(self.player.weapons) > index:
+                self.player.current_weapon_index = index
+        for index, power_type in enumerate(TEST_POWERUP_TYPES):
+            if bits & INPUT_TEST_1 << index:
+                self.spawn_test_powerup(power_type)
+
+    def save_input_log(self):
+        """
+        把本局的输入回放保存到record_dir（没有设置时不保存）
+        """
+        if self.record_dir is None or self.input_log is None:
+            return
+        os.makedirs(self.record_dir, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.game_mode.name.lower()}-{self.input_log.seed}.fbr"
+        self.input_log.save(os.path.join(self.record_dir, name))
+
+    async def play(self):
+        """
+        主要游戏循环
+        """
+        self.begin_play()
+        self.config.dirty_rects.invalidate()  # 进入游戏时整屏重绘一次
+        timestep = self.config.timestep
+        timestep.reset()
+        self.last_frame_time = pygame.time.get_ticks()
+        try:
+            while True:
+                # 计算帧间隔时间
+                delta_time = self.calculate_delta_time()
+
+                for event in pygame.event.get():
+                    self.check_quit_event(event)  # 检查退出事件
+                    self.handle_play_event(event)
+
+                # 按固定步长推进模拟，本帧所有步更新完后只绘制一次
+                steps = timestep.advance(delta_time)
+                result = StepResult.RUNNING
+                for _ in range(steps):
+                    self.apply_input(self.take_input())
+                    timestep.step()
+                    result = self.update_step()
+                    if result != StepResult.RUNNING:
+                        break
+
+                if result == StepResult.DIED:
+                    return
+                if result == StepResult.NEXT_BOSS:
+                    await self.next_boss()  # 显示转场动画并创建下一个Boss
+                    # 转场动画占用了真实时间，重新开始累积
+                    timestep.reset()
+                    self.last_frame_time = pygame.time.get_ticks()
+                    continue
+
+                if steps:
+                    self.draw_step()  # 绘制画面
+                    self.config.present()  # 刷新显示
+                await asyncio.sleep(0)  # 等待下一帧
+                self.config.tick()  # 更新游戏配置
+
+                if result == StepResult.ENDED:
+                    return
+        finally:
+            timestep.reset()  # 游戏结束画面按当前位置绘制
+
+    def update_step(self):
+        """
+        推进一步游戏模拟（固定步长），只更新状态不绘制
+        :return: StepResult，本步之后游戏是否继续
+        """
+        delta_time = self.config.timestep.step_ms  # 每步固定的时长
+        time_up = False
+
+        # 限时模式时间更新
+        if self.game_mode == GameMode.TIMED:
+            self.time_remaining -= delta_time
+            if self.time_remaining <= 0:
+                self.time_remaining = 0
+                time_up = True
+        
+        # 更新道具管理器
+        self.powerup_manager.update(delta_time)
+        
+        # 更新玩家状态效果
+        self.update_player_effects()
+        
+        # 检查管道通过情况并更新分数（除了Boss模式和金币模式）
+        if self.game_mode not in [GameMode.BOSS, GameMode.COIN]:
+            self.check_pipe_pass()
+
+        self.floor.update(delta_time)  # 更新地面
+        
+        # 金币模式特有的逻辑
+        if self.game_mode == GameMode.COIN:
+            # 更新金币管理器
+            self.coin_manager.update(delta_time)
             
-            # 检查道具碰撞
-            self.check_powerup_collisions()
+            # 仍然保留管道，但是间隔更大，速度更快，使游戏更具挑战性
+            self.pipes.update(delta_time)
+        # Boss模式下没有管道
+        elif self.game_mode != GameMode.BOSS:
+            self.pipes.update(delta_time)  # 更新管道
             
-            # 更新玩家状态效果
-            self.update_player_effects()
+        self.player.update(delta_time)  # 更新玩家
+        
+        # Boss模式特有的逻辑
+        if self.game_mode == GameMode.BOSS:
+            # 更新Boss
+            self.boss.update(delta_time)
             
-            # 检查管道通过情况并更新分数（除了Boss模式和金币模式）
-            if self.game_mode not in [GameMode.BOSS, GameMode.COIN]:
-                self.check_pipe_pass()
-
-            self.background.tick()  # 更新背景
-            self.floor.tick()  # 更新地面
+            # 设置Boss级别
+            self.boss.level = self.boss_cycle + 1
             
-            # 金币模式特有的逻辑
-            if self.game_mode == GameMode.COIN:
-                # 更新金币管理器
-                self.coin_manager.tick(delta_time)
+            # 之前的状态栏已移除，Boss血条现在直接显示在头上
+        
+        # 所有实体移动完毕后重建碰撞网格，本帧的碰撞检测都基于它
+        self.rebuild_collision_grid()
+        
+        # 检查道具碰撞
+        self.check_powerup_collisions()
+        
+        # 金币模式：检查金币碰撞并增加分数
+        if self.game_mode == GameMode.COIN:
+            collected_score = self.coin_manager.check_player_collision(self.player, self.collision_grid)
+            if collected_score > 0:
+                # 增加分数
+                for _ in range(collected_score):
+                    self.score.add()
                 
-                # 检查金币碰撞并增加分数
-                collected_score = self.coin_manager.check_player_collision(self.player)
-                if collected_score > 0:
-                    # 增加分数
-                    for _ in range(collected_score):
-                        self.score.add()
-                    
-                    # 增加收集的金币数量
-                    self.collected_coins += collected_score
+                # 增加收集的金币数量
+                self.collected_coins += collected_score
+        
+        if self.game_mode == GameMode.BOSS:
+            # 检查玩家子弹是否击中Boss
+            if self.player.check_bullet_hit_boss(self.boss, self.collision_grid):
+                # 增加分数
+                self.score.add()
                 
-                # 仍然保留管道，但是间隔更大，速度更快，使游戏更具挑战性
-                self.pipes.tick()
+            # 检查Boss是否被打败，然后进入下一关卡或结束游戏
+            if self.boss and self.boss.is_defeated():
+                self.boss_level += 1
                 
-                # 显示金币计数器
-                self.render_coin_counter()
-            # Boss模式下不渲染管道
-            elif self.game_mode != GameMode.BOSS:
-                self.pipes.tick()  # 更新管道
+                # 调试输出
+                if hasattr(self.config, 'debug') and self.config.debug:
+                    print(f"Boss defeated! Moving to level {self.boss_level}")
                 
-            self.score.tick()  # 更新得分
-            self.player.tick()  # 更新玩家
+                # 无限循环Boss，无论boss_level多大都会继续
+                # 由游戏循环显示转场动画并创建下一个Boss，然后继续游戏
+                return StepResult.NEXT_BOSS
             
-            # Boss模式特有的逻辑
-            if self.game_mode == GameMode.BOSS:
-                # 更新Boss
-                self.boss.tick()
-                
-                # 设置Boss级别
-                self.boss.level = self.boss_cycle + 1
-                
-                # 之前的状态栏已移除，Boss血条现在直接显示在头上
-                
-                # 检查玩家子弹是否击中Boss
-                if self.player.check_bullet_hit_boss(self.boss):
-                    # 增加分数
-                    self.score.add()
-                    
-                # 检查Boss是否被打败，然后进入下一关卡或结束游戏
-                if self.boss and self.boss.is_defeated():
-                    self.boss_level += 1
-                    
-                    # 调试输出
-                    if hasattr(self.config, 'debug') and self.config.debug:
-                        print(f"Boss defeated! Moving to level {self.boss_level}")
-                    
-                    # 无限循环Boss，无论boss_level多大都会继续
-                    # 创建下一个Boss
-                    await self.next_boss()
-                    # 继续游戏而不是退出游戏循环
-                    continue
-                
-                # 检查玩家是否被Boss子弹击中
-                if self.player.check_boss_bullet_collision(self.boss):
-                    if not self.player.invincible:
-                        return  # 玩家死亡
+            # 检查玩家是否被Boss子弹击中
+            if self.player.check_boss_bullet_collision(self.boss, self.collision_grid):
+                if not self.player.invincible:
+                    return StepResult.DIED  # 玩家死亡
+        
+        # 道具在每步中移动两次：碰撞检测之后再移动一次（不重新记录插值起点）
+        for powerup in self.powerup_manager.powerups:
+            powerup.move()
+
+        # 玩家碰撞检测
+        if self.game_mode == GameMode.BOSS:
+            # Boss模式下只检测与地板的碰撞
+            if (self.player.y + self.player.h >= self.floor.y - 1 or self.player.y < 0) and not self.player.invincible:
+                return StepResult.ENDED
+        else:
+            # 其他模式下检测与管道和地板的碰撞
+            if self.player.collided(self.pipes, self.floor, self.collision_grid) and not self.player.invincible:
+                return StepResult.ENDED
+        
+        # 限时模式结束
+        if time_up:
+            return StepResult.ENDED
+        return StepResult.RUNNING
+
+    def draw_step(self, surface: Optional[pygame.Surface] = None):
+        """
+        按当前状态绘制游戏画面，不修改游戏状态
+        :param surface: 绘制目标，None表示屏幕
+        """
+        if surface is not None:
+            with self.config.render_to(surface):
+                self.draw_step()
+            return
+
+        self.background.draw()  # 绘制背景
+        self.floor.draw()  # 绘制地面
+        
+        if self.game_mode == GameMode.COIN:
+            self.coin_manager.draw()  # 绘制金币
+            self.pipes.draw()
+            self.render_coin_counter()  # 显示金币计数器
+        # Boss模式下不渲染管道
+        elif self.game_mode != GameMode.BOSS:
+            self.pipes.draw()  # 绘制管道
             
-            # 绘制道具
-            for powerup in self.powerup_manager.powerups:
-                powerup.tick()
-                
-            # 绘制活跃效果提示
-            self.render_active_effects()
+        self.score.draw()  # 绘制得分
+        self.player.draw()  # 绘制玩家
+        
+        if self.game_mode == GameMode.BOSS:
+            self.boss.draw()  # 绘制Boss
+        
+        # 绘制道具
+        self.powerup_manager.draw()
             
-            # 如果是限时模式，显示剩余时间
-            if self.game_mode == GameMode.TIMED:
-                seconds_left = max(0, int(self.time_remaining / 1000))
-                
-                # 创建一个半透明的计时器背景
-                timer_bg = pygame.Surface((100, 40), pygame.SRCALPHA)
-                alpha = 180  # 透明度
-                timer_bg.fill((0, 0, 0, alpha))
-                self.config.screen.blit(timer_bg, (self.config.window.width - 110, 5))
-                
-                # 绘制计时器文本
-                time_text = time_font.render(f"时间: {seconds_left}秒", True, (255, 255, 255))
-                time_rect = time_text.get_rect(center=(self.config.window.width - 60, 25))
-                self.config.screen.blit(time_text, time_rect)
-                
-                # 当时间小于10秒时闪烁显示并添加红色警告效果
-                if seconds_left <= 10 and self.time_remaining > 0:
-                    # 闪烁效果
-                    if (current_time // 500) % 2 == 0:  # 每500毫秒闪烁一次
-                        # 创建警告背景
-                        warning_bg = pygame.Surface((200, 40), pygame.SRCALPHA)
-                        warning_bg.fill((255, 0, 0, 150))  # 半透明红色
-                        warning_rect = warning_bg.get_rect(center=(self.config.window.width//2, 50))
-                        self.config.screen.blit(warning_bg, warning_rect)
-                        
-                        # 警告文本
-                        warning_text = time_font.render("时间即将结束！", True, (255, 255, 255))
-                        warning_text_rect = warning_text.get_rect(center=(self.config.window.width//2, 50))
-                        self.config.screen.blit(warning_text, warning_text_rect)
+        # 绘制活跃效果提示
+        self.render_active_effects()
+        
+        # 如果是限时模式，显示剩余时间
+        if self.game_mode == GameMode.TIMED:
+            seconds_left = max(0, int(self.time_remaining / 1000))
             
-            # 金币模式的提示
-            if self.game_mode == GameMode.COIN:
-                # 创建一个半透明的提示背景
-                coin_tip_bg = pygame.Surface((180, 40), pygame.SRCALPHA)
-                coin_tip_bg.fill((0, 0, 0, 150))  # 半透明黑色
-                self.config.screen.blit(coin_tip_bg, (5, 5))
-                
-                # 绘制提示文本
-                try:
-                    coin_tip_font = get_font('SimHei', 16)  # 尝试使用中文字体
-                except:
-                    coin_tip_font = pygame.font.SysFont('Arial', 16)  # 如果失败，使用系统字体
-                
-                coin_tip_text = coin_tip_font.render("收集金币以获得更高分数!", True, (255, 215, 0))
-                coin_tip_rect = coin_tip_text.get_rect(center=(95, 25))
-                self.config.screen.blit(coin_tip_text, coin_tip_rect)
+            # 绘制计时器，只有剩余整秒数变化时才重新渲染
+            self.timer_widget.draw(self.config, seconds_left,
+                                   center=(self.config.window.width - 60, 25))
             
-            # 显示测试模式提示
-            if test_mode_active:
-                # 测试模式提示放在顶部右侧
-                bg_rect = pygame.Rect(self.config.window.width - 150, 5, 140, 20)
-                
-                # 添加边框使其更明显，但更细
-                pygame.draw.rect(self.config.screen, (255, 255, 255, 70), bg_rect, 1)
-                
-                self.config.screen.blit(test_mode_bg, bg_rect)
-                # 居中文本
-                text_rect = test_mode_text.get_rect(center=(bg_rect.centerx, bg_rect.centery))
-                self.config.screen.blit(test_mode_text, text_rect)
-
-            pygame.display.update()  # 刷新显示
-            await asyncio.sleep(0)  # 等待下一帧
-            self.config.tick()  # 更新游戏配置
+            # 当时间小于10秒时闪烁显示并添加红色警告效果
+            if seconds_left <= 10 and self.time_remaining > 0:
+                # 闪烁效果
+                if (self.config.timestep.time // 500) % 2 == 0:  # 每500毫秒闪烁一次
+                    self.time_warning_widget.draw(self.config, None,
+                                                  center=(self.config.window.width//2, 50))
+        
+        # 金币模式的提示
+        if self.game_mode == GameMode.COIN:
+            self.coin_tip_widget.draw(self.config, None, center=(95, 25))
+        
+        # 显示测试模式提示
+        if self.test_mode_active:
+            # 测试模式提示放在顶部右侧
+            bg_rect = pygame.Rect(self.config.window.width - 150, 5, 140, 20)
             
-            # 玩家碰撞检测
-            if self.game_mode == GameMode.BOSS:
-                # Boss模式下只检测与地板的碰撞
-                if (self.player.y + self.player.h >= self.floor.y - 1 or self.player.y < 0) and not self.player.invincible:
-                    return
-            else:
-                # 其他模式下检测与管道和地板的碰撞
-                if self.player.collided(self.pipes, self.floor) and not self.player.invincible:
-                    return
+            # 添加边框使其更明显，但更细
+            self.config.mark_dirty(pygame.draw.rect(self.config.screen, (255, 255, 255, 70), bg_rect, 1))
             
-            # 限时模式结束
-            if game_over:
-                return
+            self.config.blit(self.test_mode_bg, bg_rect)
+            # 居中文本
+            text_rect = self.test_mode_text.get_rect(center=(bg_rect.centerx, bg_rect.centery))
+            self.config.blit(self.test_mode_text, text_rect)
 
     async def game_over(self):
         """
@@ -879,18 +944,27 @@ class Flappy:
                     if self.player.y + self.player.h >= self.floor.y - 1:
                         return  # 如果玩家落到地面，结束游戏
 
-            self.background.tick()  # 更新背景
-            self.floor.tick()  # 更新地面
+            # 更新地面、管道和坠落的玩家
+            delta_time = self.config.timestep.step_ms
+            self.floor.update(delta_time)  # 更新地面
             
             # Boss模式下不需要更新管道
-            if self.game_mode != GameMode.BOSS and hasattr(self, 'pipes'):
-                self.pipes.tick()  # 更新管道
+            has_pipes = self.game_mode != GameMode.BOSS and hasattr(self, 'pipes')
+            if has_pipes:
+                self.pipes.update(delta_time)  # 更新管道
                 
-            self.score.tick()  # 更新得分
-            self.player.tick()  # 更新玩家
-            self.game_over_message.tick()  # 更新游戏结束信息
+            self.player.update(delta_time)  # 更新玩家
+
+            # 绘制画面
+            self.background.draw()  # 绘制背景
+            self.floor.draw()  # 绘制地面
+            if has_pipes:
+                self.pipes.draw()  # 绘制管道
+            self.score.draw()  # 绘制得分
+            self.player.draw()  # 绘制玩家
+            self.game_over_message.draw()  # 绘制游戏结束信息
 
-            pygame.display.update()  # 刷新显示
+            self.config.present()  # 刷新显示
             await asyncio.sleep(0)  # 等待下一帧
 
     def create_boss(self):
@@ -926,8 +1000,7 @@ class Flappy:
                 
         # 如果是初始Boss，设置更长的准备时间让玩家熟悉
         if self.boss_level == 0:
-            self.boss.preparation_time = 120  # 约4秒，给新玩家更多时间适应
-            self.boss.is_preparing = True
+            self.boss.start_preparation(120)  # 约4秒，给新玩家更多时间适应
     
     def evolve_boss(self):
         """根据得分演化Boss的难度"""
@@ -951,15 +1024,10 @@ class Flappy:
     
     async def next_boss(self):
         """显示Boss转场动画并创建下一个Boss"""
-        # 清理旧Boss的子弹等资源
-        if self.boss:
-            self.boss.bullets.clear()
+        self.begin_boss_transition()
         
         # 创建动画字体 - 使用Arial或系统默认字体
-        try:
-            font = pygame.font.SysFont('Arial', 36)
-        except:
-            font = pygame.font.Font(None, 36)
+        font = get_font('Arial', 36)
         
         # 计算有效的Boss等级
         effective_level = self.boss_level % 4
@@ -981,52 +1049,84 @@ class Flappy:
         
         # 添加循环次数信息
         if cycle_count > 0:
-            text = font.render(f"{boss_name} Lv.{cycle_count+1} Appears!", True, color)
+            text = render_text(font, f"{boss_name} Lv.{cycle_count+1} Appears!", color)
         else:
-            text = font.render(f"{boss_name} Appears!", True, color)
+            text = render_text(font, f"{boss_name} Appears!", color)
         
         rect = text.get_rect(center=(self.config.window.width//2, self.config.window.height//2))
         
-        # 确保玩家不会掉落 - 重置位置到中心
-        self.player.y = self.config.window.height // 2 - self.player.h // 2
-        self.player.vel_y = 0  # 重置速度，防止继续掉落
-        
         # 显示过渡动画
-        for i in range(60):  # 约2秒
-            # 绘制游戏元素
-            self.background.tick()
-            self.floor.tick()
-            
-            # 确保玩家留在屏幕中心
-            self.player.y = self.config.window.height // 2 - self.player.h // 2
-            self.player.tick()
+        for i in range(BOSS_TRANSITION_FRAMES):
+            self.update_boss_transition()
+
+            # 绘制游戏元素，半透明遮罩覆盖全屏，每帧整屏重绘
+            self.config.dirty_rects.invalidate()
+            self.background.draw()
+            self.floor.draw()
+            self.player.draw()
             
             # 添加半透明背景
-            overlay = pygame.Surface((self.config.window.width, self.config.window.height), pygame.SRCALPHA)
+            overlay = create_surface((self.config.window.width, self.config.window.height))
             overlay.fill((0, 0, 0, 128))
-            self.config.screen.blit(overlay, (0, 0))
+            self.config.blit(overlay, (0, 0))
             
             # 绘制文本
-            self.config.screen.blit(text, rect)
+            self.config.blit(text, rect)
             
-            pygame.display.update()
+            self.config.present()
             await asyncio.sleep(0.03)
         
+        self.end_boss_transition()
+
+    def skip_boss_transition(self):
+        """
+        不显示动画地完成Boss转场（无界面模式），实体的更新与显示动画时相同
+        """
+        self.begin_boss_transition()
+        for _ in range(BOSS_TRANSITION_FRAMES):
+            self.update_boss_transition()
+        self.end_boss_transition()
+
+    def begin_boss_transition(self):
+        """
+        开始Boss转场：清理旧Boss的子弹，把玩家移到屏幕中心
+        """
+        # 清理旧Boss的子弹等资源
+        if self.boss:
+            self.boss.bullets.clear()
+        
+        # 确保玩家不会掉落 - 重置位置到中心
+        self.player.y = self.config.window.height // 2 - self.player.h // 2
+        self.player.vel_y = 0  # 重置速度，防止继续掉落
+
+    def update_boss_transition(self):
+        """
+        更新转场动画中的一帧：地面继续滚动，玩家留在屏幕中心
+        """
+        delta_time = self.config.timestep.step_ms
+        self.floor.update(delta_time)
+        
+        # 确保玩家留在屏幕中心
+        self.player.y = self.config.window.height // 2 - self.player.h // 2
+        self.player.update(delta_time)
+
+    def end_boss_transition(self):
+        """
+        结束Boss转场：创建下一个Boss，恢复玩家的部分弹药
+        """
         # 创建新Boss
         self.create_boss()
         
         # 为不同类型的Boss设置不同的准备时间
+        effective_level = self.boss_level % 4
         if effective_level == 0:  # 普通Boss
-            self.boss.preparation_time = 60  # 约2秒
+            self.boss.start_preparation(60)  # 约2秒
         elif effective_level == 1:  # 速度Boss
-            self.boss.preparation_time = 90  # 约3秒 (速度快，给玩家更多准备时间)
+            self.boss.start_preparation(90)  # 约3秒 (速度快，给玩家更多准备时间)
         elif effective_level == 2:  # 分裂Boss
-            self.boss.preparation_time = 75  # 约2.5秒
+            self.boss.start_preparation(75)  # 约2.5秒
         elif effective_level == 3:  # 坦克Boss
-            self.boss.preparation_time = 45  # 约1.5秒 (移动慢，准备时间短)
-            
-        # 确保准备阶段标志被重置
-        self.boss.is_preparing = True
+            self.boss.start_preparation(45)  # 约1.5秒 (移动慢，准备时间短)
         
         # 重置玩家状态
         self.player.bullets.clear()  # 清除玩家所有未命中的子弹
@@ -1057,40 +1157,65 @@ class Flappy:
         """
         在金币模式下显示金币计数器
         """
+        # 位置放在屏幕下方，只有金币数量变化时才重新渲染
+        bg_pos = (self.config.window.width // 2 - 60, self.floor.y - 50)
+        self.coin_counter_widget.draw(self.config, self.collected_coins, bg_pos)
+
+    def build_coin_counter(self, collected_coins):
+        """
+        渲染金币计数器
+        """
         # 创建一个半透明的背景
-        counter_bg = pygame.Surface((120, 40), pygame.SRCALPHA)
+        counter_bg = create_surface((120, 40))
         counter_bg.fill((0, 0, 0, 150))  # 半透明黑色
         
-        # 位置放在屏幕下方
-        bg_pos = (self.config.window.width // 2 - 60, self.floor.y - 50)
-        self.config.screen.blit(counter_bg, bg_pos)
-        
         # 绘制金币图标
-        coin_icon = pygame.Surface((30, 30), pygame.SRCALPHA)
+        coin_icon = create_surface((30, 30))
         pygame.draw.circle(coin_icon, (255, 215, 0), (15, 15), 15)  # 金色圆形
         pygame.draw.circle(coin_icon, (255, 235, 100), (15, 15), 10)  # 浅金色内圈
         
         # 添加 "$" 符号
-        try:
-            coin_font = pygame.font.SysFont("Arial", 16, bold=True)
-        except:
-            coin_font = pygame.font.Font(None, 16)
+        coin_font = get_font("Arial", 16, bold=True)
         coin_symbol = coin_font.render("$", True, (100, 80, 0))
         symbol_rect = coin_symbol.get_rect(center=(15, 15))
         coin_icon.blit(coin_symbol, symbol_rect)
         
         # 绘制金币图标
-        self.config.screen.blit(coin_icon, (bg_pos[0] + 10, bg_pos[1] + 5))
+        counter_bg.blit(coin_icon, (10, 5))
         
         # 绘制收集的金币数量
-        try:
-            counter_font = get_font('SimHei', 18)
-        except:
-            counter_font = pygame.font.SysFont('Arial', 18)
+        counter_font = get_font('SimHei', 18)
+        
+        counter_text = render_text(counter_font, f"x {collected_coins}", (255, 215, 0))
+        counter_bg.blit(counter_text, (45, 20))
+        return counter_bg
+
+    def build_timer(self, seconds_left):
+        """
+        渲染限时模式的计时器
+        """
+        # 半透明的计时器背景，中文字体显示剩余时间
+        time_font = get_font('SimHei', 24)
+        time_text = render_text(time_font, f"时间: {seconds_left}秒", (255, 255, 255))
+        return text_panel((100, 40), (0, 0, 0, 180), time_text)
+
+    def build_time_warning(self, _):
+        """
+        渲染时间即将结束的警告
+        """
+        # 半透明红色背景
+        time_font = get_font('SimHei', 24)
+        warning_text = render_text(time_font, "时间即将结束！", (255, 255, 255))
+        return text_panel((200, 40), (255, 0, 0, 150), warning_text)
+
+    def build_coin_tip(self, _):
+        """
+        渲染金币模式的提示
+        """
+        coin_tip_font = get_font('SimHei', 16)  # 中文字体
         
-        counter_text = counter_font.render(f"x {self.collected_coins}", True, (255, 215, 0))
-        text_pos = (bg_pos[0] + 45, bg_pos[1] + 20)
-        self.config.screen.blit(counter_text, text_pos)
+        coin_tip_text = render_text(coin_tip_font, "收集金币以获得更高分数!", (255, 215, 0))
+        return text_panel((180, 40), (0, 0, 0, 150), coin_tip_text)
 
     def render_boss_status(self):
         """绘制Boss状态栏，显示Boss血量和关卡信息 - 已废弃，现在直接显示在Boss头顶"""
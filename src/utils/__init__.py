@@ -1,27 +1,37 @@
+from .dirty_rects import DirtyRectTracker
+from .display import SCALE_MODES, Display, parse_size
+from .fonts import FontRegistry, font_registry
 from .game_config import GameConfig
+from .hud import HudWidget, text_panel
 from .images import Images
 from .sounds import Sounds
-from .utils import clamp, get_hit_mask, pixel_collision
+from .spatial_grid import SpatialGrid
+from .surfaces import alpha_template, audit_surface, create_surface, is_display_format, to_display_format
+from .lru_cache import LRUCache
+from .render_batch import RenderBatch
+from .replay import (
+    INPUT_FLAP,
+    INPUT_SHOOT,
+    INPUT_TEST_1,
+    INPUT_WEAPON_1,
+    INPUT_WEAPON_NEXT,
+    INPUT_WEAPON_PREV,
+    InputLog,
+)
+from .rng import RandomStreams
+from .utils import (
+    batch_collision,
+    build_hit_mask,
+    clamp,
+    get_hit_mask,
+    get_swept_mask,
+    hit_mask_cache,
+    pixel_collision,
+)
+from .text_cache import build_text, render_text, text_cache
+from .timestep import FixedTimestep
 from .window import Window
 
-# 添加字体助手函数
-def get_font(name='SimHei', size=12, fallback_name=None):
-    """获取指定名称和大小的字体，如果失败则使用后备字体"""
-    import pygame
-    try:
-        return pygame.font.SysFont(name, size)
-    except:
-        try:
-            if fallback_name:
-                return pygame.font.SysFont(fallback_name, size) 
-            else:
-                # 尝试常见中文字体
-                for font_name in ['Microsoft YaHei', 'SimHei', 'NSimSun', 'SimSun', 'STHeiti']:
-                    try:
-                        return pygame.font.SysFont(font_name, size)
-                    except:
-                        pass
-                # 都失败了就用系统默认
-                return pygame.font.Font(None, size)
-        except:
-            return pygame.font.Font(None, size)
+def get_font(name='SimHei', size=12, fallback_name=None, bold=False):
+    """获取指定名称和大小的字体，如果找不到则使用后备字体；字体只查找和创建一次"""
+    return font_registry.get(name, size, bold, fallback_name)
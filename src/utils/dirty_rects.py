@@ -0,0 +1,65 @@
+from typing import Callable, List, Optional
+
+import pygame
+
+
+class DirtyRectTracker:
+    """
+    脏矩形跟踪：记录每帧绘制过的屏幕区域，只擦除和刷新这些区域
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        """
+        初始化跟踪器
+        :param enabled: 是否启用脏矩形模式（关闭时每帧整屏刷新）
+        """
+        self.enabled = enabled  # 是否启用脏矩形模式
+        self.previous: List[pygame.Rect] = []  # 上一帧绘制的区域，本帧需要用背景擦除
+        self.current: List[pygame.Rect] = []  # 本帧绘制的区域
+        self.full_redraw = True  # 下一帧是否需要整屏重绘
+
+    def toggle(self) -> None:
+        """
+        切换脏矩形模式
+        """
+        self.enabled = not self.enabled
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        要求下一帧整屏重绘（切换模式、全屏遮罩等情况）
+        """
+        self.full_redraw = True
+
+    def mark(self, rect: Optional[pygame.Rect]) -> Optional[pygame.Rect]:
+        """
+        记录本帧绘制过的区域，返回传入的矩形
+        """
+        if self.enabled and rect:
+            self.current.append(pygame.Rect(rect))
+        return rect
+
+    def restore_background(self, screen: pygame.Surface, background: pygame.Surface) -> None:
+        """
+        绘制背景：整屏重绘时铺满屏幕，否则只擦除上一帧绘制过的区域
+        （以及本帧在背景之前就已绘制的区域，和整屏重绘时被背景覆盖的效果一致）
+        """
+        if not self.enabled or self.full_redraw:
+            screen.blit(background, (0, 0))
+            return
+        for rect in self.previous + self.current:
+            screen.blit(background, rect, rect)
+
+    def present(self, update: Optional[Callable] = None) -> None:
+        """
+        刷新显示：整屏刷新，或只刷新上一帧和本帧绘制过的区域
+        :param update: 刷新函数，不传参数表示整屏刷新，默认pygame.display.update
+        """
+        update = update or pygame.display.update
+        if not self.enabled or self.full_redraw:
+            update()
+            self.full_redraw = False
+        else:
+            update(self.previous + self.current)
+        self.previous = self.current
+        self.current = []
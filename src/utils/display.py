@@ -0,0 +1,94 @@
+import warnings
+from typing import List, Optional, Tuple
+
+import pygame
+
+from .window import Window
+
+SCALE_MODES = ("integer", "smooth", "scaled")  # 支持的缩放方式
+
+
+def parse_size(text: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    解析"宽x高"格式的窗口大小（如"1280x720"），空值返回None
+    """
+    if not text:
+        return None
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+class Display:
+    """
+    显示输出：游戏始终绘制到固定逻辑分辨率的画面上，
+    每帧整体缩放一次到实际窗口大小，实体不需要各自缩放
+    """
+
+    def __init__(self, window: Window, size: Optional[Tuple[int, int]] = None, mode: str = "integer") -> None:
+        """
+        创建窗口
+        :param window: 逻辑分辨率（游戏内的坐标系）
+        :param size: 实际窗口大小，None表示与逻辑分辨率相同（不缩放）
+        :param mode: 缩放方式：integer按整数倍放大并留黑边，smooth按比例平滑缩放，
+                     scaled使用pygame.SCALED由SDL负责缩放
+        """
+        if mode not in SCALE_MODES:
+            raise ValueError(f"未知的缩放方式 {mode!r}，可选：{', '.join(SCALE_MODES)}")
+        self.logical_size = (window.width, window.height)  # 逻辑分辨率
+        self.mode = mode  # 缩放方式
+        self.target: Optional[pygame.Surface] = None  # 窗口中显示游戏画面的区域
+
+        if mode == "scaled":
+            # SDL按窗口大小自动缩放，游戏直接绘制到逻辑分辨率的屏幕上
+            try:
+                self.surface = pygame.display.set_mode(self.logical_size, pygame.SCALED)
+            except pygame.error as e:
+                # 没有可用的渲染器（如dummy驱动）时不缩放
+                warnings.warn(f"无法使用pygame.SCALED（{e}），改为不缩放显示")
+                self.surface = pygame.display.set_mode(self.logical_size)
+            self.screen = self.surface
+        elif size is None or tuple(size) == self.logical_size:
+            # 不需要缩放，直接绘制到窗口上
+            self.surface = pygame.display.set_mode(self.logical_size)
+            self.screen = self.surface
+        else:
+            self.surface = pygame.display.set_mode(size)
+            self.surface.fill((0, 0, 0))  # 黑边
+            # 离屏画面，与窗口同一像素格式，缩放时不需要转换
+            self.screen = pygame.Surface(self.logical_size, 0, self.surface)
+            self.target = self.surface.subsurface(self.fit_rect(size))
+
+    @property
+    def scaling(self) -> bool:
+        """是否需要每帧把离屏画面缩放到窗口"""
+        return self.target is not None
+
+    def fit_rect(self, size: Tuple[int, int]) -> pygame.Rect:
+        """
+        计算游戏画面在窗口中的位置：保持宽高比并居中，
+        integer模式下按整数倍放大（窗口比逻辑分辨率还小时退回到按比例缩小）
+        """
+        width, height = self.logical_size
+        scale = min(size[0] / width, size[1] / height)
+        if self.mode == "integer" and scale >= 1:
+            scale = int(scale)
+        rect = pygame.Rect(0, 0, int(width * scale), int(height * scale))
+        rect.center = (size[0] // 2, size[1] // 2)
+        return rect
+
+    def update(self, rects: Optional[List[pygame.Rect]] = None) -> None:
+        """
+        刷新显示：需要缩放时把整个离屏画面缩放一次后整屏刷新，
+        否则刷新指定区域（None表示整屏）
+        """
+        if self.target is None:
+            if rects is None:
+                pygame.display.update()
+            else:
+                pygame.display.update(rects)
+            return
+        if self.mode == "smooth" or self.target.get_width() < self.logical_size[0]:
+            pygame.transform.smoothscale(self.screen, self.target.get_size(), self.target)
+        else:
+            pygame.transform.scale(self.screen, self.target.get_size(), self.target)
+        pygame.display.update()
@@ -0,0 +1,75 @@
+import warnings
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import pygame
+
+# 找不到指定字体时依次尝试的常见中文字体
+FALLBACK_FONT_NAMES = ('Microsoft YaHei', 'SimHei', 'NSimSun', 'SimSun', 'STHeiti')
+
+FontKey = Tuple[str, int, bool, Optional[str]]  # (字体名称, 大小, 是否粗体, 后备字体名称)
+
+
+class FontRegistry:
+    """
+    字体注册表：每个字体名称只在系统字体中查找一次，每个(名称, 大小)只创建一次字体对象
+    """
+
+    def __init__(self) -> None:
+        self.paths: Dict[Tuple[str, Optional[str]], Optional[str]] = {}  # 字体名称 -> 字体文件路径（None为默认字体）
+        self.fonts: Dict[FontKey, pygame.font.Font] = {}  # 已创建的字体对象
+        self.warned: Set[str] = set()  # 已经提示过找不到的字体名称
+
+    def resolve(self, name: str, fallback_name: Optional[str] = None) -> Optional[str]:
+        """
+        查找字体文件路径，找不到时尝试后备字体，都找不到则使用pygame默认字体（返回None）
+        结果会被记住，同一个名称不会重复查找
+        """
+        key = (name, fallback_name)
+        if key in self.paths:
+            return self.paths[key]
+
+        path = pygame.font.match_font(name)
+        if path is None:
+            candidates = [fallback_name] if fallback_name else FALLBACK_FONT_NAMES
+            for candidate in candidates:
+                path = pygame.font.match_font(candidate)
+                if path is not None:
+                    break
+        if path is None and name not in self.warned:
+            # 字体名称有误或系统没有安装，只提示一次
+            self.warned.add(name)
+            warnings.warn(f"找不到字体 {name!r}，使用默认字体")
+
+        self.paths[key] = path
+        return path
+
+    def get(self, name: str, size: int, bold: bool = False,
+            fallback_name: Optional[str] = None) -> pygame.font.Font:
+        """
+        获取字体对象，相同参数总是返回同一个对象
+        """
+        key = (name, size, bold, fallback_name)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(self.resolve(name, fallback_name), size)
+            font.set_bold(bold)
+            self.fonts[key] = font
+        return font
+
+    def preload(self, specs: Iterable[tuple]) -> None:
+        """
+        预先创建字体，避免游戏中第一次用到时才去查找系统字体
+        :param specs: (名称, 大小) 或 (名称, 大小, 是否粗体) 列表
+        """
+        for spec in specs:
+            self.get(*spec)
+
+    def clear(self) -> None:
+        """
+        清空已创建的字体（pygame.font重新初始化后需要调用）
+        """
+        self.paths.clear()
+        self.fonts.clear()
+
+
+font_registry = FontRegistry()  # 全局字体注册表
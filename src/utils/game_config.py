@@ -1,8 +1,16 @@
 import os
+from contextlib import contextmanager
+from typing import Optional
 
 import pygame
 
+from .dirty_rects import DirtyRectTracker
+from .display import Display
 from .images import Images
+from .render_batch import RenderBatch
+from .rng import RandomStreams
+from .surfaces import audit_surface
+from .timestep import FixedTimestep
 from .sounds import Sounds
 from .window import Window
 
@@ -19,6 +27,9 @@ class GameConfig:
         window: Window,
         images: Images,
         sounds: Sounds,
+        display: Optional[Display] = None,
+        headless: bool = False,
+        rng: Optional[RandomStreams] = None,
     ) -> None:
         """
         初始化游戏配置
@@ -28,6 +39,9 @@ class GameConfig:
         :param window: 窗口配置
         :param images: 图像配置
         :param sounds: 声音配置
+        :param display: 显示输出，负责把逻辑分辨率的画面缩放到窗口，None表示直接刷新屏幕
+        :param headless: 无界面模式：不刷新显示、不限制帧率、不阻塞等待，用于批量模拟
+        :param rng: 各子系统的随机数流，None表示使用随机种子
         """
         self.screen = screen  # 游戏屏幕
         self.clock = clock  # 游戏时钟
@@ -35,10 +49,94 @@ class GameConfig:
         self.window = window  # 窗口配置
         self.images = images  # 图像配置
         self.sounds = sounds  # 声音配置
+        self.display = display  # 显示输出
+        self.headless = headless  # 无界面模式
+        self.rng = rng or RandomStreams()  # 各子系统的随机数流
         self.debug = os.environ.get("DEBUG", False)  # 调试模式
+        # 脏矩形渲染，可通过环境变量DIRTY_RECTS=1默认开启，游戏中按F3切换
+        self.dirty_rects = DirtyRectTracker(os.environ.get("DIRTY_RECTS") == "1")
+        self.render_batch: Optional[RenderBatch] = None  # 正在收集的渲染批次
+        # 图像格式检查，环境变量SURFACE_AUDIT=1时提示绘制到屏幕的未转换图像
+        self.surface_audit = os.environ.get("SURFACE_AUDIT") == "1"
+        # 固定步长模拟，每秒模拟fps步：实体的速度和帧计数都按每步设定，频率不可单独配置，
+        # 否则会改变游戏速度而不是模拟精度；一帧内最多追赶的步数可通过环境变量MAX_SIM_STEPS配置
+        self.timestep = FixedTimestep(fps, int(os.environ.get("MAX_SIM_STEPS", 5)))
+
+    def blit(self, surface: pygame.Surface, dest, area=None) -> Optional[pygame.Rect]:
+        """
+        在屏幕上绘制图像并记录绘制区域
+        :param surface: 要绘制的图像
+        :param dest: 目标位置或矩形
+        :param area: 只绘制图像的一部分
+        :return: 屏幕上被修改的区域；在batch_layer中绘制时返回None
+        """
+        if self.surface_audit:
+            audit_surface(surface)
+        if self.render_batch is not None:
+            if area is None:
+                self.render_batch.add(surface, dest)
+                return None
+            self.render_batch.flush(self.screen, self.dirty_rects)  # 保持绘制顺序
+        return self.dirty_rects.mark(self.screen.blit(surface, dest, area))
+
+    @contextmanager
+    def batch_layer(self):
+        """
+        渲染批次：其中的config.blit先收集起来，退出时用一次Surface.blits按顺序绘制。
+        只适合全部用blit绘制的一组精灵（管道、金币、子弹、道具、粒子），
+        直接在屏幕上pygame.draw的内容会跑到批次前面
+        """
+        if self.render_batch is not None:  # 已经在批次中，直接并入外层批次
+            yield
+            return
+        self.render_batch = RenderBatch()
+        try:
+            yield
+        finally:
+            batch, self.render_batch = self.render_batch, None
+            batch.flush(self.screen, self.dirty_rects)
+
+    @contextmanager
+    def render_to(self, surface: pygame.Surface):
+        """
+        渲染目标：其中的绘制（config.blit和直接在config.screen上的pygame.draw）
+        改为画到指定图像上，如截图、缩略图；离屏绘制不记录脏矩形
+        """
+        screen, dirty_rects = self.screen, self.dirty_rects
+        self.screen = surface
+        self.dirty_rects = DirtyRectTracker(False)
+        try:
+            yield
+        finally:
+            self.screen, self.dirty_rects = screen, dirty_rects
+
+    def mark_dirty(self, rect: pygame.Rect) -> pygame.Rect:
+        """
+        记录直接绘制（如pygame.draw）修改过的屏幕区域
+        """
+        return self.dirty_rects.mark(rect)
+
+    def present(self) -> None:
+        """
+        刷新显示：需要缩放时整体缩放一次后整屏刷新，否则按脏矩形刷新
+        无界面模式下不刷新
+        """
+        if self.headless:
+            return
+        self.dirty_rects.present(self.display.update if self.display else None)
 
     def tick(self) -> None:
         """
-        更新游戏时钟
+        更新游戏时钟，无界面模式下不限制帧率
         """
+        if self.headless:
+            return
         self.clock.tick(self.fps)  # 控制游戏帧率
+
+    def delay(self, milliseconds: int) -> None:
+        """
+        阻塞等待一段时间（如连续播放音效的间隔），无界面模式下直接返回
+        """
+        if self.headless:
+            return
+        pygame.time.delay(milliseconds)
@@ -0,0 +1,73 @@
+from typing import Any, Callable, Hashable, Optional
+
+import pygame
+
+from .surfaces import create_surface
+
+_UNSET = object()  # 控件尚未渲染过的标记
+
+
+class HudWidget:
+    """
+    HUD控件：缓存渲染好的图像，只有显示的内容变化时才重新渲染，
+    内容不变的帧只需一次blit
+    """
+
+    def __init__(self, render: Callable[[Any], pygame.Surface]) -> None:
+        """
+        初始化控件
+        :param render: 渲染函数，根据显示内容（键）生成控件图像
+        """
+        self.render = render  # 渲染函数
+        self.key: Hashable = _UNSET  # 当前图像对应的显示内容
+        self.surface: Optional[pygame.Surface] = None  # 缓存的控件图像
+        self.renders = 0  # 重新渲染次数
+
+    def get(self, key: Hashable) -> pygame.Surface:
+        """
+        获取显示内容对应的图像，内容变化时才重新渲染
+        :param key: 显示内容，需要可哈希且能比较相等（如剩余整秒数、弹药数）
+        """
+        if self.surface is None or key != self.key:
+            self.surface = self.render(key)
+            self.key = key
+            self.renders += 1
+        return self.surface
+
+    def draw(self, config, key: Hashable, dest=None, **anchor) -> pygame.Rect:
+        """
+        在屏幕上绘制控件
+        :param config: 游戏配置
+        :param key: 显示内容
+        :param dest: 绘制位置
+        :param anchor: 也可以用get_rect的参数定位，如center=(x, y)
+        :return: 屏幕上被修改的区域
+        """
+        surface = self.get(key)
+        if anchor:
+            dest = surface.get_rect(**anchor)
+        return config.blit(surface, dest)
+
+    def invalidate(self) -> None:
+        """
+        丢弃缓存的图像，下次绘制时重新渲染
+        """
+        self.surface = None
+        self.key = _UNSET
+
+
+def text_panel(size, color, text: pygame.Surface) -> pygame.Surface:
+    """
+    创建半透明背景上居中显示文字的面板，文字比背景宽时面板随之扩大
+    :param size: 背景大小
+    :param color: 背景颜色（可带alpha）
+    :param text: 已渲染的文字
+    """
+    width = max(size[0], text.get_width())
+    height = max(size[1], text.get_height())
+    surface = create_surface((width, height))
+    bg_rect = pygame.Rect((0, 0), size)
+    bg_rect.center = (width // 2, height // 2)
+    surface.fill(color, bg_rect)
+    surface.blit(text, text.get_rect(center=(width // 2, height // 2)))
+    return surface
@@ -1,5 +1,5 @@
 import random
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import pygame
 
@@ -15,10 +15,12 @@ class Images:
     player: Tuple[pygame.Surface]  # 玩家图像
     pipe: Tuple[pygame.Surface]  # 管道图像
 
-    def __init__(self) -> None:
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
         """
         初始化图像资源
+        :param rng: 随机选择外观用的随机数流，None表示使用随机种子
         """
+        self.rng = rng or random.Random()  # 随机选择外观用的随机数流
         self.numbers = list(
             (
                 pygame.image.load(f"assets/sprites/{num}.png").convert_alpha()  # 加载数字图像
@@ -43,11 +45,11 @@ class Images:
         随机选择背景、玩家和管道图像
         """
         # 随机选择背景图像
-        rand_bg = random.randint(0, len(BACKGROUNDS) - 1)
+        rand_bg = self.rng.randint(0, len(BACKGROUNDS) - 1)
         # 随机选择玩家图像
-        rand_player = random.randint(0, len(PLAYERS) - 1)
+        rand_player = self.rng.randint(0, len(PLAYERS) - 1)
         # 随机选择管道图像
-        rand_pipe = random.randint(0, len(PIPES) - 1)
+        rand_pipe = self.rng.randint(0, len(PIPES) - 1)
 
         self.background = pygame.image.load(BACKGROUNDS[rand_bg]).convert()  # 加载随机背景图像
         self.player = (
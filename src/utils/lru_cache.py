@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class LRUCache:
+    """
+    按字节预算淘汰的LRU缓存，记录命中、未命中和淘汰次数
+    """
+
+    def __init__(self, max_bytes: int, size_of: Callable[[Any], int]) -> None:
+        """
+        初始化缓存
+        :param max_bytes: 缓存允许占用的最大字节数
+        :param size_of: 计算缓存值占用字节数的函数
+        """
+        self.max_bytes = max_bytes  # 字节预算
+        self.size_of = size_of  # 计算条目大小的函数
+        self.entries: "OrderedDict[Hashable, Any]" = OrderedDict()  # 按使用顺序排列的条目
+        self.sizes: Dict[Hashable, int] = {}  # 每个条目的字节数
+        self.bytes = 0  # 当前占用字节数
+        self.hits = 0  # 命中次数
+        self.misses = 0  # 未命中次数
+        self.evictions = 0  # 淘汰次数
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        获取缓存值，不存在时调用factory生成并放入缓存
+        """
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)  # 标记为最近使用
+            return self.entries[key]
+
+        self.misses += 1
+        value = factory()
+        size = self.size_of(value)
+        self.entries[key] = value
+        self.sizes[key] = size
+        self.bytes += size
+        self.evict()
+        return value
+
+    def evict(self) -> None:
+        """
+        淘汰最久未使用的条目，直到占用不超过预算（至少保留最新的一个条目）
+        """
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            key, _ = self.entries.popitem(last=False)
+            self.bytes -= self.sizes.pop(key)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        清空缓存（统计数据保留）
+        """
+        self.entries.clear()
+        self.sizes.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        返回缓存的运行时统计
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
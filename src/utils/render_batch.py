@@ -0,0 +1,40 @@
+from typing import List, Tuple
+
+import pygame
+
+from .dirty_rects import DirtyRectTracker
+
+
+class RenderBatch:
+    """
+    渲染批次：收集同一层的(图像, 位置)，最后一次性用Surface.blits提交，
+    省去每个精灵一次Python调用的开销
+    """
+
+    def __init__(self) -> None:
+        self.items: List[Tuple[pygame.Surface, object]] = []  # 待绘制的(图像, 位置)
+
+    def add(self, surface: pygame.Surface, dest) -> None:
+        """
+        加入一次绘制
+        :param surface: 要绘制的图像
+        :param dest: 目标位置（左上角坐标或矩形）
+        """
+        self.items.append((surface, dest))
+
+    def flush(self, screen: pygame.Surface, dirty_rects: DirtyRectTracker) -> None:
+        """
+        按加入顺序把收集的图像绘制到屏幕上并清空批次
+        :param screen: 目标屏幕
+        :param dirty_rects: 脏矩形跟踪器，启用时记录每次绘制的区域
+        """
+        if not self.items:
+            return
+        if dirty_rects.enabled:
+            for rect in screen.blits(self.items):
+                dirty_rects.mark(rect)
+        elif hasattr(screen, "fblits"):
+            screen.fblits(self.items)  # pygame-ce提供的更快版本，不返回绘制区域
+        else:
+            screen.blits(self.items, doreturn=False)
+        self.items.clear()
@@ -0,0 +1,150 @@
+from typing import Iterator, List, Tuple
+
+# 每步的输入位：同一步内同一种输入最多生效一次
+INPUT_FLAP = 1 << 0        # 拍打（空格、上箭头、鼠标、触摸）
+INPUT_SHOOT = 1 << 1       # 射击（Boss模式下拍打同时射击）
+INPUT_WEAPON_PREV = 1 << 2  # Q键：上一个武器
+INPUT_WEAPON_NEXT = 1 << 3  # E键：下一个武器
+INPUT_WEAPON_1 = 1 << 4    # 数字键1-4直接选择武器，依次占用4位
+INPUT_TEST_1 = 1 << 8      # 数字键5-8生成测试道具，依次占用4位
+
+REPLAY_MAGIC = b"FBRP"  # 文件标识
+REPLAY_VERSION = 2  # 格式版本（2：加入模拟频率）
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    """
+    写入无符号变长整数：每字节7位，最高位表示后面还有字节
+    """
+    if value < 0:
+        raise ValueError(f"变长整数不能为负数：{value}")
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """
+    读取无符号变长整数
+    :return: (数值, 下一个字节的位置)
+    """
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("回放数据不完整")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class InputLog:
+    """
+    一局游戏的输入回放：根种子、游戏模式、模拟频率和每个模拟步的输入位。
+    实体的速度和计时都按每步设定，相同种子、模式、频率和每步输入的游戏进程相同。
+
+    二进制格式：REPLAY_MAGIC、版本（1字节）、种子（zigzag变长整数）、模式（1字节）、
+    每秒模拟步数（变长整数），之后是若干(间隔, 输入位)变长整数对：间隔为距上一个有输入的步跳过的无输入步数，
+    最后一对的输入位为0，间隔为最后一个有输入的步之后的剩余步数。
+    连续无输入的步只占一个间隔数，一分钟的游戏通常只有几百字节
+    """
+
+    def __init__(self, seed: int, mode: int, rate: int) -> None:
+        """
+        :param seed: 本局的随机数根种子
+        :param mode: 游戏模式的序号（GameMode中的顺序）
+        :param rate: 每秒模拟的步数，回放时按这个频率模拟
+        """
+        self.seed = seed  # 随机数根种子
+        self.mode = mode  # 游戏模式序号
+        self.rate = rate  # 每秒模拟步数
+        self.events: List[Tuple[int, int]] = []  # (步序号, 输入位)，只记录有输入的步
+        self.steps = 0  # 总步数
+
+    def record(self, bits: int) -> None:
+        """
+        记录一步的输入（没有输入时传0），每个模拟步调用一次
+        """
+        if bits:
+            self.events.append((self.steps, bits))
+        self.steps += 1
+
+    def inputs(self) -> Iterator[int]:
+        """
+        按步依次产生输入位，记录结束后一直产生0
+        """
+        step = 0
+        for index, bits in self.events:
+            while step < index:
+                yield 0
+                step += 1
+            yield bits
+            step += 1
+        while True:
+            yield 0
+
+    def to_bytes(self) -> bytes:
+        """
+        编码为紧凑的二进制格式
+        """
+        out = bytearray(REPLAY_MAGIC)
+        out.append(REPLAY_VERSION)
+        write_varint(out, self.seed * 2 if self.seed >= 0 else -self.seed * 2 - 1)  # zigzag
+        out.append(self.mode)
+        write_varint(out, self.rate)
+        next_step = 0
+        for index, bits in self.events:
+            write_varint(out, index - next_step)
+            write_varint(out, bits)
+            next_step = index + 1
+        write_varint(out, self.steps - next_step)
+        write_varint(out, 0)  # 结束标记
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, mode_count: int) -> "InputLog":
+        """
+        从二进制数据解码，格式不对时抛出ValueError
+        :param mode_count: 游戏模式的数量，超出范围的模式序号视为格式错误
+        """
+        if data[:len(REPLAY_MAGIC)] != REPLAY_MAGIC:
+            raise ValueError("不是回放文件")
+        pos = len(REPLAY_MAGIC)
+        if len(data) <= pos or data[pos] != REPLAY_VERSION:
+            raise ValueError("不支持的回放版本")
+        zigzag, pos = read_varint(data, pos + 1)
+        if pos >= len(data):
+            raise ValueError("回放数据不完整")
+        mode = data[pos]
+        if mode >= mode_count:
+            raise ValueError(f"未知的游戏模式序号：{mode}")
+        rate, pos = read_varint(data, pos + 1)
+        if rate <= 0:
+            raise ValueError(f"无效的模拟频率：{rate}")
+        log = cls(zigzag >> 1 if zigzag % 2 == 0 else -(zigzag + 1 >> 1), mode, rate)
+        step = 0
+        while True:
+            gap, pos = read_varint(data, pos)
+            bits, pos = read_varint(data, pos)
+            step += gap
+            if not bits:
+                break
+            log.events.append((step, bits))
+            step += 1
+        log.steps = step
+        return log
+
+    def save(self, path: str) -> None:
+        """写入回放文件"""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str, mode_count: int) -> "InputLog":
+        """读取回放文件"""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read(), mode_count)
@@ -0,0 +1,50 @@
+import random
+from typing import Dict, Optional
+
+
+class RandomStreams:
+    """
+    按子系统划分的随机数流：每个子系统使用独立的random.Random，种子由根种子和流名称派生，
+    某个子系统多取或少取随机数不会影响其他子系统。
+    影响游戏进程的随机（管道、道具、金币、Boss移动）使用gameplay流，
+    只影响画面的随机（外观、爆炸粒子、伤害数字位置）使用cosmetic流，
+    改动画面效果不会改变同一种子下的游戏进程
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """
+        :param seed: 根种子，None表示随机选择一个（仍可通过seed属性取得，用于复现）
+        """
+        self.seed = random.randrange(1 << 32) if seed is None else seed  # 根种子
+        self.streams: Dict[str, random.Random] = {}  # 流的完整名称 -> 随机数生成器
+
+    def gameplay(self, name: str) -> random.Random:
+        """
+        获取影响游戏进程的随机数流
+        :param name: 子系统名称，如"pipes"、"powerups"
+        """
+        return self.get(f"gameplay:{name}")
+
+    def cosmetic(self, name: str) -> random.Random:
+        """
+        获取只影响画面的随机数流
+        :param name: 子系统名称，如"images"、"explosions"
+        """
+        return self.get(f"cosmetic:{name}")
+
+    def get(self, key: str) -> random.Random:
+        """
+        获取指定名称的随机数流，第一次使用时按根种子创建
+        """
+        stream = self.streams.get(key)
+        if stream is None:
+            stream = self.streams[key] = random.Random(f"{self.seed}:{key}")
+        return stream
+
+    def reseed(self, seed: int) -> None:
+        """
+        更换根种子，已创建的流原地重新播种（实体持有的引用继续有效）
+        """
+        self.seed = seed
+        for key, stream in self.streams.items():
+            stream.seed(f"{seed}:{key}")
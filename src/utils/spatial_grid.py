@@ -0,0 +1,63 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+
+class SpatialGrid:
+    """
+    均匀网格碰撞粗检测：每帧重建一次，只对落在相同格子里的实体做精确检测
+    """
+
+    def __init__(self, cell_size: int = 64) -> None:
+        """
+        初始化网格
+        :param cell_size: 格子边长（像素）
+        """
+        self.cell_size = cell_size  # 格子边长
+        self.cells: Dict[Tuple[str, int, int], List[Tuple[int, object]]] = {}  # (分组, 列, 行) -> 实体列表
+        self.count = 0  # 已插入的实体数量，用作插入顺序
+
+    def clear(self) -> None:
+        """
+        清空网格
+        """
+        self.cells.clear()
+        self.count = 0
+
+    def cells_for(self, rect: pygame.Rect) -> Iterable[Tuple[int, int]]:
+        """
+        返回矩形覆盖的所有格子坐标
+        """
+        size = self.cell_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cx, cy
+
+    def insert(self, group: str, entity, rect: Optional[pygame.Rect] = None) -> None:
+        """
+        把实体插入到指定分组
+        :param group: 分组名（如"pipe"、"coin"）
+        :param entity: 实体
+        :param rect: 实体占用的矩形，默认使用entity.collision_rect
+        """
+        order = self.count  # 记录插入顺序，查询结果按此顺序返回
+        self.count += 1
+        for cx, cy in self.cells_for(rect or entity.collision_rect):
+            self.cells.setdefault((group, cx, cy), []).append((order, entity))
+
+    def insert_all(self, group: str, entities: Iterable) -> None:
+        """
+        把一组实体插入到指定分组
+        """
+        for entity in entities:
+            self.insert(group, entity)
+
+    def query(self, group: str, rect: pygame.Rect) -> List:
+        """
+        返回指定分组中与矩形共享格子的实体（去重，按插入顺序）
+        """
+        found = {}
+        for cx, cy in self.cells_for(rect):
+            for order, entity in self.cells.get((group, cx, cy), ()):
+                found[order] = entity
+        return [found[order] for order in sorted(found)]
@@ -0,0 +1,79 @@
+import warnings
+from typing import Optional, Set, Tuple
+
+import pygame
+
+# 显示格式模板：(显示表面, 带alpha通道的模板)，切换显示模式后重新生成
+_alpha_template: Tuple[Optional[pygame.Surface], Optional[pygame.Surface]] = (None, None)
+_audited: Set[tuple] = set()  # 已经提示过的图像格式
+
+
+def alpha_template() -> Optional[pygame.Surface]:
+    """
+    获取与当前显示匹配的带alpha通道的1x1图像，用作创建图像的格式模板
+    还没有设置显示模式时返回None
+    """
+    global _alpha_template
+    display = pygame.display.get_surface()
+    if display is None:
+        return None
+    if _alpha_template[0] is not display:
+        _alpha_template = (display, pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha())
+    return _alpha_template[1]
+
+
+def create_surface(size, alpha: bool = True) -> pygame.Surface:
+    """
+    创建显示格式的图像，绘制到屏幕时不需要再做像素格式转换
+    还没有设置显示模式时（如单独测试实体）退回到普通图像
+    :param size: 图像大小
+    :param alpha: 是否带alpha通道（初始全透明）
+    """
+    display = pygame.display.get_surface()
+    if display is None:
+        return pygame.Surface(size, pygame.SRCALPHA if alpha else 0)
+    if alpha:
+        return pygame.Surface(size, pygame.SRCALPHA, alpha_template())
+    return pygame.Surface(size, 0, display)
+
+
+def to_display_format(surface: pygame.Surface) -> pygame.Surface:
+    """
+    把已有图像转换成显示格式：带alpha通道的用convert_alpha，其余用convert（保留色键）
+    已经是显示格式或还没有设置显示模式时原样返回
+    """
+    if pygame.display.get_surface() is None or is_display_format(surface):
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+def is_display_format(surface: pygame.Surface) -> bool:
+    """
+    判断图像的像素格式是否与显示一致（带alpha通道的与convert_alpha的结果比较）
+    """
+    display = pygame.display.get_surface()
+    if display is None:
+        return True
+    target = alpha_template() if surface.get_flags() & pygame.SRCALPHA else display
+    return (surface.get_bitsize() == target.get_bitsize()
+            and surface.get_masks() == target.get_masks())
+
+
+def audit_surface(surface: pygame.Surface) -> None:
+    """
+    检查绘制到屏幕的图像是否已转换为显示格式，每种格式只提示一次
+    """
+    if is_display_format(surface):
+        return
+    key = (surface.get_bitsize(), surface.get_masks(), surface.get_flags() & pygame.SRCALPHA)
+    if key in _audited:
+        return
+    _audited.add(key)
+    warnings.warn(
+        f"绘制了未转换为显示格式的图像：大小{surface.get_size()}，"
+        f"{surface.get_bitsize()}位，masks={surface.get_masks()}，"
+        f"请用create_surface创建或用to_display_format转换",
+        stacklevel=3,
+    )
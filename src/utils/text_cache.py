@@ -0,0 +1,52 @@
+import os
+from typing import Optional, Sequence
+
+import pygame
+
+from .lru_cache import LRUCache
+from .surfaces import create_surface, to_display_format
+
+
+def surface_nbytes(surface: pygame.Surface) -> int:
+    """
+    估算图像占用的字节数
+    """
+    return surface.get_pitch() * surface.get_height()
+
+
+# 文字渲染缓存：按(字体, 文字, 颜色, 抗锯齿, 透明度)做键，LRU淘汰，预算可通过环境变量配置
+text_cache = LRUCache(
+    max_bytes=int(os.environ.get("TEXT_CACHE_BYTES", 1024 * 1024)),
+    size_of=surface_nbytes,
+)
+
+
+def build_text(font: pygame.font.Font, text: str, color: Sequence[int],
+               antialias: bool = True, alpha: Optional[int] = None) -> pygame.Surface:
+    """
+    渲染文字（不使用缓存），结果转换为显示格式
+    :param alpha: 整体透明度，None表示不透明
+    """
+    surface = font.render(text, antialias, color)
+    if alpha is None:
+        return to_display_format(surface)
+    # 复制到带alpha通道的图像上再设置整体透明度
+    faded = create_surface(surface.get_size())
+    faded.blit(surface, (0, 0))
+    faded.set_alpha(alpha)
+    return faded
+
+
+def render_text(font: pygame.font.Font, text: str, color: Sequence[int],
+                antialias: bool = True, alpha: Optional[int] = None) -> pygame.Surface:
+    """
+    渲染文字并缓存结果，相同的字体、文字、颜色和透明度直接复用已渲染的图像
+    返回的图像是共享的，调用方不能修改它
+    :param font: 字体对象（按对象做键，需要复用同一个字体对象才能命中缓存）
+    :param text: 文字内容
+    :param color: 文字颜色
+    :param antialias: 是否抗锯齿
+    :param alpha: 整体透明度，None表示不透明
+    """
+    key = (font, text, tuple(color), antialias, alpha)
+    return text_cache.get(key, lambda: build_text(font, text, color, antialias, alpha))
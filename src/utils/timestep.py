@@ -0,0 +1,50 @@
+class FixedTimestep:
+    """
+    固定时间步长：累积实际经过的时间，按固定步长推进模拟，
+    游戏速度不再取决于机器的渲染速度；卡顿后一帧内最多追赶max_steps步，
+    多出的时间直接丢弃，避免越追越慢
+    """
+
+    def __init__(self, rate: int = 30, max_steps: int = 5) -> None:
+        """
+        初始化时间步长
+        :param rate: 每秒模拟的步数（实体的速度、计时都按每步设定，默认与30帧一致）
+        :param max_steps: 一帧内最多模拟的步数
+        """
+        self.rate = rate  # 每秒模拟步数
+        self.step_ms = 1000 / rate  # 每步的时长（毫秒）
+        self.max_steps = max_steps  # 一帧内最多模拟的步数
+        self.accumulator = 0.0  # 尚未模拟的时间（毫秒）
+        self.time = 0.0  # 已模拟的总时间（毫秒），计时类逻辑以它为准
+        self.alpha = 1.0  # 绘制插值系数：0为上一步的位置，1为当前位置
+        self.dropped_ms = 0.0  # 因超过追赶上限而丢弃的时间
+
+    def advance(self, elapsed_ms: float) -> int:
+        """
+        加入本帧经过的时间，返回本帧需要模拟的步数，并更新插值系数
+        :param elapsed_ms: 距上一帧经过的时间（毫秒）
+        """
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            # 追不上了：只模拟max_steps步，丢弃多余的时间
+            self.dropped_ms += (steps - self.max_steps) * self.step_ms
+            steps = self.max_steps
+            self.accumulator %= self.step_ms
+        else:
+            self.accumulator -= steps * self.step_ms
+        self.alpha = self.accumulator / self.step_ms
+        return steps
+
+    def step(self) -> None:
+        """
+        推进一步模拟时间
+        """
+        self.time += self.step_ms
+
+    def reset(self) -> None:
+        """
+        清空累积的时间（开始游戏、转场动画之后调用），之后按当前位置绘制
+        """
+        self.accumulator = 0.0
+        self.alpha = 1.0
@@ -1,9 +1,12 @@
-from functools import wraps
-from typing import List
+import hashlib
+import os
+from typing import Hashable, List, Optional, Sequence
 
 import pygame
 
-HitMaskType = List[List[bool]]  # 碰撞掩码类型定义
+from .lru_cache import LRUCache
+
+HitMaskType = pygame.mask.Mask  # 碰撞掩码类型定义（按位压缩的掩码）
 
 
 def clamp(n: float, minn: float, maxn: float) -> float:
@@ -13,38 +16,79 @@ def clamp(n: float, minn: float, maxn: float) -> float:
     return max(min(maxn, n), minn)  # 返回限制后的值
 
 
-def memoize(func):
+def mask_nbytes(mask: HitMaskType) -> int:
     """
-    缓存函数结果
+    估算掩码占用的字节数（每行按64位字对齐）
     """
-    cache = {}  # 创建缓存字典
+    width, height = mask.get_size()
+    return ((width + 63) // 64) * 8 * height
+
+
+# 碰撞掩码缓存：按形状标识或内容摘要做键，LRU淘汰，预算可通过环境变量配置
+# 条目为(alpha通道字节, 掩码)，按内容缓存的条目保留alpha字节用于命中时精确比较，计入预算
+hit_mask_cache = LRUCache(
+    max_bytes=int(os.environ.get("HIT_MASK_CACHE_BYTES", 2 * 1024 * 1024)),
+    size_of=lambda entry: mask_nbytes(entry[1]) + len(entry[0] or b""),
+)
 
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        key = (args, frozenset(kwargs.items()))  # 创建唯一键
-        if key not in cache:
-            cache[key] = func(*args, **kwargs)  # 缓存函数结果
-        return cache[key]  # 返回缓存结果
 
-    return wrapper
+def build_hit_mask(image: pygame.Surface) -> HitMaskType:
+    """
+    根据图像的透明度生成碰撞掩码（不经过缓存）
+    """
+    # threshold=0：alpha值大于0的像素都参与碰撞，与逐像素检查alpha的旧实现一致
+    return pygame.mask.from_surface(image, 0)
 
 
-@memoize
-def get_hit_mask(image: pygame.Surface) -> HitMaskType:
+def get_hit_mask(image: pygame.Surface, key: Optional[Hashable] = None) -> HitMaskType:
     """
     根据图像的透明度返回碰撞掩码
+    :param image: 图像
+    :param key: 形状标识（如精灵id），不提供时使用尺寸加alpha通道的摘要
+                （需要复制整张图像，生成频繁的精灵应预先生成掩码或提供形状标识）
     """
-    return list(
-        (
-            list(
-                (
-                    bool(image.get_at((x, y))[3])  # 获取像素的alpha值
-                    for y in range(image.get_height())  # 遍历图像高度
-                )
-            )
-            for x in range(image.get_width())  # 遍历图像宽度
-        )
+    if key is not None:
+        return hit_mask_cache.get(key, lambda: (None, build_hit_mask(image)))[1]
+    alpha = pygame.image.tobytes(image, "RGBA")[3::4]  # 只有alpha通道决定掩码
+    digest = hashlib.blake2b(alpha, digest_size=16).digest()
+    cached_alpha, mask = hit_mask_cache.get(
+        (image.get_size(), digest), lambda: (alpha, build_hit_mask(image))
     )
+    if cached_alpha != alpha:
+        return build_hit_mask(image)  # 摘要相同但形状不同（几乎不会发生），不使用缓存
+    return mask
+
+
+# 扫掠掩码缓存：同一个掩码以相同位移移动时复用
+swept_mask_cache = LRUCache(
+    max_bytes=512 * 1024,
+    size_of=lambda entry: mask_nbytes(entry[1]),
+)
+
+
+def get_swept_mask(mask: HitMaskType, dx: int, dy: int) -> HitMaskType:
+    """
+    返回掩码沿位移(dx, dy)扫过的区域掩码
+    掩码左上角对应起点和终点外接矩形的左上角
+    """
+    # 条目里保存了原掩码的引用，掩码不会被回收，id在条目存活期间不会被复用
+    key = (id(mask), dx, dy)
+    return swept_mask_cache.get(key, lambda: (mask, build_swept_mask(mask, dx, dy)))[1]
+
+
+def build_swept_mask(mask: HitMaskType, dx: int, dy: int) -> HitMaskType:
+    """
+    生成扫掠掩码：把原掩码沿线段逐像素叠加
+    """
+    width, height = mask.get_size()
+    swept = pygame.mask.Mask((width + abs(dx), height + abs(dy)))
+    start_x = max(0, -dx)  # 起点在扫掠掩码中的位置
+    start_y = max(0, -dy)
+    steps = max(abs(dx), abs(dy))
+    for i in range(steps + 1):
+        offset = (start_x + round(dx * i / steps), start_y + round(dy * i / steps)) if steps else (0, 0)
+        swept.draw(mask, offset)
+    return swept
 
 
 def pixel_collision(
@@ -56,28 +100,36 @@ def pixel_collision(
     """
     检查两个对象是否碰撞，而不仅仅是它们的矩形
     """
-    rect = rect1.clip(rect2)  # 获取两个矩形的交集
+    if not rect1.colliderect(rect2):
+        return False  # 如果矩形没有交集，返回False
 
-    if rect.width == 0 or rect.height == 0:
-        return False  # 如果没有交集，返回False
+    # 安全检查：确保碰撞掩码存在且不为None
+    if hitmask1 is None or hitmask2 is None:
+        return True  # 如果没有掩码，退回到矩形碰撞检测
 
-    x1, y1 = rect.x - rect1.x, rect.y - rect1.y  # 计算相对位置
-    x2, y2 = rect.x - rect2.x, rect.y - rect2.y
+    # 掩码重叠检测在pygame的C代码中按位完成
+    offset = (rect2.x - rect1.x, rect2.y - rect1.y)  # 第二个掩码相对第一个的偏移
+    return hitmask1.overlap(hitmask2, offset) is not None
 
-    # 安全检查：确保碰撞掩码存在且不为None
-    if not hitmask1 or not hitmask2:
-        return rect1.colliderect(rect2)  # 如果没有掩码，退回到矩形碰撞检测
-    
-    # 获取碰撞掩码的维度
-    width1, height1 = len(hitmask1), len(hitmask1[0]) if hitmask1 else 0
-    width2, height2 = len(hitmask2), len(hitmask2[0]) if hitmask2 else 0
-    
-    for x in range(rect.width):
-        for y in range(rect.height):
-            # 添加边界检查
-            if (0 <= x1 + x < width1 and 0 <= y1 + y < height1 and
-                0 <= x2 + x < width2 and 0 <= y2 + y < height2):
-                # 只有在范围内的索引才检查碰撞
-                if hitmask1[x1 + x][y1 + y] and hitmask2[x2 + x][y2 + y]:
-                    return True  # 如果两个碰撞掩码都为True，返回True
-    return False  # 没有碰撞，返回False
+
+def batch_collision(
+    rect: pygame.Rect,
+    hitmask: Optional[HitMaskType],
+    rects: Sequence[pygame.Rect],
+    hitmasks: Sequence[Optional[HitMaskType]],
+) -> List[int]:
+    """
+    一个对象对N个候选对象的批量碰撞检测，返回发生碰撞的候选下标
+    矩形相交测试由Rect.collidelistall在C代码中一次完成，只有通过的候选才做像素检测
+    """
+    hits = []
+    for index in rect.collidelistall(rects):
+        other = rects[index]
+        other_mask = hitmasks[index]
+        if (
+            hitmask is None
+            or other_mask is None
+            or hitmask.overlap(other_mask, (other.x - rect.x, other.y - rect.y))
+        ):
+            hits.append(index)
+    return hits
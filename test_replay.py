@@ -0,0 +1,43 @@
+import sys
+
+import pygame
+sys.path.append('.')  # 添加当前目录到路径
+
+from src.flappy import Flappy, GameMode
+from src.utils import InputLog
+
+# 输入回放测试：无界面模式下连续录制两局，回放第二局，结果应与录制时相同
+FLAP = [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)]
+
+
+def play(game, frames=300, interval=9):
+    """每隔interval帧拍打一次，返回结束时的状态"""
+    for frame in range(frames):
+        game.step(1, FLAP if frame % interval == 0 else ())
+    return (
+        game.input_log.steps,
+        game.score.score,
+        round(game.player.y, 3),
+        [pipe.x for pipe in game.pipes.upper],
+    )
+
+
+def test_replay_second_run():
+    game = Flappy(headless=True, seed=7)
+    recorded = {}
+    for run in range(2):
+        game.new_game(GameMode.CLASSIC)
+        recorded[run] = (play(game, interval=8 + run), game.input_log.to_bytes())
+
+    log = InputLog.from_bytes(recorded[1][1], len(GameMode))
+    assert log.seed != 7, "第二局应使用新的种子"
+    replay = Flappy(headless=True, seed=0)
+    replay.new_replay(log)
+    assert play(replay, interval=1) == recorded[1][0]  # 回放时收到的输入应被忽略
+    assert replay.input_log.to_bytes() == recorded[1][1]
+
+
+if __name__ == "__main__":
+    test_replay_second_run()
+    print("回放测试通过")
+    pygame.quit()